@@ -9,9 +9,12 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
+import copy
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,7 +48,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.InstrumentacionSQLMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.ReplicasMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -75,18 +80,109 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+#
+# Todo se lee del entorno; los valores por omisión son los de desarrollo.
+# Con PostgreSQL y DB_POOL=1 (recomendado en producción; requiere
+# psycopg[pool]) se usa el pool de conexiones de psycopg 3: cada proceso
+# mantiene entre DB_POOL_MIN y DB_POOL_MAX conexiones abiertas y las presta
+# a cada petición, en vez de abrir y cerrar una por petición. Una petición
+# espera a lo sumo DB_POOL_TIMEOUT segundos por una conexión libre; las
+# conexiones ociosas más de DB_POOL_MAX_IDLE segundos se cierran y ninguna
+# vive más de DB_POOL_MAX_LIFETIME. Con DB_POOL_CHECK=1 se comprueba cada
+# conexión antes de prestarla. El total (procesos × DB_POOL_MAX, más las
+# réplicas) debe caber en max_connections del servidor.
+#
+# Sin pool (DB_POOL=0, por omisión) se conservan las conexiones
+# DB_CONN_MAX_AGE segundos por hilo, comprobándolas antes de reutilizarlas.
+# Las estadísticas del pool se ven con `manage.py estado_conexiones` o en
+# /coordinador/sistema/conexiones/.
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'django.db.backends.postgresql')
+DB_POOL = os.environ.get('DB_POOL', '0') == '1' and DB_ENGINE == 'django.db.backends.postgresql'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'sistema_escolar',
-        'USER': 'postgres',
-        'PASSWORD': '1234',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'ENGINE': DB_ENGINE,
+        'NAME': os.environ.get('DB_NAME', 'sistema_escolar'),
+        'USER': os.environ.get('DB_USER', 'postgres'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', '1234'),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+        # Con pool las conexiones las administra el pool, no Django
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
     }
 }
 
+if DB_ENGINE == 'django.db.backends.postgresql':
+    DATABASES['default']['OPTIONS']['connect_timeout'] = int(os.environ.get('DB_CONNECT_TIMEOUT', 5))
+    if os.environ.get('DB_STATEMENT_TIMEOUT_MS'):
+        DATABASES['default']['OPTIONS']['options'] = f"-c statement_timeout={int(os.environ['DB_STATEMENT_TIMEOUT_MS'])}"
+
+if DB_POOL:
+    try:
+        from psycopg_pool import ConnectionPool
+    except ImportError:
+        raise ImproperlyConfigured("DB_POOL=1 requiere psycopg[pool] (pip install -r requirements.txt); o use DB_POOL=0.")
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN', 2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX', 10)),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+        'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800)),
+    }
+    if os.environ.get('DB_POOL_CHECK', '1') == '1':
+        DATABASES['default']['OPTIONS']['pool']['check'] = ConnectionPool.check_connection
+
+# Réplicas de solo lectura (core/replicas.py)
+#
+# DB_REPLICAS son los servidores de las réplicas separados por comas
+# ("10.0.0.2,10.0.0.3:5433"); cada uno queda como alias replica1, replica2...
+# con las demás credenciales de 'default' y su propio pool. Las peticiones
+# de solo lectura leen de ellas; las escrituras, y el usuario que acaba de
+# escribir durante REPLICA_FIJAR_SEGUNDOS, van a la primaria. En las
+# pruebas cada réplica es un espejo de 'default'.
+#
+# Para probarlo en local basta con dos bases de datos: otro PostgreSQL
+# (DB_REPLICAS=localhost:5433) o, con SQLite, un módulo de settings que
+# importe este y defina DATABASES['replica1'] y DATABASE_REPLICAS a mano
+# (y `migrate --database replica1`).
+
+DATABASE_REPLICAS = []
+for numero, servidor in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    host, _, port = servidor.strip().partition(':')
+    DATABASES[f'replica{numero}'] = dict(
+        copy.deepcopy(DATABASES['default']),
+        HOST=host, PORT=port or DATABASES['default']['PORT'], TEST={'MIRROR': 'default'},
+    )
+    DATABASE_REPLICAS.append(f'replica{numero}')
+
+DATABASE_ROUTERS = ['core.replicas.RouterReplicas']
+REPLICA_FIJAR_SEGUNDOS = int(os.environ.get('REPLICA_FIJAR_SEGUNDOS', 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# La caché debe ser compartida por todos los procesos del servidor para que
+# la invalidación por señales llegue a todos (opciones de los formularios,
+# etc.). Con REDIS_URL se usa Redis; si no, una caché en disco local.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('DJANGO_CACHE_DIR', os.path.join(BASE_DIR, '.cache')),
+        }
+    }
 
 
 # Password validation
@@ -109,6 +205,13 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = 'core.Usuario'
 
+# Carga el Usuario junto con su Rol en una sola consulta
+AUTHENTICATION_BACKENDS = [
+    'core.autenticacion.UsuarioBackend',
+]
+
+LOGIN_URL = 'login'
+
 
 
 # Internationalization
@@ -123,6 +226,43 @@ USE_I18N = True
 USE_TZ = True
 
 
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+#
+# 'core.sql' registra en JSON las consultas de cada petición (INFO) y los
+# posibles N+1 (WARNING). SQL_UMBRAL_N_MAS_1 es cuántas veces debe repetirse
+# una consulta para considerarla un N+1.
+
+SQL_UMBRAL_N_MAS_1 = int(os.environ.get('SQL_UMBRAL_N_MAS_1', 5))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.sql': {
+            'handlers': ['console'],
+            'level': os.environ.get('SQL_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+
+# Cola de tareas en segundo plano (core/tareas.py)
+#
+# Los archivos que suben o producen las tareas (CSV por importar, zip de
+# boletines) se guardan en TAREAS_DIR. Una tarea en curso cuyo trabajador no
+# da señales en TAREAS_ABANDONO_SEGUNDOS vuelve a la cola.
+
+TAREAS_DIR = os.environ.get('TAREAS_DIR', os.path.join(BASE_DIR, '.tareas'))
+TAREAS_ABANDONO_SEGUNDOS = int(os.environ.get('TAREAS_ABANDONO_SEGUNDOS', 600))
+
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
@@ -0,0 +1,230 @@
+import math
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Max, Min, Q
+
+from .models import AsignacionDocente, Calificacion, Grupo
+from .replicas import en_primaria
+
+# ────────────────────────────────
+# ESTADÍSTICAS DE CALIFICACIONES POR GRUPO
+# ────────────────────────────────
+#
+# Cantidad, media, desviación, extremos, reprobadas e histograma salen de
+# una consulta agregada agrupada por asignación (COUNT, AVG de la nota y de
+# su cuadrado, MIN, MAX y COUNT con FILTER por tramo); las de cada
+# asignatura, docente y del grupo completo se combinan a partir de esas
+# filas: la varianza es el promedio de los cuadrados menos el cuadrado de
+# la media. Los percentiles no tienen agregado portable: se calculan con la
+# tabla de frecuencias (asignación, nota, cuántas), que tiene a lo sumo 51
+# filas por asignación porque las notas van de 0.0 a 5.0 con un decimal.
+# Así Python nunca recorre las notas una por una. El resultado por grupo va
+# a la caché y core/resumenes.py lo invalida cuando cambian sus notas.
+
+CACHE_PREFIJO = 'analitica'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+NOTA_APROBATORIA = 3.0
+PERCENTILES = (10, 25, 50, 75, 90)
+# Cortes del histograma sobre la escala 0.0–5.0; el último tramo incluye el 5.0
+CORTES = (0.0, 1.0, 2.0, 3.0, 4.0, 5.0)
+TRAMOS = len(CORTES) - 1
+
+NOTA = 'actividad__calificacion__nota'
+
+
+def _clave(grupo_id):
+    return f"{CACHE_PREFIJO}:grupo:{grupo_id}"
+
+
+def _tramo(i):
+    # El primer tramo toma también lo que quede por debajo de 0.0 y el último
+    # lo que quede desde su corte inferior en adelante, como hacía bisect
+    condicion = Q()
+    if i > 0:
+        condicion &= Q(**{f'{NOTA}__gte': CORTES[i]})
+    if i < TRAMOS - 1:
+        condicion &= Q(**{f'{NOTA}__lt': CORTES[i + 1]})
+    return Count(NOTA, filter=condicion)
+
+
+def _por_asignacion(grupo_id):
+    """Una fila por asignación del grupo, con sus datos y los agregados de sus notas."""
+    return list(
+        AsignacionDocente.objects.filter(grupo_id=grupo_id)
+        .values(
+            'pk', 'asignatura_id', 'asignatura__nombre', 'docente_id',
+            'docente__primer_nombre', 'docente__primer_apellido',
+        )
+        .annotate(
+            cantidad=Count(NOTA), media=Avg(NOTA), cuadrados=Avg(F(NOTA) * F(NOTA)),
+            minima=Min(NOTA), maxima=Max(NOTA),
+            reprobadas=Count(NOTA, filter=Q(**{f'{NOTA}__lt': NOTA_APROBATORIA})),
+            **{f'tramo_{i}': _tramo(i) for i in range(TRAMOS)},
+        )
+        .order_by()
+    )
+
+
+def _frecuencias(grupo_id):
+    """{asignación: Counter(nota -> cuántas)} de las notas del grupo."""
+    frecuencias = {}
+    filas = (
+        Calificacion.objects.filter(actividad__asignacion__grupo_id=grupo_id)
+        .values_list('actividad__asignacion_id', 'nota').annotate(veces=Count('pk')).order_by()
+    )
+    for asignacion_id, nota, veces in filas:
+        frecuencias.setdefault(asignacion_id, Counter())[float(nota)] += veces
+    return frecuencias
+
+
+def _percentiles(frecuencias, n):
+    notas = sorted(frecuencias)
+    acumuladas = list(accumulate(frecuencias[nota] for nota in notas))
+
+    def nota_en(posicion):
+        # La nota que ocuparía `posicion` en la columna ordenada
+        return notas[bisect_right(acumuladas, posicion)]
+
+    percentiles = {}
+    for p in PERCENTILES:
+        posicion = (n - 1) * p / 100
+        bajo = int(posicion)
+        alto = min(bajo + 1, n - 1)
+        percentiles[p] = round(nota_en(bajo) + (nota_en(alto) - nota_en(bajo)) * (posicion - bajo), 2)
+    return percentiles
+
+
+def describir(filas, frecuencias):
+    """
+    Estadísticas de un conjunto de asignaciones (`filas` de _por_asignacion
+    y sus `frecuencias`): cantidad, media, desviación poblacional, extremos,
+    percentiles, histograma y cuántas quedan por debajo de NOTA_APROBATORIA.
+    """
+    filas = [fila for fila in filas if fila['cantidad']]
+    n = sum(fila['cantidad'] for fila in filas)
+    if not n:
+        return {'cantidad': 0}
+    media = math.fsum(fila['cantidad'] * float(fila['media']) for fila in filas) / n
+    cuadrados = math.fsum(fila['cantidad'] * float(fila['cuadrados']) for fila in filas) / n
+    varianza = max(cuadrados - media ** 2, 0.0)
+    reprobadas = sum(fila['reprobadas'] for fila in filas)
+    juntas = Counter()
+    for fila in filas:
+        juntas.update(frecuencias[fila['pk']])
+    return {
+        'cantidad': n,
+        'media': round(media, 2),
+        'desviacion': round(math.sqrt(varianza), 2),
+        'minima': float(min(fila['minima'] for fila in filas)),
+        'maxima': float(max(fila['maxima'] for fila in filas)),
+        'percentiles': _percentiles(juntas, n),
+        'histograma': [
+            (CORTES[i], CORTES[i + 1], sum(fila[f'tramo_{i}'] for fila in filas)) for i in range(TRAMOS)
+        ],
+        'reprobadas': reprobadas,
+        'porcentaje_reprobadas': round(100 * reprobadas / n, 1),
+    }
+
+
+def _en_riesgo(grupo_id):
+    """(asignatura, estudiante, nombre, promedio) con promedio por debajo de NOTA_APROBATORIA."""
+    return (
+        Calificacion.objects.filter(actividad__asignacion__grupo_id=grupo_id)
+        .values_list(
+            'actividad__asignacion__asignatura_id', 'estudiante_id',
+            'estudiante__primer_apellido', 'estudiante__primer_nombre',
+        )
+        .annotate(promedio=Avg('nota')).filter(promedio__lt=NOTA_APROBATORIA).order_by()
+    )
+
+
+@en_primaria()
+def calcular_estadisticas(grupo_id):
+    """
+    Estadísticas del grupo: generales, por asignatura, por docente y la
+    lista de estudiantes en riesgo (promedio de una asignatura por debajo
+    de NOTA_APROBATORIA). Tres consultas agregadas, sin importar cuántas
+    notas haya.
+    """
+    filas = _por_asignacion(grupo_id)
+    frecuencias = _frecuencias(grupo_id)
+
+    de_asignatura, de_docente = {}, {}
+    nombres_asignatura, nombres_docente, docentes_de = {}, {}, {}
+    for fila in filas:
+        docente = f"{fila['docente__primer_nombre']} {fila['docente__primer_apellido']}"
+        de_asignatura.setdefault(fila['asignatura_id'], []).append(fila)
+        de_docente.setdefault(fila['docente_id'], []).append(fila)
+        nombres_asignatura[fila['asignatura_id']] = fila['asignatura__nombre']
+        nombres_docente[fila['docente_id']] = docente
+        docentes_de.setdefault(fila['asignatura_id'], set()).add(docente)
+
+    en_riesgo = [
+        (asignatura_id, estudiante_id, f"{apellido}, {nombre}", float(promedio))
+        for asignatura_id, estudiante_id, apellido, nombre, promedio in _en_riesgo(grupo_id)
+    ]
+
+    return {
+        'grupo': grupo_id,
+        'aprobatoria': NOTA_APROBATORIA,
+        'general': describir(filas, frecuencias),
+        'asignaturas': sorted(
+            (
+                {
+                    'id': asignatura_id, 'nombre': nombres_asignatura[asignatura_id],
+                    'docentes': ', '.join(sorted(docentes_de[asignatura_id])), **describir(grupo, frecuencias),
+                }
+                for asignatura_id, grupo in de_asignatura.items()
+                if any(fila['cantidad'] for fila in grupo)
+            ),
+            key=lambda fila: fila['nombre'],
+        ),
+        'docentes': sorted(
+            (
+                {'id': docente_id, 'nombre': nombres_docente[docente_id], **describir(grupo, frecuencias)}
+                for docente_id, grupo in de_docente.items()
+                if any(fila['cantidad'] for fila in grupo)
+            ),
+            key=lambda fila: fila['nombre'],
+        ),
+        'riesgo': sorted(
+            (
+                {
+                    'estudiante': estudiante_id, 'nombre': nombre,
+                    'asignatura': nombres_asignatura[asignatura_id], 'promedio': round(promedio, 2),
+                }
+                for asignatura_id, estudiante_id, nombre, promedio in en_riesgo
+            ),
+            key=lambda fila: (fila['promedio'], fila['nombre']),
+        ),
+        'estudiantes_en_riesgo': len({estudiante_id for _, estudiante_id, _, _ in en_riesgo}),
+    }
+
+
+def estadisticas_grupo(grupo_id):
+    """calcular_estadisticas() desde la caché si es posible."""
+    clave = _clave(grupo_id)
+    estadisticas = cache.get(clave)
+    if estadisticas is None:
+        estadisticas = calcular_estadisticas(grupo_id)
+        cache.set(clave, estadisticas, CACHE_TIMEOUT)
+    return estadisticas
+
+
+async def aestadisticas_grupo(grupo_id):
+    estadisticas = await cache.aget(_clave(grupo_id))
+    if estadisticas is None:
+        estadisticas = await sync_to_async(estadisticas_grupo)(grupo_id)
+    return estadisticas
+
+
+def invalidar_analitica(grupos=None):
+    """Borra de la caché las estadísticas de `grupos` (ids), o de todos los grupos."""
+    if grupos is None:
+        grupos = Grupo.objects.values_list('pk', flat=True)
+    cache.delete_many([_clave(grupo_id) for grupo_id in grupos])
@@ -0,0 +1,188 @@
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .exportacion import FILTRO_FECHA, FILTRO_ID, FILTRO_TEXTO, filtrar
+from .models import Actividad, AsignacionDocente, Calificacion, Docente, Estudiante, Grupo
+from .paginacion import CursorInvalido, codificar_cursor, decodificar_cursor
+
+# ────────────────────────────────
+# API JSON DE LECTURA
+# ────────────────────────────────
+#
+# GET /api/<recurso>/?campos=a,b&<filtro>=<valor>&tamano=N&cursor=...
+#
+# - campos (o fields) elige las columnas: se piden con values_list() solo
+#   esas, y solo se hace JOIN con las tablas de los campos pedidos. Sin
+#   campos se devuelven los de `por_omision`, todos de la propia tabla.
+# - Los filtros de cada recurso van sobre columnas con índice (claves
+#   foráneas, documento único, los índices de Calificacion).
+# - La paginación es por cursor sobre la clave primaria
+#   ("WHERE id > último ORDER BY id"): la página N cuesta lo mismo que la
+#   primera. "siguiente" es el cursor de la página que sigue, o null.
+# - Las filas no se convierten en objetos del modelo: las tuplas de
+#   values_list() se leen con iterator() y el JSON sale en flujo, de a
+#   TAMANO_BLOQUE filas, así la memoria no crece con el tamaño de la página.
+
+TAMANO = 100
+TAMANO_MAXIMO = 5000
+TAMANO_BLOQUE = 500
+
+PERSONA = {
+    'id': 'pk',
+    'tipo_documento': 'tipo_documento__nombre',
+    'numero_documento': 'numero_documento',
+    'primer_nombre': 'primer_nombre',
+    'segundo_nombre': 'segundo_nombre',
+    'primer_apellido': 'primer_apellido',
+    'segundo_apellido': 'segundo_apellido',
+    'direccion': 'direccion_linea1',
+    'ciudad': 'ciudad__nombre',
+}
+PERSONA_POR_OMISION = ['id', 'numero_documento', 'primer_nombre', 'segundo_nombre', 'primer_apellido', 'segundo_apellido']
+
+
+class RecursoAPI:
+    """
+    Un recurso de la API: `campos` asocia el nombre público de cada campo
+    con su lookup para values_list(); `filtros` es {parámetro: (lookup, tipo)}
+    como en core/exportacion.py.
+    """
+
+    def __init__(self, nombre, modelo, campos, por_omision, filtros=None):
+        self.nombre = nombre
+        self.modelo = modelo
+        self.campos = dict(campos)
+        self.por_omision = list(por_omision)
+        self.filtros = dict(filtros or {})
+
+    def columnas(self, pedidos):
+        """
+        Nombres públicos de las columnas que se devuelven: 'id' primero
+        (el cursor lo necesita) y luego los `pedidos` ("a,b,c"), o los
+        por omisión. Lanza ValueError con un campo desconocido.
+        """
+        nombres = [nombre.strip() for nombre in pedidos.split(',') if nombre.strip()] if pedidos else self.por_omision
+        desconocidos = [nombre for nombre in nombres if nombre not in self.campos]
+        if desconocidos:
+            raise ValueError(f"Campos desconocidos: {', '.join(desconocidos)}")
+        return ['id', *dict.fromkeys(nombre for nombre in nombres if nombre != 'id')]
+
+    def _orden_cursor(self):
+        return f'api:{self.nombre}'
+
+    def consulta(self, parametros):
+        """
+        (nombres de las columnas, queryset values_list de la página, tamaño).
+        El queryset trae una fila de más para saber si hay otra página.
+        Lanza ValueError con parámetros inválidos.
+        """
+        nombres = self.columnas(parametros.get('campos') or parametros.get('fields'))
+        queryset = filtrar(self.modelo.objects.all(), self.filtros, parametros)
+        cursor = parametros.get('cursor')
+        if cursor:
+            try:
+                orden, _, pk, _ = decodificar_cursor(cursor)
+            except CursorInvalido:
+                orden = pk = None
+            # Un cursor alterado puede traer cualquier JSON en la clave
+            if orden != self._orden_cursor() or type(pk) is not int:
+                raise ValueError("Cursor inválido")
+            queryset = queryset.filter(pk__gt=pk)
+        tamano = parametros.get('tamano', '')
+        tamano = min(int(tamano), TAMANO_MAXIMO) if tamano.isdigit() and int(tamano) > 0 else TAMANO
+        queryset = queryset.order_by('pk').values_list(*(self.campos[nombre] for nombre in nombres))[:tamano + 1]
+        # El JSON se genera después de que la vista responde, cuando
+        # ReplicasMiddleware ya devolvió la lectura a la primaria: se fija
+        # aquí la base de datos que eligió el router para esta petición.
+        return nombres, queryset.using(queryset.db), tamano
+
+    def json(self, nombres, queryset, tamano):
+        """Generador del JSON {"resultados": [...], "siguiente": cursor o null}."""
+        codificar = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        yield '{"resultados":['
+        bloque = []
+        escritas = 0
+        ultimo = None
+        hay_mas = False
+        for fila in queryset.iterator(chunk_size=TAMANO_BLOQUE):
+            if escritas == tamano:
+                hay_mas = True
+                break
+            bloque.append(codificar(dict(zip(nombres, fila))))
+            escritas += 1
+            ultimo = fila[0]
+            if len(bloque) == TAMANO_BLOQUE:
+                yield (',' if escritas > len(bloque) else '') + ','.join(bloque)
+                bloque = []
+        if bloque:
+            yield (',' if escritas > len(bloque) else '') + ','.join(bloque)
+        siguiente = codificar_cursor(self._orden_cursor(), None, ultimo, 'sig') if hay_mas else None
+        yield f'],"siguiente":{codificar(siguiente)}}}'
+
+
+RECURSOS = {recurso.nombre: recurso for recurso in [
+    RecursoAPI(
+        'estudiantes', Estudiante,
+        {**PERSONA, 'grupo': 'grupo_id', 'grupo_nombre': 'grupo__nombre', 'grado': 'grupo__grado__nombre'},
+        por_omision=PERSONA_POR_OMISION + ['grupo'],
+        filtros={
+            'grupo': ('grupo_id', FILTRO_ID),
+            'documento': ('numero_documento', FILTRO_TEXTO),
+        },
+    ),
+    RecursoAPI(
+        'docentes', Docente,
+        {**PERSONA, 'especialidad': 'especialidad'},
+        por_omision=PERSONA_POR_OMISION + ['especialidad'],
+        filtros={'documento': ('numero_documento', FILTRO_TEXTO)},
+    ),
+    RecursoAPI(
+        'grupos', Grupo,
+        {
+            'id': 'pk', 'nombre': 'nombre', 'grado': 'grado_id', 'grado_nombre': 'grado__nombre',
+            'nivel': 'grado__nivel__nombre', 'aula': 'aula_id', 'aula_nombre': 'aula__nombre',
+        },
+        por_omision=['id', 'nombre', 'grado', 'aula'],
+        filtros={'grado': ('grado_id', FILTRO_ID)},
+    ),
+    RecursoAPI(
+        'asignaciones', AsignacionDocente,
+        {
+            'id': 'pk', 'docente': 'docente_id', 'grupo': 'grupo_id', 'asignatura': 'asignatura_id',
+            'docente_nombre': 'docente__primer_nombre', 'docente_apellido': 'docente__primer_apellido',
+            'grupo_nombre': 'grupo__nombre', 'asignatura_nombre': 'asignatura__nombre',
+        },
+        por_omision=['id', 'docente', 'grupo', 'asignatura'],
+        filtros={
+            'docente': ('docente_id', FILTRO_ID),
+            'grupo': ('grupo_id', FILTRO_ID),
+            'asignatura': ('asignatura_id', FILTRO_ID),
+        },
+    ),
+    RecursoAPI(
+        'actividades', Actividad,
+        {
+            'id': 'pk', 'asignacion': 'asignacion_id', 'titulo': 'titulo', 'descripcion': 'descripcion',
+            'es_calificable': 'es_calificable', 'fecha_publicacion': 'fecha_publicacion',
+            'grupo': 'asignacion__grupo_id', 'asignatura': 'asignacion__asignatura_id',
+        },
+        por_omision=['id', 'asignacion', 'titulo', 'es_calificable', 'fecha_publicacion'],
+        filtros={'asignacion': ('asignacion_id', FILTRO_ID)},
+    ),
+    RecursoAPI(
+        'calificaciones', Calificacion,
+        {
+            'id': 'pk', 'actividad': 'actividad_id', 'estudiante': 'estudiante_id', 'nota': 'nota',
+            'fecha_registro': 'fecha_registro', 'actividad_titulo': 'actividad__titulo',
+            'asignacion': 'actividad__asignacion_id',
+        },
+        por_omision=['id', 'actividad', 'estudiante', 'nota', 'fecha_registro'],
+        # actividad: índice único (actividad, estudiante); estudiante y las
+        # fechas: calificacion_estudiante_idx (estudiante, -fecha_registro)
+        filtros={
+            'actividad': ('actividad_id', FILTRO_ID),
+            'estudiante': ('estudiante_id', FILTRO_ID),
+            'desde': ('fecha_registro__gte', FILTRO_FECHA),
+            'hasta': ('fecha_registro__lte', FILTRO_FECHA),
+        },
+    ),
+]}
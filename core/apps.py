@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import signals  # noqa: F401
+        from .texto_completo import preparar_texto_completo
+
+        # Columnas e índices de texto completo que no son campos de los modelos
+        post_migrate.connect(preparar_texto_completo, sender=self)
@@ -0,0 +1,115 @@
+import gzip
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from . import versiones
+from .models import Asignatura, Grado, Logro, NivelEducativo, Tema
+
+# ────────────────────────────────
+# ÁRBOL DE LA ESTRUCTURA ACADÉMICA
+# ────────────────────────────────
+#
+# Nivel → Grado → Asignatura → Temas y Logros, completo o desde un nivel o
+# un grado, en un solo JSON. Se arma con un número fijo de consultas (una
+# por nivel del árbol, con prefetch_related) y se guarda en la caché ya
+# serializado, en claro y comprimido con gzip, bajo la versión del catálogo
+# (core/versiones.py): mientras el catálogo no cambie, responder no
+# consulta la base de datos ni vuelve a serializar.
+
+CACHE_PREFIJO = 'arbol'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Raíces posibles: parámetro GET -> modelo
+RAICES = {'nivel': NivelEducativo, 'grado': Grado}
+
+
+def _asignaturas():
+    return (
+        Asignatura.objects.select_related('area').only('nombre', 'grado_id', 'area__nombre').order_by('nombre', 'pk')
+        .prefetch_related(
+            Prefetch('temas', Tema.objects.only('nombre', 'asignatura_id').order_by('nombre', 'pk')),
+            Prefetch('logros', Logro.objects.only('descripcion', 'asignatura_id').order_by('pk')),
+        )
+    )
+
+
+def _grados():
+    return (
+        Grado.objects.only('nombre', 'nivel_id').order_by('nombre', 'pk')
+        .prefetch_related(Prefetch('asignaturas', _asignaturas()))
+    )
+
+
+def _grado(grado):
+    return {
+        'id': grado.pk,
+        'nombre': grado.nombre,
+        'asignaturas': [
+            {
+                'id': asignatura.pk,
+                'nombre': asignatura.nombre,
+                'area': asignatura.area.nombre,
+                'temas': [{'id': tema.pk, 'nombre': tema.nombre} for tema in asignatura.temas.all()],
+                'logros': [{'id': logro.pk, 'descripcion': logro.descripcion} for logro in asignatura.logros.all()],
+            }
+            for asignatura in grado.asignaturas.all()
+        ],
+    }
+
+
+def _nivel(nivel):
+    return {'id': nivel.pk, 'nombre': nivel.nombre, 'grados': [_grado(grado) for grado in nivel.grados.all()]}
+
+
+def construir_arbol(nivel=None, grado=None):
+    """
+    El árbol completo ({'niveles': [...]}), o el nodo del nivel o del grado
+    indicado (None si no existe). Cinco consultas desde un nivel o para todo
+    el árbol, cuatro desde un grado, sin importar cuántos nodos tenga.
+    """
+    if grado is not None:
+        encontrado = _grados().filter(pk=grado).first()
+        return _grado(encontrado) if encontrado else None
+    niveles = NivelEducativo.objects.only('nombre').order_by('nombre', 'pk').prefetch_related(
+        Prefetch('grados', _grados()),
+    )
+    if nivel is not None:
+        encontrado = niveles.filter(pk=nivel).first()
+        return _nivel(encontrado) if encontrado else None
+    return {'niveles': [_nivel(n) for n in niveles]}
+
+
+def serializar(arbol):
+    """(JSON en bytes, el mismo comprimido con gzip)."""
+    crudo = json.dumps(arbol, ensure_ascii=False, separators=(',', ':')).encode()
+    return crudo, gzip.compress(crudo, compresslevel=6)
+
+
+def _clave(version):
+    return f"{CACHE_PREFIJO}:{version}"
+
+
+def arbol_serializado(version, nivel=None, grado=None):
+    """
+    serializar(construir_arbol(...)) desde la caché, bajo `version` (la de
+    versiones.huella(), que ya distingue la raíz). None si la raíz no existe.
+    """
+    clave = _clave(version)
+    guardado = cache.get(clave)
+    if guardado is None:
+        arbol = construir_arbol(nivel=nivel, grado=grado)
+        if arbol is None:
+            return None
+        guardado = serializar(arbol)
+        cache.set(clave, guardado, CACHE_TIMEOUT)
+    return guardado
+
+
+async def aarbol_serializado(version, nivel=None, grado=None):
+    guardado = await cache.aget(_clave(version))
+    if guardado is None:
+        guardado = await sync_to_async(arbol_serializado)(version, nivel=nivel, grado=grado)
+    return guardado
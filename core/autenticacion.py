@@ -0,0 +1,139 @@
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.views import redirect_to_login
+
+from . import versiones
+from .models import Rol, Usuario
+
+# ────────────────────────────────
+# ROLES
+# ────────────────────────────────
+
+ROL_COORDINADOR = 'Coordinador Académico'
+ROL_DOCENTE = 'Docente'
+ROL_ESTUDIANTE = 'Estudiante'
+ROL_ACUDIENTE = 'Acudiente'
+ROL_ACUDIENTE_ALTERNO = 'Padre de Familia o Acudiente'
+
+# Clave de la sesión donde se guarda el rol del usuario autenticado
+SESION_ROL = '_rol_usuario'
+
+# ────────────────────────────────
+# BACKEND DE AUTENTICACIÓN
+# ────────────────────────────────
+
+class UsuarioBackend(ModelBackend):
+    """
+    Igual que ModelBackend, pero carga el Usuario junto con su Rol en una
+    sola consulta, tanto al iniciar sesión como en cada petición (get_user).
+    """
+
+    def _usuarios(self):
+        return Usuario._default_manager.select_related('rol')
+
+    def authenticate(self, request, correo=None, password=None, **kwargs):
+        correo = correo or kwargs.get(Usuario.USERNAME_FIELD) or kwargs.get('username')
+        if correo is None or password is None:
+            return None
+        try:
+            usuario = self._usuarios().get(correo=correo)
+        except Usuario.DoesNotExist:
+            # Igual que ModelBackend: se calcula un hash para no revelar por
+            # el tiempo de respuesta si el correo existe
+            Usuario().set_password(password)
+            return None
+        if usuario.check_password(password) and self.user_can_authenticate(usuario):
+            return usuario
+        return None
+
+    def get_user(self, user_id):
+        try:
+            usuario = self._usuarios().get(pk=user_id)
+        except Usuario.DoesNotExist:
+            return None
+        return usuario if self.user_can_authenticate(usuario) else None
+
+    async def aget_user(self, user_id):
+        try:
+            usuario = await self._usuarios().aget(pk=user_id)
+        except Usuario.DoesNotExist:
+            return None
+        return usuario if self.user_can_authenticate(usuario) else None
+
+# ────────────────────────────────
+# ROL EN CACHÉ POR SESIÓN
+# ────────────────────────────────
+
+def _version_roles():
+    return versiones.versiones([Rol])[Rol]
+
+
+def recordar_rol(request, usuario):
+    datos = {'usuario': usuario.pk, 'rol_id': usuario.rol_id, 'nombre': usuario.rol.nombre}
+    guardados = request.session.get(SESION_ROL) or {}
+    # La versión se lee solo cuando la copia cambia, no en cada petición
+    if {clave: guardados.get(clave) for clave in datos} != datos:
+        request.session[SESION_ROL] = {**datos, 'version': _version_roles()}
+    return datos['nombre']
+
+
+def rol_de(request):
+    """
+    Nombre del rol del usuario de la petición, sin consultas adicionales.
+
+    Si el Rol ya vino en el JOIN de UsuarioBackend se usa directamente; si no,
+    se toma de la sesión. La copia de la sesión solo vale mientras coincida
+    con el rol_id actual del usuario y con la versión de la tabla de roles
+    (core/versiones.py), de modo que al cambiarle el rol a alguien, o al
+    renombrar un rol, la caché se invalida en su siguiente petición.
+    """
+    usuario = request.user
+    if not usuario.is_authenticated:
+        return None
+    if Usuario.rol.is_cached(usuario):
+        return recordar_rol(request, usuario)
+    datos = request.session.get(SESION_ROL)
+    if (
+        datos and datos.get('usuario') == usuario.pk and datos.get('rol_id') == usuario.rol_id
+        and datos.get('version') == _version_roles()
+    ):
+        return datos['nombre']
+    return recordar_rol(request, usuario)
+
+
+def rol_requerido(*roles):
+    """
+    Reemplaza la pila login_required + user_passes_test(...): exige un
+    usuario autenticado con alguno de los roles indicados y, si no lo es,
+    lo envía al login como hacían esos decoradores.
+
+    Sirve también para vistas async: el usuario se carga con request.auser()
+    (que además deja la sesión en memoria) y se fija en request.user, así
+    rol_de() y las plantillas no tocan la base de datos de forma síncrona.
+    """
+    def decorador(vista):
+        if iscoroutinefunction(vista):
+            @wraps(vista)
+            async def envoltura_async(request, *args, **kwargs):
+                request.user = await request.auser()
+                if rol_de(request) in roles:
+                    return await vista(request, *args, **kwargs)
+                return redirect_to_login(request.get_full_path())
+            return envoltura_async
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if rol_de(request) in roles:
+                return vista(request, *args, **kwargs)
+            return redirect_to_login(request.get_full_path())
+        return envoltura
+    return decorador
+
+
+coordinador_requerido = rol_requerido(ROL_COORDINADOR)
+docente_requerido = rol_requerido(ROL_DOCENTE)
+estudiante_requerido = rol_requerido(ROL_ESTUDIANTE)
+acudiente_requerido = rol_requerido(ROL_ACUDIENTE, ROL_ACUDIENTE_ALTERNO)
@@ -0,0 +1,307 @@
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from .autenticacion import ROL_COORDINADOR
+from .middleware import RegistroConsultas
+from .models import (
+    Actividad, Area, AsignacionDocente, Asignatura, Eliminacion, Estudiante, Grado, Grupo, Logro, NivelEducativo,
+    Tarea, Tema, Usuario,
+)
+from .testing import nombres_de_urls
+
+# ────────────────────────────────
+# BENCHMARK DE VISTAS
+# ────────────────────────────────
+#
+# Recorre todas las URL con nombre de core/urls.py (salvo las que borran
+# datos) más los caminos masivos, y mide para cada una la latencia
+# (p50/p95/p99), las consultas SQL y el pico de memoria de Python. Los
+# resultados se pueden guardar como línea base y comparar contra ella.
+
+# Vistas que modifican datos (con GET) o encolan trabajo: nunca se ejecutan en el benchmark.
+# guardar_planilla tampoco: cada guardado cambia el valor 'anterior' que espera el siguiente
+EXCLUIDAS = {'eliminar_tema', 'eliminar_logro', 'programar_tarea', 'guardar_planilla'}
+
+# Vistas que se miden con datos propios, en la sección de caminos masivos de casos()
+MASIVAS = {'calificar_actividad', 'buscar_personas', 'buscar_textos'}
+
+# Vistas que se piden con la sesión de otro rol (por omisión, la del coordinador)
+CLIENTE_DE = {
+    'panel_docente': 'docente', 'planilla_docente': 'docente',
+    'panel_estudiante': 'estudiante', 'panel_acudiente': 'acudiente',
+}
+
+
+class Caso:
+    def __init__(self, nombre, url, cliente='coordinador', metodo='get', datos=None, content_type=None):
+        self.nombre = nombre
+        self.url = url
+        self.cliente = cliente
+        self.metodo = metodo
+        self.datos = datos
+        self.content_type = content_type
+
+
+def _primero(modelo, **filtros):
+    return modelo.objects.filter(**filtros).order_by('pk').values_list('pk', flat=True).first()
+
+
+def _docente():
+    return (
+        Usuario.objects.filter(docente__asignaciondocente__actividad__isnull=False, is_active=True)
+        .order_by('pk').first()
+    )
+
+
+def _argumentos():
+    """kwargs de las rutas que los necesitan, tomados de datos existentes."""
+    pk = {
+        'nivel': _primero(NivelEducativo), 'grado': _primero(Grado), 'area': _primero(Area),
+        'asignatura': _primero(Asignatura), 'tema': _primero(Tema), 'logro': _primero(Logro),
+        'grupo': _primero(Grupo, estudiantes__isnull=False), 'actividad': _primero(Actividad),
+        'eliminacion': _primero(Eliminacion), 'tarea': _primero(Tarea),
+        # Una asignación del mismo docente con el que se piden sus vistas
+        'asignacion': _primero(AsignacionDocente, docente__usuario=_docente(), actividad__isnull=False),
+        'archivo': _primero(Tarea, estado=Tarea.TERMINADA, archivo__gt=''),
+    }
+    return {
+        'editar_nivel': {'pk': pk['nivel']}, 'editar_grado': {'pk': pk['grado']},
+        'editar_area': {'pk': pk['area']}, 'editar_asignatura': {'pk': pk['asignatura']},
+        'editar_tema': {'pk': pk['tema']}, 'editar_logro': {'pk': pk['logro']},
+        # GET de eliminar_* (salvo temas y logros) es la vista previa del impacto
+        'eliminar_nivel': {'pk': pk['nivel']}, 'eliminar_grado': {'pk': pk['grado']},
+        'eliminar_area': {'pk': pk['area']}, 'eliminar_asignatura': {'pk': pk['asignatura']},
+        'estado_eliminacion': {'pk': pk['eliminacion']},
+        'estado_tarea': {'pk': pk['tarea']}, 'descargar_tarea': {'pk': pk['archivo']},
+        'descargar_boletines': {'pk': pk['grupo']},
+        'calificar_actividad': {'pk': pk['actividad']},
+        'planilla_docente': {'pk': pk['asignacion']},
+        'exportar': {'nombre': 'calificaciones'},
+        'api_recurso': {'recurso': 'calificaciones'},
+    }
+
+
+def casos():
+    argumentos = _argumentos()
+    lista = []
+    for nombre in nombres_de_urls():
+        if nombre in EXCLUIDAS or nombre in MASIVAS:
+            continue
+        kwargs = argumentos.get(nombre)
+        if kwargs is not None and None in kwargs.values():
+            continue  # no hay datos para esta ruta
+        lista.append(Caso(nombre, reverse(nombre, kwargs=kwargs), cliente=CLIENTE_DE.get(nombre, 'coordinador')))
+
+    # Caminos masivos: registro de una planilla completa de notas
+    actividad = (
+        Actividad.objects.filter(asignacion__docente__usuario__isnull=False, es_calificable=True)
+        .values('pk', 'asignacion__grupo_id').order_by('pk').first()
+    )
+    if actividad:
+        estudiantes = Estudiante.objects.filter(grupo_id=actividad['asignacion__grupo_id']).values_list('pk', flat=True)
+        planilla = {'calificaciones': [{'estudiante': pk, 'nota': '4.0'} for pk in estudiantes]}
+        lista.append(Caso(
+            'calificar_actividad', reverse('calificar_actividad', kwargs={'pk': actividad['pk']}),
+            cliente='docente', metodo='post', datos=json.dumps(planilla), content_type='application/json',
+        ))
+
+    # Búsqueda de personas por prefijo de nombre, sobre todos los tipos
+    lista.append(Caso('buscar_personas', f"{reverse('buscar_personas')}?q=gar"))
+    # Texto completo en logros y temas, sin filtros
+    lista.append(Caso('buscar_textos', f"{reverse('buscar_textos')}?q=comprension"))
+    return lista
+
+
+def _clientes():
+    host = next((h for h in settings.ALLOWED_HOSTS if h and '*' not in h and not h.startswith('.')), 'localhost')
+    clientes = {}
+    coordinador = Usuario.objects.filter(rol__nombre=ROL_COORDINADOR, is_active=True).order_by('pk').first()
+    if coordinador:
+        clientes['coordinador'] = Client(HTTP_HOST=host)
+        clientes['coordinador'].force_login(coordinador)
+    docente = _docente()
+    if docente:
+        clientes['docente'] = Client(HTTP_HOST=host)
+        clientes['docente'].force_login(docente)
+    estudiante = (
+        Usuario.objects.filter(estudiante__resumenes__isnull=False, is_active=True).order_by('pk').first()
+    )
+    if estudiante:
+        clientes['estudiante'] = Client(HTTP_HOST=host)
+        clientes['estudiante'].force_login(estudiante)
+    acudiente = (
+        Usuario.objects.filter(acudiente__estudiantes__isnull=False, is_active=True).order_by('pk').first()
+    )
+    if acudiente:
+        clientes['acudiente'] = Client(HTTP_HOST=host)
+        clientes['acudiente'].force_login(acudiente)
+    return clientes
+
+
+def _pedir(cliente, caso):
+    kwargs = {'content_type': caso.content_type} if caso.content_type else {}
+    respuesta = getattr(cliente, caso.metodo)(caso.url, caso.datos, **kwargs)
+    if getattr(respuesta, 'streaming', False):
+        for _ in respuesta.streaming_content:
+            pass
+    return respuesta
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * p / 100
+    bajo = int(posicion)
+    alto = min(bajo + 1, len(ordenados) - 1)
+    return ordenados[bajo] + (ordenados[alto] - ordenados[bajo]) * (posicion - bajo)
+
+
+def medir(repeticiones=20, calentamiento=2):
+    """Devuelve {nombre: {p50_ms, p95_ms, p99_ms, consultas, memoria_kb, estado}}."""
+    clientes = _clientes()
+    resultados = {}
+    for caso in casos():
+        cliente = clientes.get(caso.cliente)
+        if cliente is None:
+            continue
+        for _ in range(calentamiento):
+            _pedir(cliente, caso)
+
+        tiempos = []
+        consultas = []
+        for _ in range(repeticiones):
+            registro = RegistroConsultas()
+            with registro.registrar():
+                inicio = time.perf_counter()
+                respuesta = _pedir(cliente, caso)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            consultas.append(registro.cantidad)
+
+        # La memoria se mide en una pasada aparte: tracemalloc altera los tiempos
+        tracemalloc.start()
+        _pedir(cliente, caso)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        resultados[caso.nombre] = {
+            'estado': respuesta.status_code,
+            'p50_ms': round(statistics.median(tiempos), 2),
+            'p95_ms': round(_percentil(tiempos, 95), 2),
+            'p99_ms': round(_percentil(tiempos, 99), 2),
+            'consultas': max(consultas),
+            'memoria_kb': round(pico / 1024, 1),
+        }
+    return resultados
+
+
+def comparar(resultados, base, tolerancia=0.25, margen_ms=2.0, margen_kb=256):
+    """
+    Lista de regresiones respecto a la línea base: más consultas que antes,
+    o p95 / memoria por encima de la base en más de `tolerancia` (fracción).
+    `margen_ms` y `margen_kb` evitan falsas alarmas en vistas muy livianas.
+    """
+    regresiones = []
+    for nombre, actual in resultados.items():
+        anterior = base.get(nombre)
+        if anterior is None:
+            continue
+        if actual['consultas'] > anterior['consultas']:
+            regresiones.append(f"{nombre}: consultas {anterior['consultas']} → {actual['consultas']}")
+        if actual['p95_ms'] > anterior['p95_ms'] * (1 + tolerancia) + margen_ms:
+            regresiones.append(f"{nombre}: p95 {anterior['p95_ms']} ms → {actual['p95_ms']} ms")
+        if actual['memoria_kb'] > anterior['memoria_kb'] * (1 + tolerancia) + margen_kb:
+            regresiones.append(f"{nombre}: memoria {anterior['memoria_kb']} KB → {actual['memoria_kb']} KB")
+    return regresiones
+
+
+# ────────────────────────────────
+# WSGI FRENTE A ASGI BAJO CONCURRENCIA
+# ────────────────────────────────
+#
+# Las mismas vistas se piden con `concurrencia` peticiones en vuelo: por el
+# camino WSGI (Client, un hilo por petición concurrente, como un servidor
+# con hilos) y por el camino ASGI (AsyncClient en un solo bucle de eventos,
+# con un contexto de hilos por petición como hace ASGIHandler). Mide el
+# manejador de Django en el mismo proceso, sin el servidor HTTP.
+
+# Vistas async de solo lectura que se comparan por omisión
+VISTAS_CONCURRENCIA = [
+    'panel_coordinador', 'lista_niveles', 'lista_grados', 'lista_areas',
+    'lista_asignaturas', 'lista_temas', 'lista_logros',
+]
+
+
+def _resumen(tiempos, errores, total_s):
+    return {
+        'peticiones': len(tiempos),
+        'errores': errores,
+        'por_segundo': round(len(tiempos) / total_s, 1) if total_s else 0.0,
+        'p50_ms': round(statistics.median(tiempos), 2),
+        'p95_ms': round(_percentil(tiempos, 95), 2),
+    }
+
+
+def _wsgi(cookies, urls, concurrencia):
+    clientes = []
+    for _ in range(concurrencia):
+        cliente = Client()
+        cliente.cookies = cookies['cookies']
+        clientes.append(cliente)
+
+    def pedir(i):
+        inicio = time.perf_counter()
+        respuesta = clientes[i % concurrencia].get(urls[i % len(urls)])
+        return (time.perf_counter() - inicio) * 1000, respuesta.status_code
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        resultados = list(pool.map(pedir, range(cookies['peticiones'])))
+    total = time.perf_counter() - inicio
+    return _resumen([t for t, _ in resultados], sum(1 for _, e in resultados if e != 200), total)
+
+
+async def _asgi(cookies, urls, concurrencia):
+    cliente = AsyncClient()
+    cliente.cookies = cookies['cookies']
+    semaforo = asyncio.Semaphore(concurrencia)
+
+    async def pedir(i):
+        async with semaforo, ThreadSensitiveContext():
+            inicio = time.perf_counter()
+            respuesta = await cliente.get(urls[i % len(urls)])
+            return (time.perf_counter() - inicio) * 1000, respuesta.status_code
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(pedir(i) for i in range(cookies['peticiones'])))
+    total = time.perf_counter() - inicio
+    return _resumen([t for t, _ in resultados], sum(1 for _, e in resultados if e != 200), total)
+
+
+def comparar_servidores(vistas=None, concurrencia=20, peticiones=400):
+    """Devuelve {'wsgi': {...}, 'asgi': {...}} con peticiones por segundo, p50 y p95."""
+    coordinador = Usuario.objects.filter(rol__nombre=ROL_COORDINADOR, is_active=True).order_by('pk').first()
+    if coordinador is None:
+        raise ValueError("No hay un usuario coordinador activo para el benchmark.")
+    urls = [reverse(nombre) for nombre in (vistas or VISTAS_CONCURRENCIA)]
+
+    # AsyncClient siempre envía Host: testserver
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        cliente = Client()
+        cliente.force_login(coordinador)
+        datos = {'cookies': cliente.cookies, 'peticiones': peticiones}
+        # Calentamiento: plantillas compiladas y opciones en caché
+        for url in urls:
+            cliente.get(url)
+        return {
+            'wsgi': _wsgi(datos, urls, concurrencia),
+            'asgi': asyncio.run(_asgi(datos, urls, concurrencia)),
+        }
@@ -0,0 +1,194 @@
+import os
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal
+
+import django
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import Calificacion, Estudiante, Grupo
+
+# ────────────────────────────────
+# GENERACIÓN DE BOLETINES
+# ────────────────────────────────
+#
+# Los datos de cada grupo se traen con tres consultas (grupo, estudiantes y
+# notas), se arman como diccionarios simples y el HTML se renderiza en un
+# pool de procesos. El resultado se escribe en disco, con un archivo de
+# progreso que permite reanudar una ejecución interrumpida, o se empaqueta en
+# un ZIP que se va enviando a medida que se genera.
+
+PLANTILLA = 'boletines/boletin.html'
+ARCHIVO_PROGRESO = 'progreso.txt'
+
+
+def grupos_de(grupos=None, grados=None):
+    queryset = Grupo.objects.order_by('grado__nivel__nombre', 'grado__nombre', 'nombre')
+    if grupos:
+        queryset = queryset.filter(pk__in=grupos)
+    if grados:
+        queryset = queryset.filter(grado_id__in=grados)
+    return list(queryset.values_list('pk', flat=True))
+
+
+def datos_de_grupo(grupo_id, desde=None, hasta=None):
+    """Datos de los boletines de un grupo, listos para renderizar (picklables)."""
+    grupo = (
+        Grupo.objects.filter(pk=grupo_id)
+        .values('nombre', 'grado__nombre', 'grado__nivel__nombre')
+        .get()
+    )
+    estudiantes = list(
+        Estudiante.objects.filter(grupo_id=grupo_id)
+        .order_by('primer_apellido', 'segundo_apellido', 'primer_nombre')
+        .values('pk', 'primer_nombre', 'segundo_nombre', 'primer_apellido', 'segundo_apellido', 'numero_documento')
+    )
+    notas = Calificacion.objects.filter(
+        estudiante__grupo_id=grupo_id, actividad__asignacion__grupo_id=grupo_id,
+    )
+    if desde:
+        notas = notas.filter(fecha_registro__gte=desde)
+    if hasta:
+        notas = notas.filter(fecha_registro__lte=hasta)
+    notas = notas.order_by(
+        'actividad__asignacion__asignatura__area__nombre',
+        'actividad__asignacion__asignatura__nombre',
+        'actividad__fecha_publicacion',
+    ).values_list(
+        'estudiante_id',
+        'actividad__asignacion__asignatura__area__nombre',
+        'actividad__asignacion__asignatura__nombre',
+        'actividad__titulo',
+        'nota',
+    )
+
+    # estudiante -> (area, asignatura) -> [(actividad, nota)]
+    por_estudiante = defaultdict(lambda: defaultdict(list))
+    for estudiante_id, area, asignatura, titulo, nota in notas.iterator(chunk_size=2000):
+        por_estudiante[estudiante_id][(area, asignatura)].append((titulo, str(nota)))
+
+    generado = timezone.localdate().isoformat()
+    boletines = []
+    for estudiante in estudiantes:
+        asignaturas = []
+        for (area, asignatura), actividades in por_estudiante.get(estudiante['pk'], {}).items():
+            valores = [Decimal(nota) for _, nota in actividades]
+            asignaturas.append({
+                'area': area,
+                'nombre': asignatura,
+                'actividades': actividades,
+                'promedio': str(round(sum(valores) / len(valores), 2)),
+                'minima': str(min(valores)),
+                'maxima': str(max(valores)),
+            })
+        boletines.append({
+            'estudiante': estudiante,
+            'grupo': grupo,
+            'asignaturas': asignaturas,
+            'desde': desde and str(desde),
+            'hasta': hasta and str(hasta),
+            'generado': generado,
+        })
+    return boletines
+
+
+def nombre_archivo(boletin):
+    # El documento lo escribe un usuario: sin '/', '..' ni otros caracteres
+    # que cambien la ruta en el disco o dentro del ZIP; el pk lo hace único
+    estudiante = boletin['estudiante']
+    return get_valid_filename(f"boletin_{estudiante['numero_documento']}_{estudiante['pk']}.html")
+
+
+def _iniciar_proceso():
+    # Los procesos hijos solo renderizan plantillas: no tocan la base de datos
+    django.setup()
+
+
+def renderizar(boletin):
+    return boletin['estudiante']['pk'], nombre_archivo(boletin), render_to_string(PLANTILLA, boletin)
+
+
+@contextmanager
+def _pool(procesos):
+    # Un solo pool para toda la ejecución; con un proceso se renderiza aquí mismo
+    if procesos <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso) as pool:
+        yield pool
+
+
+def _renderizar_todos(pool, boletines):
+    if pool is None:
+        return map(renderizar, boletines)
+    return pool.map(renderizar, boletines, chunksize=16)
+
+
+def _leer_progreso(directorio):
+    ruta = os.path.join(directorio, ARCHIVO_PROGRESO)
+    if not os.path.exists(ruta):
+        return set()
+    with open(ruta, encoding='utf-8') as archivo:
+        return {int(linea) for linea in archivo if linea.strip().isdigit()}
+
+
+def generar_en_disco(grupos, directorio, procesos=None, reanudar=False, desde=None, hasta=None, progreso=None):
+    """
+    Escribe un HTML por estudiante en `directorio`. Cada boletín terminado se
+    anota en progreso.txt; con `reanudar` se omiten los ya generados.
+    `progreso(hechos, total, grupo)` se llama tras cada boletín. Devuelve el
+    número de boletines escritos en esta ejecución.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    procesos = procesos or os.cpu_count() or 1
+    hechos = _leer_progreso(directorio) if reanudar else set()
+    modo = 'a' if reanudar else 'w'
+    escritos = 0
+    with open(os.path.join(directorio, ARCHIVO_PROGRESO), modo, encoding='utf-8') as registro, _pool(procesos) as pool:
+        for grupo_id in grupos:
+            pendientes = [b for b in datos_de_grupo(grupo_id, desde, hasta) if b['estudiante']['pk'] not in hechos]
+            total = len(pendientes)
+            for posicion, (estudiante_id, nombre, html) in enumerate(_renderizar_todos(pool, pendientes), 1):
+                with open(os.path.join(directorio, nombre), 'w', encoding='utf-8') as archivo:
+                    archivo.write(html)
+                registro.write(f"{estudiante_id}\n")
+                registro.flush()
+                escritos += 1
+                if progreso:
+                    progreso(posicion, total, grupo_id)
+    return escritos
+
+
+class _FlujoZip:
+    """Destino de escritura para ZipFile que acumula los bytes producidos."""
+
+    def __init__(self):
+        self.partes = []
+
+    def write(self, datos):
+        self.partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self.partes)
+        self.partes = []
+        return datos
+
+
+def generar_zip(grupos, procesos=1, desde=None, hasta=None):
+    """Generador con los bytes de un ZIP con los boletines, archivo por archivo."""
+    flujo = _FlujoZip()
+    with zipfile.ZipFile(flujo, 'w', zipfile.ZIP_DEFLATED) as paquete, _pool(procesos) as pool:
+        for grupo_id in grupos:
+            boletines = datos_de_grupo(grupo_id, desde, hasta)
+            for _, nombre, html in _renderizar_todos(pool, boletines):
+                paquete.writestr(nombre, html)
+                yield flujo.vaciar()
+    yield flujo.vaciar()
@@ -0,0 +1,153 @@
+import re
+import unicodedata
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Acudiente, Docente, Estudiante, IndicePersona, PalabraPersona, PerfilDeUsuario
+
+# ────────────────────────────────
+# BÚSQUEDA UNIFICADA DE PERSONAS
+# ────────────────────────────────
+#
+# Persona es abstracta: perfiles, docentes, estudiantes y acudientes viven
+# en cuatro tablas. IndicePersona las reúne (tipo, id, nombre, documento)
+# y PalabraPersona guarda cada palabra del nombre normalizada, sin tildes
+# y en minúsculas. Buscar "jose gar" es pedir las personas que tienen una
+# palabra que empieza por "jose" y otra que empieza por "gar": rangos sobre
+# el índice de palabra, sin recorrer los nombres con icontains. El
+# documento se busca exacto con su propio índice.
+#
+# Las señales de core/signals.py mantienen el índice al guardar o borrar;
+# las cargas masivas (importación, institución sintética) llaman a
+# indexar() por lotes, y reconstruir_indice() lo rehace desde cero.
+
+TAMANO_LOTE = 2000
+LIMITE = 20
+LARGO_MINIMO = 2
+
+MODELOS = {
+    IndicePersona.PERFIL: PerfilDeUsuario,
+    IndicePersona.DOCENTE: Docente,
+    IndicePersona.ESTUDIANTE: Estudiante,
+    IndicePersona.ACUDIENTE: Acudiente,
+}
+TIPO_DE = {modelo: tipo for tipo, modelo in MODELOS.items()}
+
+CAMPOS_NOMBRE = ['primer_nombre', 'segundo_nombre', 'primer_apellido', 'segundo_apellido']
+
+
+def normalizar(texto):
+    """Minúsculas, sin tildes ni espacios sobrantes, para comparar nombres."""
+    texto = unicodedata.normalize('NFKD', (texto or '').strip().lower())
+    return ' '.join(''.join(c for c in texto if not unicodedata.combining(c)).split())
+
+
+def palabras(texto):
+    return re.findall(r'\w+', normalizar(texto))
+
+
+def _borrar_palabras(personas=None):
+    # PalabraPersona no tiene receptores de post_delete ni relaciones
+    # inversas: el ORM la borra con un solo DELETE, sin cargar filas
+    palabras_ = PalabraPersona.objects.all()
+    if personas is not None:
+        if not personas:
+            return
+        palabras_ = palabras_.filter(persona_id__in=personas)
+    palabras_.delete()
+
+
+def _indexar_filas(tipo, filas):
+    """Upsert de las filas (pk, nombres..., documento) de un tipo y sus palabras."""
+    personas = []
+    palabras_de = {}
+    for pk, *nombres, documento in filas:
+        nombre = ' '.join(parte for parte in nombres if parte)
+        personas.append(IndicePersona(tipo=tipo, objeto_id=pk, nombre=nombre[:210], numero_documento=documento))
+        palabras_de[pk] = {palabra[:50] for palabra in palabras(nombre)}
+    if not personas:
+        return 0
+    with transaction.atomic():
+        IndicePersona.objects.bulk_create(
+            personas, batch_size=TAMANO_LOTE, update_conflicts=True,
+            unique_fields=['tipo', 'objeto_id'], update_fields=['nombre', 'numero_documento'],
+        )
+        indices = dict(
+            IndicePersona.objects.filter(tipo=tipo, objeto_id__in=palabras_de).values_list('objeto_id', 'pk')
+        )
+        _borrar_palabras(list(indices.values()))
+        PalabraPersona.objects.bulk_create(
+            [
+                PalabraPersona(persona_id=indices[pk], palabra=palabra)
+                for pk, conjunto in palabras_de.items() for palabra in conjunto
+            ],
+            batch_size=TAMANO_LOTE,
+        )
+    return len(personas)
+
+
+def indexar(modelo, **filtros):
+    """
+    Indexa (o actualiza) las personas de `modelo` que cumplen `filtros`,
+    en lotes de TAMANO_LOTE. Devuelve cuántas indexó.
+    """
+    filas = (
+        modelo.objects.filter(**filtros).order_by('pk')
+        .values_list('pk', *CAMPOS_NOMBRE, 'numero_documento')
+    )
+    tipo = TIPO_DE[modelo]
+    indexadas = 0
+    lote = []
+    for fila in filas.iterator(chunk_size=TAMANO_LOTE):
+        lote.append(fila)
+        if len(lote) >= TAMANO_LOTE:
+            indexadas += _indexar_filas(tipo, lote)
+            lote = []
+    return indexadas + _indexar_filas(tipo, lote)
+
+
+def desindexar(modelo, pks):
+    IndicePersona.objects.filter(tipo=TIPO_DE[modelo], objeto_id__in=pks).delete()
+
+
+def reconstruir_indice():
+    """Vacía el índice y lo vuelve a llenar desde las cuatro tablas. Devuelve cuántas personas indexó."""
+    with transaction.atomic():
+        _borrar_palabras()
+        # DELETE directo: por la relación inversa con PalabraPersona (ya
+        # vacía) el ORM cargaría cada fila del índice antes de borrarla
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {connection.ops.quote_name(IndicePersona._meta.db_table)}")
+        return sum(indexar(modelo) for modelo in MODELOS.values())
+
+
+def _prefijo(palabra):
+    if connection.vendor == 'postgresql':
+        # LIKE 'palabra%' sobre el índice varchar_pattern_ops
+        return Q(palabra__startswith=palabra)
+    # En los demás motores LIKE no usa el índice; un rango sí
+    return Q(palabra__gte=palabra, palabra__lt=palabra + '\uffff')
+
+
+def buscar(texto, tipos=None, limite=LIMITE):
+    """
+    Personas cuyo nombre tiene palabras que empiezan por cada palabra de
+    `texto` (sin importar tildes ni mayúsculas), o cuyo documento es
+    exactamente `texto`. Devuelve un queryset de IndicePersona.
+    """
+    texto = (texto or '').strip()
+    buscadas = [palabra for palabra in palabras(texto) if len(palabra) >= LARGO_MINIMO]
+    if not buscadas and len(texto) < LARGO_MINIMO:
+        return IndicePersona.objects.none()
+
+    condicion = Q(numero_documento=texto)
+    if buscadas:
+        por_nombre = Q()
+        for palabra in buscadas:
+            por_nombre &= Q(pk__in=PalabraPersona.objects.filter(_prefijo(palabra)).values('persona_id'))
+        condicion |= por_nombre
+    queryset = IndicePersona.objects.filter(condicion)
+    if tipos:
+        queryset = queryset.filter(tipo__in=tipos)
+    return queryset.order_by('nombre', 'pk')[:limite]
@@ -0,0 +1,124 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+
+from .models import AsignacionDocente, Calificacion, Estudiante
+from .resumenes import actualizar_resumenes
+
+# ────────────────────────────────
+# REGISTRO MASIVO DE CALIFICACIONES
+# ────────────────────────────────
+
+NOTA_MINIMA = Decimal('0.0')
+NOTA_MAXIMA = Decimal('5.0')
+TAMANO_LOTE = 500
+
+
+class ResultadoLote:
+    def __init__(self, guardadas=0, errores=None):
+        self.guardadas = guardadas
+        self.errores = errores or []
+
+    @property
+    def ok(self):
+        return not self.errores
+
+    def como_dict(self):
+        return {'guardadas': self.guardadas, 'errores': self.errores}
+
+
+def bloquear_asignacion(asignacion_id):
+    """
+    Bloquea la asignación hasta el fin de la transacción: quienes escriben
+    notas de una misma asignación se turnan. select_for_update() sobre las
+    notas no alcanza, porque solo bloquea las que ya existen y dos sesiones
+    que llenan la misma celda vacía pasarían ambas la comprobación. FOR NO
+    KEY UPDATE no choca con las filas nuevas que apuntan a la asignación.
+    """
+    list(
+        AsignacionDocente.objects
+        .select_for_update(no_key=connection.features.has_select_for_no_key_update)
+        .filter(pk=asignacion_id).values_list('pk', flat=True)
+    )
+
+
+def leer_nota(valor):
+    try:
+        nota = Decimal(str(valor).strip().replace(',', '.'))
+    except (InvalidOperation, ValueError):
+        raise ValueError("La nota no es un número válido.")
+    if not nota.is_finite():
+        raise ValueError("La nota no es un número válido.")
+    if nota != nota.quantize(Decimal('0.1')):
+        raise ValueError("La nota admite un solo decimal.")
+    if not NOTA_MINIMA <= nota <= NOTA_MAXIMA:
+        raise ValueError(f"La nota debe estar entre {NOTA_MINIMA} y {NOTA_MAXIMA}.")
+    return nota
+
+
+def validar_planilla(actividad, filas):
+    """
+    Valida una planilla completa de notas para una actividad.
+
+    `filas` es una lista de dicts {'estudiante': id, 'nota': valor}. Devuelve
+    (calificaciones, errores): las instancias sin guardar de las filas válidas
+    y un error por cada fila rechazada, con su posición en la planilla.
+    """
+    errores = []
+    calificaciones = []
+    if not actividad.es_calificable:
+        return [], [{'fila': None, 'estudiante': None, 'error': "La actividad no es calificable."}]
+
+    # Estudiantes del grupo de la asignación: una sola consulta para toda la planilla
+    del_grupo = set(
+        Estudiante.objects.filter(grupo_id=actividad.asignacion.grupo_id).values_list('pk', flat=True)
+    )
+    vistos = set()
+    for posicion, fila in enumerate(filas):
+        estudiante = fila.get('estudiante') if isinstance(fila, dict) else None
+        try:
+            estudiante = int(estudiante)
+        except (TypeError, ValueError):
+            errores.append({'fila': posicion, 'estudiante': estudiante, 'error': "Estudiante inválido."})
+            continue
+        if estudiante not in del_grupo:
+            errores.append({'fila': posicion, 'estudiante': estudiante, 'error': "El estudiante no pertenece al grupo."})
+            continue
+        if estudiante in vistos:
+            errores.append({'fila': posicion, 'estudiante': estudiante, 'error': "Estudiante repetido en la planilla."})
+            continue
+        vistos.add(estudiante)
+        try:
+            nota = leer_nota(fila.get('nota'))
+        except ValueError as exc:
+            errores.append({'fila': posicion, 'estudiante': estudiante, 'error': str(exc)})
+            continue
+        calificaciones.append(Calificacion(actividad=actividad, estudiante_id=estudiante, nota=nota))
+    return calificaciones, errores
+
+
+def guardar_calificaciones(actividad, filas):
+    """
+    Guarda la planilla de una actividad como un único upsert por lotes
+    (INSERT ... ON CONFLICT (actividad, estudiante) DO UPDATE) dentro de una
+    transacción. Si alguna fila tiene errores no se guarda nada y se
+    devuelven los errores fila por fila.
+    """
+    calificaciones, errores = validar_planilla(actividad, filas)
+    if errores:
+        return ResultadoLote(errores=errores)
+    with transaction.atomic():
+        bloquear_asignacion(actividad.asignacion_id)
+        Calificacion.objects.bulk_create(
+            calificaciones,
+            batch_size=TAMANO_LOTE,
+            update_conflicts=True,
+            unique_fields=['actividad', 'estudiante'],
+            update_fields=['nota'],
+        )
+        # bulk_create no emite señales: se actualizan los resúmenes de la planilla
+        asignacion = actividad.asignacion
+        actualizar_resumenes(
+            (c.estudiante_id, asignacion.asignatura_id, asignacion.grupo_id) for c in calificaciones
+        )
+    return ResultadoLote(guardadas=len(calificaciones))
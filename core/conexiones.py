@@ -0,0 +1,57 @@
+import os
+import time
+
+from django.db import connections
+
+# ────────────────────────────────
+# ESTADO DEL POOL DE CONEXIONES
+# ────────────────────────────────
+#
+# Cada proceso del servidor tiene su propio pool por alias (ver DB_POOL en
+# backend/settings.py), así que las cifras son las del proceso que responde.
+# Los contadores (peticiones, esperas) son acumulados desde que arrancó.
+
+
+def estadisticas_pool(alias):
+    """
+    Estado del pool de `alias` en este proceso, o None si el alias no usa
+    pool. en_uso son las conexiones prestadas; esperando, las peticiones
+    que aguardan una libre; espera_media_ms, lo que tardaron en obtenerla
+    las que tuvieron que esperar.
+    """
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return None
+    datos = pool.get_stats()
+    encoladas = datos.get('requests_queued', 0)
+    return {
+        'minimo': datos.get('pool_min'),
+        'maximo': datos.get('pool_max'),
+        'abiertas': datos.get('pool_size', 0),
+        'libres': datos.get('pool_available', 0),
+        'en_uso': datos.get('pool_size', 0) - datos.get('pool_available', 0),
+        'esperando': datos.get('requests_waiting', 0),
+        'peticiones': datos.get('requests_num', 0),
+        'encoladas': encoladas,
+        'espera_media_ms': round(datos.get('requests_wait_ms', 0) / encoladas, 2) if encoladas else 0.0,
+        'errores': datos.get('requests_errors', 0),
+        'conexiones_creadas': datos.get('connections_num', 0),
+        'conexiones_perdidas': datos.get('connections_lost', 0),
+    }
+
+
+def estadisticas_pools():
+    """{alias: estadísticas o None} de todas las bases de datos configuradas, con el pid del proceso."""
+    return {
+        'pid': os.getpid(),
+        'bases_de_datos': {alias: estadisticas_pool(alias) for alias in connections},
+    }
+
+
+def comprobar(alias):
+    """Pide una conexión a `alias`, ejecuta SELECT 1 y devuelve cuánto tardó en ms."""
+    inicio = time.perf_counter()
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return round((time.perf_counter() - inicio) * 1000, 2)
@@ -0,0 +1,222 @@
+import logging
+
+from django.db import connection, models, transaction
+from django.db.models import Q
+
+from .models import Calificacion, Eliminacion
+from .opciones import FUENTES, invalidar_opciones
+from .resumenes import actualizar_resumenes
+from .versiones import MODELOS as MODELOS_VERSIONADOS, incrementar
+
+logger = logging.getLogger(__name__)
+
+# ────────────────────────────────
+# BORRADO EN CASCADA POR LOTES
+# ────────────────────────────────
+#
+# Model.delete() reúne en memoria todo el árbol CASCADE antes de borrar y lo
+# hace en una sola transacción. Aquí el árbol se describe con consultas: el
+# conjunto a borrar de cada modelo es un subquery sobre el de sus padres
+# ("actividad_id IN (SELECT id FROM actividad WHERE asignacion_id IN ...)").
+# La vista previa solo cuenta filas, y la ejecución borra de las hojas hacia
+# la raíz en lotes de TAMANO_LOTE, cada uno en su propia transacción, así que
+# la memoria no crece con el tamaño del árbol y se puede reanudar.
+
+TAMANO_LOTE = 2000
+
+
+class EliminacionProtegida(Exception):
+    """Hay registros PROTECT/RESTRICT que impiden el borrado."""
+
+    def __init__(self, protegidos):
+        self.protegidos = protegidos
+        super().__init__(', '.join(f"{nombre}: {cantidad}" for nombre, cantidad in protegidos.items()))
+
+
+def _relaciones(modelo):
+    # Las mismas relaciones inversas que recorre el Collector de Django
+    return [
+        campo for campo in modelo._meta.get_fields(include_hidden=True)
+        if campo.auto_created and not campo.concrete and (campo.one_to_one or campo.one_to_many)
+    ]
+
+
+class PlanEliminacion:
+    """
+    Árbol de borrado de `raiz` (una instancia). `consulta(modelo)` es el
+    queryset de las filas de `modelo` que caen en la cascada.
+    """
+
+    def __init__(self, raiz):
+        self.raiz = raiz
+        self.padres = {type(raiz): []}      # modelo -> [(campo, modelo_padre)]
+        self.anular = []                     # (modelo, campo, modelo_padre) con SET_NULL
+        self.proteger = []                   # (modelo, campo, modelo_padre) con PROTECT/RESTRICT
+        pendientes = [type(raiz)]
+        while pendientes:
+            padre = pendientes.pop()
+            for relacion in _relaciones(padre):
+                hijo, campo = relacion.related_model, relacion.field.name
+                borrado = relacion.on_delete
+                if borrado is models.CASCADE:
+                    if hijo not in self.padres:
+                        self.padres[hijo] = []
+                        pendientes.append(hijo)
+                    self.padres[hijo].append((campo, padre))
+                elif borrado is models.SET_NULL:
+                    self.anular.append((hijo, campo, padre))
+                elif borrado is not models.DO_NOTHING:
+                    self.proteger.append((hijo, campo, padre))
+        self._consultas = {}
+
+    def consulta(self, modelo):
+        if modelo not in self._consultas:
+            if modelo is type(self.raiz):
+                queryset = modelo._default_manager.filter(pk=self.raiz.pk)
+            else:
+                condicion = Q()
+                for campo, padre in self.padres[modelo]:
+                    condicion |= Q(**{f'{campo}__in': self.consulta(padre).values('pk')})
+                queryset = modelo._default_manager.filter(condicion)
+            self._consultas[modelo] = queryset
+        return self._consultas[modelo]
+
+    def _profundidad(self, modelo):
+        # Camino más largo desde la raíz: todo hijo queda más profundo que
+        # cualquiera de sus padres, y se borra antes
+        if modelo is type(self.raiz):
+            return 0
+        return 1 + max(self._profundidad(padre) for _, padre in self.padres[modelo])
+
+    def orden(self):
+        """Modelos en orden de borrado: de las hojas a la raíz."""
+        return sorted(self.padres, key=self._profundidad, reverse=True)
+
+    def impacto(self):
+        """
+        Conteo sin cargar objetos: {'eliminar': {modelo: n}, 'anular':
+        {modelo.campo: n}, 'protegidos': {modelo: n}}. Una consulta COUNT
+        por entrada.
+        """
+        eliminar = {}
+        for modelo in reversed(self.orden()):
+            cantidad = self.consulta(modelo).count()
+            if cantidad:
+                eliminar[str(modelo._meta.verbose_name_plural)] = cantidad
+        anular = {}
+        for modelo, campo, padre in self.anular:
+            if modelo in self.padres:
+                continue
+            cantidad = modelo._default_manager.filter(**{f'{campo}__in': self.consulta(padre).values('pk')}).count()
+            if cantidad:
+                anular[f"{modelo._meta.verbose_name_plural} ({campo})"] = cantidad
+        return {'eliminar': eliminar, 'anular': anular, 'protegidos': self.protegidos()}
+
+    def protegidos(self):
+        protegidos = {}
+        for modelo, campo, padre in self.proteger:
+            cantidad = modelo._default_manager.filter(**{f'{campo}__in': self.consulta(padre).values('pk')}).count()
+            if cantidad:
+                protegidos[str(modelo._meta.verbose_name_plural)] = cantidad
+        return protegidos
+
+
+def borrar_por_pk(modelo, pks):
+    """DELETE directo por clave primaria: sin Collector ni señales."""
+    tabla = connection.ops.quote_name(modelo._meta.db_table)
+    columna = connection.ops.quote_name(modelo._meta.pk.column)
+    marcas = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {tabla} WHERE {columna} IN ({marcas})", pks)
+
+
+def _lote(plan, modelo):
+    """Borra un lote de `modelo`; devuelve cuántas filas borró."""
+    with transaction.atomic():
+        pks = list(plan.consulta(modelo).order_by().values_list('pk', flat=True)[:TAMANO_LOTE])
+        if not pks:
+            return 0
+        for hijo, campo, padre in plan.anular:
+            if padre is modelo and hijo not in plan.padres:
+                hijo._default_manager.filter(**{f'{campo}__in': pks}).update(**{campo: None})
+        celdas = None
+        if modelo is Calificacion:
+            # El borrado directo no dispara las señales: se recalculan aquí
+            celdas = set(
+                Calificacion.objects.filter(pk__in=pks).values_list(
+                    'estudiante_id', 'actividad__asignacion__asignatura_id', 'actividad__asignacion__grupo_id',
+                )
+            )
+        borrar_por_pk(modelo, pks)
+        if celdas:
+            actualizar_resumenes(celdas)
+    return len(pks)
+
+
+def ejecutar(eliminacion, raiz):
+    """Ejecuta la Eliminacion por lotes, registrando el avance en la tabla."""
+    plan = PlanEliminacion(raiz)
+    Eliminacion.objects.filter(pk=eliminacion.pk).update(estado=Eliminacion.EN_CURSO, error='')
+    try:
+        protegidos = plan.protegidos()
+        if protegidos:
+            raise EliminacionProtegida(protegidos)
+        for modelo in plan.orden():
+            while borrados := _lote(plan, modelo):
+                eliminacion.eliminados += borrados
+                Eliminacion.objects.filter(pk=eliminacion.pk).update(eliminados=models.F('eliminados') + borrados)
+        estado, error = Eliminacion.TERMINADA, ''
+        # Los resúmenes que se vaciaron al recalcular ya no cuentan en los
+        # lotes, pero también desaparecieron: el avance queda completo
+        eliminacion.eliminados = max(eliminacion.eliminados, eliminacion.total)
+    except Exception as exc:
+        logger.exception("Falló la eliminación %s", eliminacion.pk)
+        estado, error = Eliminacion.FALLIDA, str(exc)
+    finally:
+        # Sin señales post_delete: se invalidan aquí las opciones en caché
+        # y las versiones del catálogo
+        for modelo in plan.padres:
+            if modelo in FUENTES:
+                invalidar_opciones(modelo)
+        incrementar(*(modelo for modelo in plan.padres if modelo in MODELOS_VERSIONADOS))
+    Eliminacion.objects.filter(pk=eliminacion.pk).update(estado=estado, error=error, eliminados=eliminacion.eliminados)
+    eliminacion.estado, eliminacion.error = estado, error
+    return eliminacion
+
+
+def programar(raiz, usuario=None):
+    """
+    Registra la Eliminacion de `raiz` con su impacto y la encola para el
+    trabajador de tareas. Lanza EliminacionProtegida si hay registros que
+    la impiden.
+    """
+    from .tareas import encolar  # core.tareas importa este módulo
+
+    impacto = PlanEliminacion(raiz).impacto()
+    if impacto['protegidos']:
+        raise EliminacionProtegida(impacto['protegidos'])
+    eliminacion = Eliminacion.objects.create(
+        modelo=raiz._meta.label, objeto_id=raiz.pk,
+        descripcion=f"{raiz._meta.verbose_name}: {raiz}"[:255],
+        impacto=impacto, total=sum(impacto['eliminar'].values()),
+    )
+    encolar('eliminar', f"Eliminar {eliminacion.descripcion}", {'eliminacion': eliminacion.pk}, usuario=usuario)
+    return eliminacion
+
+
+def _raiz(eliminacion):
+    from django.apps import apps
+    modelo = apps.get_model(eliminacion.modelo)
+    return modelo._default_manager.filter(pk=eliminacion.objeto_id).first()
+
+
+def reanudar(eliminacion):
+    """Ejecuta (o continúa) una Eliminacion pendiente o interrumpida."""
+    raiz = _raiz(eliminacion)
+    if raiz is None:
+        # La raíz ya se borró: el último lote alcanzó a terminar
+        Eliminacion.objects.filter(pk=eliminacion.pk).update(estado=Eliminacion.TERMINADA, error='')
+        eliminacion.estado = Eliminacion.TERMINADA
+        return eliminacion
+    return ejecutar(eliminacion, raiz)
+
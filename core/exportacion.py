@@ -0,0 +1,162 @@
+import csv
+
+from django.utils.dateparse import parse_date
+
+from .models import (
+    Estudiante, Docente, Acudiente,
+    NivelEducativo, Grado, Area, Asignatura, Tema, Logro, Grupo,
+    Calificacion,
+)
+
+# ────────────────────────────────
+# EXPORTACIÓN EN FLUJO (CSV / EXCEL)
+# ────────────────────────────────
+#
+# Las filas se leen con values_list().iterator(): en PostgreSQL eso usa un
+# cursor del lado del servidor y se traen de a TAMANO_BLOQUE filas, así la
+# memoria no crece con el tamaño de la exportación y el primer byte sale de
+# inmediato. Los filtros se aplican en el WHERE de la consulta.
+
+TAMANO_BLOQUE = 2000
+
+PERSONA = [
+    ('tipo_documento__nombre', 'Tipo de documento'),
+    ('numero_documento', 'Número de documento'),
+    ('primer_nombre', 'Primer nombre'),
+    ('segundo_nombre', 'Segundo nombre'),
+    ('primer_apellido', 'Primer apellido'),
+    ('segundo_apellido', 'Segundo apellido'),
+    ('direccion_linea1', 'Dirección'),
+    ('direccion_linea2', 'Dirección (línea 2)'),
+    ('ciudad__nombre', 'Ciudad'),
+    ('ciudad__departamento__nombre', 'Departamento'),
+]
+
+# Tipos de filtro: 'id' (entero), 'fecha' (AAAA-MM-DD) o 'texto' (tal cual)
+FILTRO_ID = 'id'
+FILTRO_FECHA = 'fecha'
+FILTRO_TEXTO = 'texto'
+
+
+def filtrar(queryset, filtros, parametros):
+    """
+    Aplica al queryset los `filtros` ({parámetro: (lookup, tipo)}) presentes
+    en `parametros`. Lanza ValueError si un valor no es del tipo esperado.
+    """
+    for parametro, (lookup, tipo) in filtros.items():
+        valor = parametros.get(parametro, '')
+        if not valor:
+            continue
+        if tipo == FILTRO_ID:
+            if not valor.isdigit():
+                raise ValueError(f"Filtro inválido: {parametro}")
+        elif tipo == FILTRO_FECHA:
+            valor = parse_date(valor)
+            if valor is None:
+                raise ValueError(f"Fecha inválida: {parametro}")
+        queryset = queryset.filter(**{lookup: valor})
+    return queryset
+
+
+class Exportacion:
+    def __init__(self, modelo, columnas, filtros=None, orden=('pk',)):
+        self.modelo = modelo
+        self.columnas = columnas
+        self.filtros = filtros or {}
+        self.orden = orden
+
+    def consulta(self, parametros):
+        queryset = filtrar(self.modelo.objects.all(), self.filtros, parametros)
+        campos = [campo for campo, _ in self.columnas]
+        return queryset.order_by(*self.orden).values_list(*campos)
+
+    def encabezados(self):
+        return [titulo for _, titulo in self.columnas]
+
+
+EXPORTACIONES = {
+    'estudiantes': Exportacion(
+        Estudiante,
+        PERSONA + [('grupo__grado__nombre', 'Grado'), ('grupo__nombre', 'Grupo')],
+        filtros={'grupo': ('grupo_id', FILTRO_ID), 'grado': ('grupo__grado_id', FILTRO_ID)},
+    ),
+    'docentes': Exportacion(Docente, PERSONA + [('especialidad', 'Especialidad')]),
+    'acudientes': Exportacion(Acudiente, PERSONA),
+    'niveles': Exportacion(NivelEducativo, [('pk', 'ID'), ('nombre', 'Nivel')]),
+    'grados': Exportacion(
+        Grado, [('pk', 'ID'), ('nivel__nombre', 'Nivel'), ('nombre', 'Grado')],
+        filtros={'nivel': ('nivel_id', FILTRO_ID)},
+    ),
+    'areas': Exportacion(Area, [('pk', 'ID'), ('nombre', 'Área'), ('obligatoria', 'Obligatoria')]),
+    'asignaturas': Exportacion(
+        Asignatura,
+        [('pk', 'ID'), ('nombre', 'Asignatura'), ('area__nombre', 'Área'),
+         ('grado__nivel__nombre', 'Nivel'), ('grado__nombre', 'Grado')],
+        filtros={'grado': ('grado_id', FILTRO_ID), 'area': ('area_id', FILTRO_ID)},
+    ),
+    'temas': Exportacion(
+        Tema, [('pk', 'ID'), ('nombre', 'Tema'), ('asignatura__nombre', 'Asignatura')],
+        filtros={'asignatura': ('asignatura_id', FILTRO_ID)},
+    ),
+    'logros': Exportacion(
+        Logro, [('pk', 'ID'), ('descripcion', 'Logro'), ('asignatura__nombre', 'Asignatura')],
+        filtros={'asignatura': ('asignatura_id', FILTRO_ID)},
+    ),
+    'grupos': Exportacion(
+        Grupo,
+        [('pk', 'ID'), ('grado__nivel__nombre', 'Nivel'), ('grado__nombre', 'Grado'),
+         ('nombre', 'Grupo'), ('aula__nombre', 'Aula')],
+        filtros={'grado': ('grado_id', FILTRO_ID)},
+    ),
+    'calificaciones': Exportacion(
+        Calificacion,
+        [('estudiante__numero_documento', 'Documento'),
+         ('estudiante__primer_apellido', 'Primer apellido'),
+         ('estudiante__primer_nombre', 'Primer nombre'),
+         ('actividad__asignacion__grupo__grado__nombre', 'Grado'),
+         ('actividad__asignacion__grupo__nombre', 'Grupo'),
+         ('actividad__asignacion__asignatura__nombre', 'Asignatura'),
+         ('actividad__titulo', 'Actividad'),
+         ('nota', 'Nota'),
+         ('fecha_registro', 'Fecha')],
+        filtros={
+            'grupo': ('actividad__asignacion__grupo_id', FILTRO_ID),
+            'asignatura': ('actividad__asignacion__asignatura_id', FILTRO_ID),
+            'estudiante': ('estudiante_id', FILTRO_ID),
+            'desde': ('fecha_registro__gte', FILTRO_FECHA),
+            'hasta': ('fecha_registro__lte', FILTRO_FECHA),
+        },
+    ),
+}
+
+
+class _Eco:
+    """Pseudo-archivo: csv.writer escribe aquí y la línea se devuelve tal cual."""
+
+    def write(self, valor):
+        return valor
+
+
+# Excel evalúa como fórmula una celda de texto que empiece por estos
+# caracteres (inyección de fórmulas): se les antepone un apóstrofo
+INICIO_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+def texto_seguro(valor):
+    if isinstance(valor, str) and valor.startswith(INICIO_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def filas_csv(exportacion, queryset, excel=False):
+    """
+    Generador de líneas CSV. Con `excel` se antepone el BOM de UTF-8, se usa
+    ';' como separador, que es lo que espera Excel en configuración regional
+    en español, y los textos que Excel tomaría por fórmulas van con apóstrofo.
+    """
+    escritor = csv.writer(_Eco(), delimiter=';' if excel else ',')
+    if excel:
+        yield '\ufeff'
+    yield escritor.writerow(exportacion.encabezados())
+    for fila in queryset.iterator(chunk_size=TAMANO_BLOQUE):
+        yield escritor.writerow([texto_seguro(valor) for valor in fila] if excel else fila)
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.hashers import make_password
 from .models import Usuario, Rol, NivelEducativo, Grado, Area, Asignatura, Tema, Logro
+from .opciones import CampoOpcionesEnCache
 import re
 
 # Formulario de Registro de Usuario
@@ -18,6 +19,7 @@ class RegistroUsuarioForm(forms.ModelForm):
     class Meta:
         model = Usuario
         fields = ['correo', 'rol', 'password']
+        field_classes = {'rol': CampoOpcionesEnCache}
 
     def clean(self):
         cleaned_data = super().clean()
@@ -62,6 +64,7 @@ class GradoForm(forms.ModelForm):
     class Meta:
         model = Grado
         fields = ['nivel', 'nombre']
+        field_classes = {'nivel': CampoOpcionesEnCache}
 
 # Formulario para Área
 class AreaForm(forms.ModelForm):
@@ -74,15 +77,39 @@ class AsignaturaForm(forms.ModelForm):
     class Meta:
         model = Asignatura
         fields = ['nombre', 'grado', 'area']
+        field_classes = {'grado': CampoOpcionesEnCache, 'area': CampoOpcionesEnCache}
 
 # Formulario para Tema
 class TemaForm(forms.ModelForm):
     class Meta:
         model = Tema
         fields = ['nombre', 'asignatura']
+        field_classes = {'asignatura': CampoOpcionesEnCache}
 
 # Formulario para Logro
 class LogroForm(forms.ModelForm):
     class Meta:
         model = Logro
         fields = ['descripcion', 'asignatura']
+        field_classes = {'asignatura': CampoOpcionesEnCache}
+
+# Formulario para la importación masiva de personas
+class ImportarPersonasForm(forms.Form):
+    TIPOS = [
+        ('estudiantes', 'Estudiantes'),
+        ('docentes', 'Docentes'),
+        ('acudientes', 'Acudientes'),
+    ]
+    tipo = forms.ChoiceField(label="Tipo de persona", choices=TIPOS)
+    archivo = forms.FileField(
+        label="Archivo CSV",
+        help_text="Columnas: tipo_documento, numero_documento, primer_nombre, segundo_nombre, primer_apellido, "
+                  "segundo_apellido, direccion_linea1, direccion_linea2, ciudad, departamento "
+                  "(y especialidad para docentes, grupo para estudiantes).",
+    )
+
+
+class ProgramarBoletinesForm(forms.Form):
+    grado = CampoOpcionesEnCache(queryset=Grado.objects.all(), label="Grado")
+    desde = forms.DateField(label="Desde", required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    hasta = forms.DateField(label="Hasta", required=False, widget=forms.DateInput(attrs={'type': 'date'}))
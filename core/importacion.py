@@ -0,0 +1,249 @@
+import csv
+import io
+from itertools import islice
+
+from django.db import IntegrityError, connection, transaction
+
+from .busqueda import indexar, normalizar
+from .models import Acudiente, Ciudad, Docente, Estudiante, Grupo, TipoDocumento
+
+# ────────────────────────────────
+# IMPORTACIÓN MASIVA DE PERSONAS
+# ────────────────────────────────
+#
+# El CSV se lee en lotes de TAMANO_LOTE filas. Los nombres de tipo de
+# documento y ciudad se resuelven contra mapas en memoria cargados una vez,
+# los documentos repetidos se descartan (en el archivo y contra la base de
+# datos, con una consulta por lote) y cada lote se carga con COPY en
+# PostgreSQL o con INSERT ... ON CONFLICT DO NOTHING en otros motores, y se
+# agrega al índice de búsqueda de personas.
+#
+# Los documentos que ya estaban en la base de datos (los de una importación
+# anterior, los de un reintento que ya cargó esos lotes o los que otro
+# proceso registre entre la consulta y la carga) no son errores: se
+# informan aparte, en ya_registrados. Tras cada lote se llama a `progreso`.
+
+TAMANO_LOTE = 2000
+
+CAMPOS_PERSONA = [
+    'tipo_documento', 'numero_documento', 'primer_nombre', 'segundo_nombre',
+    'primer_apellido', 'segundo_apellido', 'direccion_linea1', 'direccion_linea2', 'ciudad',
+]
+OBLIGATORIOS = ['tipo_documento', 'numero_documento', 'primer_nombre', 'primer_apellido', 'direccion_linea1', 'ciudad']
+
+TIPOS = {
+    'estudiantes': (Estudiante, ['grupo']),
+    'docentes': (Docente, ['especialidad']),
+    'acudientes': (Acudiente, []),
+}
+
+
+class ResultadoImportacion:
+    def __init__(self):
+        self.creados = 0
+        self.filas = 0
+        self.errores = []
+        self.ya_registrados = []
+
+    def error(self, fila, documento, mensaje):
+        self.errores.append({'fila': fila, 'numero_documento': documento, 'error': mensaje})
+
+    def registrado(self, fila, documento):
+        self.ya_registrados.append({'fila': fila, 'numero_documento': documento})
+
+
+class Resolutor:
+    """Mapas nombre -> id de las tablas referenciadas, cargados una sola vez."""
+
+    AMBIGUO = object()
+
+    def __init__(self):
+        self.tipos = {normalizar(nombre): pk for pk, nombre in TipoDocumento.objects.values_list('pk', 'nombre')}
+        self.ciudades = {}
+        self.ciudades_departamento = {}
+        for pk, nombre, departamento in Ciudad.objects.values_list('pk', 'nombre', 'departamento__nombre'):
+            clave = normalizar(nombre)
+            self.ciudades[clave] = self.AMBIGUO if clave in self.ciudades else pk
+            self.ciudades_departamento[(clave, normalizar(departamento))] = pk
+        self.grupos = set(Grupo.objects.values_list('pk', flat=True))
+
+    def tipo_documento(self, nombre):
+        pk = self.tipos.get(normalizar(nombre))
+        if pk is None:
+            raise ValueError(f"Tipo de documento desconocido: {nombre}")
+        return pk
+
+    def ciudad(self, nombre, departamento=''):
+        if departamento:
+            pk = self.ciudades_departamento.get((normalizar(nombre), normalizar(departamento)))
+        else:
+            pk = self.ciudades.get(normalizar(nombre))
+        if pk is self.AMBIGUO:
+            raise ValueError(f"Hay varias ciudades llamadas {nombre}: indica el departamento.")
+        if pk is None:
+            raise ValueError(f"Ciudad desconocida: {nombre}")
+        return pk
+
+    def grupo(self, valor):
+        if not valor:
+            return None
+        if not valor.isdigit() or int(valor) not in self.grupos:
+            raise ValueError(f"Grupo desconocido: {valor}")
+        return int(valor)
+
+
+def _convertir(modelo, extras, fila, resolutor):
+    """Convierte una fila del CSV en un dict campo -> valor listo para guardar."""
+    faltantes = [campo for campo in OBLIGATORIOS if not (fila.get(campo) or '').strip()]
+    if faltantes:
+        raise ValueError(f"Faltan campos obligatorios: {', '.join(faltantes)}")
+    if modelo is Docente and not (fila.get('especialidad') or '').strip():
+        raise ValueError("Falta la especialidad del docente.")
+
+    datos = {}
+    for campo in CAMPOS_PERSONA + [e for e in extras if e != 'grupo']:
+        if campo in ('tipo_documento', 'ciudad'):
+            continue
+        valor = (fila.get(campo) or '').strip() or None
+        limite = modelo._meta.get_field(campo).max_length
+        if valor and limite and len(valor) > limite:
+            raise ValueError(f"El campo {campo} supera {limite} caracteres.")
+        datos[campo] = valor
+    datos['tipo_documento_id'] = resolutor.tipo_documento(fila.get('tipo_documento'))
+    datos['ciudad_id'] = resolutor.ciudad(fila.get('ciudad'), (fila.get('departamento') or '').strip())
+    if 'grupo' in extras:
+        datos['grupo_id'] = resolutor.grupo((fila.get('grupo') or '').strip())
+    return datos
+
+
+def _columnas(modelo, campos):
+    return ', '.join(
+        connection.ops.quote_name(modelo._meta.get_field(campo.removesuffix('_id')).column)
+        for campo in campos
+    )
+
+
+def _copiar(modelo, registros):
+    """Carga los registros con COPY ... FROM STDIN (psycopg 3)."""
+    campos = list(registros[0])
+    columnas = _columnas(modelo, campos)
+    sql = f"COPY {connection.ops.quote_name(modelo._meta.db_table)} ({columnas}) FROM STDIN"
+    with connection.cursor() as cursor:
+        with cursor.copy(sql) as copia:
+            for registro in registros:
+                copia.write_row([registro[campo] for campo in campos])
+
+
+def _insertar_omitiendo(modelo, registros):
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING (PostgreSQL y SQLite >= 3.35):
+    la base de datos dice exactamente qué documentos insertó.
+    """
+    campos = list(registros[0])
+    columnas = _columnas(modelo, campos)
+    documento = connection.ops.quote_name(modelo._meta.get_field('numero_documento').column)
+    maximo = connection.features.max_query_params
+    por_sentencia = min(TAMANO_LOTE, maximo // len(campos)) if maximo else TAMANO_LOTE
+    marcas = f"({', '.join(['%s'] * len(campos))})"
+    insertados = set()
+    with connection.cursor() as cursor:
+        for inicio in range(0, len(registros), por_sentencia):
+            parte = registros[inicio:inicio + por_sentencia]
+            cursor.execute(
+                f"INSERT INTO {connection.ops.quote_name(modelo._meta.db_table)} ({columnas}) "
+                f"VALUES {', '.join([marcas] * len(parte))} "
+                f"ON CONFLICT ({documento}) DO NOTHING RETURNING {documento}",
+                [registro[campo] for registro in parte for campo in campos],
+            )
+            insertados.update(fila[0] for fila in cursor.fetchall())
+    return insertados
+
+
+def _cargar(modelo, registros):
+    """Carga los registros y devuelve el conjunto de documentos que quedaron insertados."""
+    documentos = {registro['numero_documento'] for registro in registros}
+    if connection.vendor == 'postgresql':
+        try:
+            with transaction.atomic():
+                _copiar(modelo, registros)
+            return documentos
+        except IntegrityError:
+            # Otro proceso insertó alguno de los documentos mientras tanto:
+            # se repite el lote omitiendo los que ya existen
+            pass
+    if connection.vendor in ('postgresql', 'sqlite'):
+        with transaction.atomic():
+            return _insertar_omitiendo(modelo, registros)
+    # Sin RETURNING: los documentos que ya estaban justo antes no son nuestros
+    with transaction.atomic():
+        antes = set(
+            modelo.objects.filter(numero_documento__in=documentos).values_list('numero_documento', flat=True)
+        )
+        modelo.objects.bulk_create(
+            [modelo(**registro) for registro in registros], batch_size=TAMANO_LOTE, ignore_conflicts=True,
+        )
+    return documentos - antes
+
+
+def importar_personas(tipo, archivo, delimitador=',', progreso=None):
+    """
+    Importa personas desde `archivo` (texto CSV con encabezados). `tipo` es
+    'estudiantes', 'docentes' o 'acudientes'. Devuelve un ResultadoImportacion
+    con el número de registros creados, los documentos que ya estaban
+    registrados y los errores fila por fila. `progreso(resultado)` se llama
+    al terminar cada lote.
+    """
+    modelo, extras = TIPOS[tipo]
+    resolutor = Resolutor()
+    resultado = ResultadoImportacion()
+    lector = csv.DictReader(archivo, delimiter=delimitador)
+    vistos = set()
+    numero = 1  # la fila 1 es el encabezado
+
+    while True:
+        lote = list(islice(lector, TAMANO_LOTE))
+        if not lote:
+            break
+        candidatos = []
+        for fila in lote:
+            numero += 1
+            documento = (fila.get('numero_documento') or '').strip()
+            if documento in vistos:
+                resultado.error(numero, documento, "Documento repetido en el archivo.")
+                continue
+            try:
+                datos = _convertir(modelo, extras, fila, resolutor)
+            except ValueError as exc:
+                resultado.error(numero, documento, str(exc))
+                continue
+            vistos.add(documento)
+            candidatos.append((numero, datos))
+
+        existentes = set(
+            modelo.objects.filter(numero_documento__in=[d['numero_documento'] for _, d in candidatos])
+            .values_list('numero_documento', flat=True)
+        )
+        registros = []
+        for fila, datos in candidatos:
+            if datos['numero_documento'] in existentes:
+                resultado.registrado(fila, datos['numero_documento'])
+            else:
+                registros.append((fila, datos))
+        if registros:
+            insertados = _cargar(modelo, [datos for _, datos in registros])
+            # Los que otro proceso registró entre la consulta y la carga
+            for fila, datos in registros:
+                if datos['numero_documento'] not in insertados:
+                    resultado.registrado(fila, datos['numero_documento'])
+            resultado.creados += len(insertados)
+            # COPY y los INSERT directos no emiten señales: el índice de búsqueda se llena aquí
+            indexar(modelo, numero_documento__in=list(insertados))
+        resultado.filas += len(lote)
+        if progreso:
+            progreso(resultado)
+    return resultado
+
+
+def abrir_subida(archivo_subido):
+    """Envuelve un archivo subido (bytes) como texto UTF-8, admitiendo BOM."""
+    return io.TextIOWrapper(archivo_subido.file, encoding='utf-8-sig', newline='')
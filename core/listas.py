@@ -0,0 +1,297 @@
+import functools
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+from django.utils.functional import cached_property
+
+from . import versiones
+from .models import NivelEducativo, Grado, Area, Asignatura, Tema, Logro, Tarea
+from .opciones import DEPENDIENTES, aopciones, opciones
+from .paginacion import PaginadorKeyset, TAMANO_PAGINA
+
+# Cuánto vive en la caché el fragmento de una lista versionada; al cambiar
+# la versión deja de usarse antes
+FRAGMENTO_TIMEOUT = 60 * 60 * 24
+
+# ────────────────────────────────
+# MOTOR DE LISTAS DEL PANEL DEL COORDINADOR
+# ────────────────────────────────
+
+class Filtro:
+    """
+    Filtro de una lista por un parámetro GET. Las opciones del <select> de
+    la plantilla son las de `modelo` en core/opciones.py, compartidas con
+    los formularios.
+    """
+
+    def __init__(self, parametro, etiqueta, lookup, modelo):
+        self.parametro = parametro
+        self.etiqueta = etiqueta
+        self.lookup = lookup
+        self.modelo = modelo
+
+    def opciones(self):
+        return opciones(self.modelo)
+
+    async def aopciones(self):
+        return await aopciones(self.modelo)
+
+    def contexto(self, valor, opciones):
+        """Lo que pinta panel_coordinador/_filtros.html para este filtro."""
+        return {
+            'parametro': self.parametro,
+            'etiqueta': self.etiqueta,
+            'opciones': [(str(pk), texto) for pk, texto in opciones],
+            'seleccionado': valor,
+        }
+
+
+class ListaCoordinador:
+    """
+    Describe una lista del panel del coordinador: qué modelo se lista, qué
+    columnas pinta la plantilla y qué relaciones se recorren en ella.
+
+    Las relaciones ForeignKey se cargan con JOIN (select_related) y solo se
+    piden las columnas declaradas (only), así cada página ejecuta siempre el
+    mismo número de consultas sin importar cuántas filas tenga la tabla.
+    Los resultados se filtran en la base de datos y se paginan por cursor
+    (ver core/paginacion.py); `ordenes` asocia el nombre público de cada
+    columna ordenable con un campo propio del modelo, que debería tener un
+    índice (campo, id). Las columnas de una relación no se ordenan: se
+    filtran.
+
+    Una lista `versionada` solo muestra tablas de core/versiones.py. Con sus
+    versiones arma el ETag de cada página: si el navegador ya la tiene
+    responde 304 sin consultar nada, y si no, la plantilla guarda la tabla
+    en la caché con {% cache %} bajo esa misma versión y la página solo se
+    consulta cuando el fragmento no está.
+    """
+
+    def __init__(self, modelo, plantilla, nombre_contexto, campos, relaciones=(),
+                 ordenes=None, orden='pk', filtros=(), versionada=False):
+        self.modelo = modelo
+        self.plantilla = plantilla
+        self.nombre_contexto = nombre_contexto
+        self.campos = tuple(campos)
+        self.relaciones = tuple(relaciones)
+        self.ordenes = dict(ordenes or {})
+        relaciones_en_orden = [campo for campo in self.ordenes.values() if '__' in campo]
+        if relaciones_en_orden:
+            raise ValueError(f"La lista de {nombre_contexto} ordena por campos de otra tabla: {relaciones_en_orden}")
+        self.orden = orden
+        self.filtros = tuple(filtros)
+        self.versionada = versionada
+
+    @cached_property
+    def dependencias(self):
+        """Modelos cuyos datos pinta la lista: el suyo, sus relaciones y las opciones de sus filtros."""
+        modelos = [self.modelo]
+        for relacion in self.relaciones:
+            modelo = self.modelo
+            for nombre in relacion.split('__'):
+                modelo = modelo._meta.get_field(nombre).related_model
+                modelos.append(modelo)
+        for filtro in self.filtros:
+            modelos.append(filtro.modelo)
+            modelos += [fuente for fuente, dependientes in DEPENDIENTES.items() if filtro.modelo in dependientes]
+        modelos = list(dict.fromkeys(modelos))
+        if self.versionada and not set(modelos) <= set(versiones.MODELOS):
+            raise ValueError(f"La lista de {self.nombre_contexto} depende de modelos sin versión: {modelos}")
+        return modelos
+
+    def consulta(self):
+        queryset = self.modelo.objects.all()
+        if self.relaciones:
+            queryset = queryset.select_related(*self.relaciones)
+        return queryset.only(*self.campos)
+
+    def _orden_solicitado(self, parametros):
+        clave = parametros.get('orden', '')
+        if clave.lstrip('-') in self.ordenes:
+            return clave
+        return self.orden
+
+    def _url(self, parametros, **cambios):
+        query = parametros.copy()
+        for nombre, valor in cambios.items():
+            if valor is None:
+                query.pop(nombre, None)
+            else:
+                query[nombre] = valor
+        return '?' + query.urlencode()
+
+    def _preparar(self, parametros):
+        """Queryset filtrado, filtros aplicados, clave de orden y paginador."""
+        queryset = self.consulta()
+        aplicados = []
+        for filtro in self.filtros:
+            valor = parametros.get(filtro.parametro, '')
+            if valor.isdigit():
+                queryset = queryset.filter(**{filtro.lookup: valor})
+            else:
+                valor = ''
+            aplicados.append((filtro, valor))
+
+        clave = self._orden_solicitado(parametros)
+        campo = self.ordenes.get(clave.lstrip('-'), 'pk')
+        orden = ('-' if clave.startswith('-') else '') + campo
+        tamano = parametros.get('tamano', '')
+        paginador = PaginadorKeyset(queryset, orden, int(tamano) if tamano.isdigit() else TAMANO_PAGINA)
+        return aplicados, clave, paginador
+
+    def _contexto(self, parametros, clave, pagina, filtros):
+        # `pagina` es una función que devuelve la Pagina: la plantilla la
+        # llama solo si pinta la tabla (no, si su fragmento está en caché)
+        columnas = {}
+        for nombre in self.ordenes:
+            activa = clave.lstrip('-') == nombre
+            descendente = activa and clave.startswith('-')
+            siguiente = nombre if descendente or not activa else f'-{nombre}'
+            columnas[nombre] = {
+                'url': self._url(parametros, orden=siguiente, cursor=None),
+                'activa': activa,
+                'descendente': descendente,
+            }
+
+        return {
+            self.nombre_contexto: lambda: pagina().objetos,
+            'pagina': pagina,
+            'columnas': columnas,
+            'filtros': filtros,
+            'url_siguiente': lambda: (
+                self._url(parametros, cursor=pagina().cursor_siguiente) if pagina().tiene_siguiente else None
+            ),
+            'url_anterior': lambda: (
+                self._url(parametros, cursor=pagina().cursor_anterior) if pagina().tiene_anterior else None
+            ),
+        }
+
+    def contexto(self, request, diferida=False):
+        """Con `diferida`, la página se consulta cuando la plantilla la pinta."""
+        parametros = request.GET
+        aplicados, clave, paginador = self._preparar(parametros)
+        filtros = [filtro.contexto(valor, filtro.opciones()) for filtro, valor in aplicados]
+        if diferida:
+            pagina = functools.cache(functools.partial(paginador.pagina, parametros.get('cursor')))
+        else:
+            cargada = paginador.pagina(parametros.get('cursor'))
+            pagina = lambda: cargada  # noqa: E731
+        return self._contexto(parametros, clave, pagina, filtros)
+
+    async def acontexto(self, request):
+        parametros = request.GET
+        aplicados, clave, paginador = self._preparar(parametros)
+        filtros = [filtro.contexto(valor, await filtro.aopciones()) for filtro, valor in aplicados]
+        pagina = await paginador.apagina(parametros.get('cursor'))
+        return self._contexto(parametros, clave, lambda: pagina, filtros)
+
+    def _pintar(self, request, version, ultima):
+        contexto = self.contexto(request, diferida=True)
+        contexto.update(version=version, fragmento_timeout=FRAGMENTO_TIMEOUT)
+        return versiones.marcar(render(request, self.plantilla, contexto), version, ultima)
+
+    def respuesta(self, request):
+        if not self.versionada:
+            return render(request, self.plantilla, self.contexto(request))
+        version, ultima = versiones.huella(
+            versiones.versiones(self.dependencias), self.plantilla, request.GET.urlencode(),
+        )
+        no_modificada = versiones.no_modificada(request, version, ultima)
+        if no_modificada is not None:
+            return no_modificada
+        return self._pintar(request, version, ultima)
+
+    async def arespuesta(self, request):
+        if not self.versionada:
+            # Con la página ya cargada, renderizar no hace consultas
+            return render(request, self.plantilla, await self.acontexto(request))
+        version, ultima = versiones.huella(
+            await versiones.aversiones(self.dependencias), self.plantilla, request.GET.urlencode(),
+        )
+        no_modificada = versiones.no_modificada(request, version, ultima)
+        if no_modificada is not None:
+            return no_modificada
+        # La página se consulta (si hace falta) al pintar: fuera del bucle de eventos
+        return await sync_to_async(self._pintar)(request, version, ultima)
+
+
+# Listas declaradas: "campos" debe incluir todo lo que la plantilla lee,
+# incluso los atributos de las relaciones (p. ej. 'grado__nombre').
+LISTA_NIVELES = ListaCoordinador(
+    NivelEducativo,
+    plantilla='panel_coordinador/nivel_list.html',
+    nombre_contexto='niveles',
+    campos=['nombre'],
+    ordenes={'nombre': 'nombre'},
+    orden='nombre',
+    versionada=True,
+)
+
+LISTA_GRADOS = ListaCoordinador(
+    Grado,
+    plantilla='panel_coordinador/grado_list.html',
+    nombre_contexto='grados',
+    campos=['nombre'],
+    ordenes={'nombre': 'nombre'},
+    orden='nombre',
+    filtros=[Filtro('nivel', 'Nivel', 'nivel_id', NivelEducativo)],
+    versionada=True,
+)
+
+LISTA_AREAS = ListaCoordinador(
+    Area,
+    plantilla='panel_coordinador/area_list.html',
+    nombre_contexto='areas',
+    campos=['nombre'],
+    ordenes={'nombre': 'nombre'},
+    orden='nombre',
+    versionada=True,
+)
+
+LISTA_ASIGNATURAS = ListaCoordinador(
+    Asignatura,
+    plantilla='panel_coordinador/asignatura_list.html',
+    nombre_contexto='asignaturas',
+    campos=['nombre', 'grado__nombre', 'area__nombre'],
+    relaciones=['grado', 'area'],
+    ordenes={'nombre': 'nombre'},
+    orden='nombre',
+    filtros=[
+        Filtro('grado', 'Grado', 'grado_id', Grado),
+        Filtro('area', 'Área', 'area_id', Area),
+    ],
+    versionada=True,
+)
+
+LISTA_TEMAS = ListaCoordinador(
+    Tema,
+    plantilla='panel_coordinador/tema_list.html',
+    nombre_contexto='temas',
+    campos=['nombre', 'asignatura__nombre'],
+    relaciones=['asignatura'],
+    ordenes={'nombre': 'nombre'},
+    orden='nombre',
+    filtros=[Filtro('asignatura', 'Asignatura', 'asignatura_id', Asignatura)],
+    versionada=True,
+)
+
+LISTA_LOGROS = ListaCoordinador(
+    Logro,
+    plantilla='panel_coordinador/logro_list.html',
+    nombre_contexto='logros',
+    campos=['descripcion', 'asignatura__nombre'],
+    relaciones=['asignatura'],
+    ordenes={'id': 'pk'},
+    orden='id',
+    filtros=[Filtro('asignatura', 'Asignatura', 'asignatura_id', Asignatura)],
+    versionada=True,
+)
+
+LISTA_TAREAS = ListaCoordinador(
+    Tarea,
+    plantilla='panel_coordinador/tarea_list.html',
+    nombre_contexto='tareas',
+    campos=['descripcion', 'estado', 'hechos', 'total', 'intentos', 'creada'],
+    ordenes={'id': 'pk'},
+    orden='-id',
+)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import VISTAS_CONCURRENCIA, comparar_servidores
+
+
+class Command(BaseCommand):
+    help = "Compara el rendimiento de las vistas de lectura por WSGI y por ASGI con peticiones concurrentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrencia', type=int, default=20)
+        parser.add_argument('--peticiones', type=int, default=400)
+        parser.add_argument('--vista', action='append', dest='vistas',
+                            help=f"Nombre de URL a pedir (repetible). Por omisión: {', '.join(VISTAS_CONCURRENCIA)}.")
+
+    def handle(self, *args, **options):
+        try:
+            resultados = comparar_servidores(options['vistas'], options['concurrencia'], options['peticiones'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(f"{'camino':<8}{'pet/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errores':>9}")
+        for camino, r in resultados.items():
+            self.stdout.write(f"{camino:<8}{r['por_segundo']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['errores']:>9}")
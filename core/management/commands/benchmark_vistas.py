@@ -0,0 +1,38 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import comparar, medir
+
+
+class Command(BaseCommand):
+    help = "Mide latencia, consultas SQL y memoria de todas las vistas de core y compara contra una línea base."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=20)
+        parser.add_argument('--guardar', help="Guarda los resultados como línea base en este archivo JSON.")
+        parser.add_argument('--base', help="Archivo JSON de línea base contra el cual comparar.")
+        parser.add_argument('--tolerancia', type=float, default=0.25,
+                            help="Aumento relativo permitido en p95 y memoria (0.25 = 25%%).")
+
+    def handle(self, *args, **options):
+        resultados = medir(repeticiones=options['repeticiones'])
+
+        self.stdout.write(f"{'vista':<24}{'estado':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'SQL':>6}{'mem KB':>10}")
+        for nombre, r in sorted(resultados.items()):
+            self.stdout.write(
+                f"{nombre:<24}{r['estado']:>7}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['consultas']:>6}{r['memoria_kb']:>10}"
+            )
+
+        if options['guardar']:
+            with open(options['guardar'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultados, archivo, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Línea base guardada en {options['guardar']}."))
+
+        if options['base']:
+            with open(options['base'], encoding='utf-8') as archivo:
+                base = json.load(archivo)
+            regresiones = comparar(resultados, base, options['tolerancia'])
+            if regresiones:
+                raise CommandError("Regresiones de rendimiento:\n" + "\n".join(regresiones))
+            self.stdout.write(self.style.SUCCESS("Sin regresiones respecto a la línea base."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+
+from core.conexiones import comprobar, estadisticas_pool
+
+
+class Command(BaseCommand):
+    help = (
+        "Comprueba la conexión a cada base de datos y muestra el estado de su pool en este proceso "
+        "(para el de un servidor en marcha, ver /coordinador/sistema/conexiones/)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', dest='alias',
+                            help="Alias a comprobar (repetible). Por omisión, todos.")
+
+    def handle(self, *args, **options):
+        for alias in options['alias'] or list(connections):
+            try:
+                ms = comprobar(alias)
+            except DatabaseError as exc:
+                self.stdout.write(self.style.ERROR(f"{alias}: sin conexión ({exc})"))
+                continue
+            estadisticas = estadisticas_pool(alias)
+            if estadisticas is None:
+                self.stdout.write(self.style.SUCCESS(f"{alias}: conexión en {ms} ms, sin pool"))
+                continue
+            self.stdout.write(self.style.SUCCESS(f"{alias}: conexión en {ms} ms"))
+            for clave, valor in estadisticas.items():
+                self.stdout.write(f"  {clave:<20}{valor}")
@@ -0,0 +1,56 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core.boletines import generar_en_disco, generar_zip, grupos_de
+
+
+class Command(BaseCommand):
+    help = "Genera los boletines de los estudiantes de uno o varios grupos o grados."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grupo', type=int, action='append', help="ID de grupo (repetible).")
+        parser.add_argument('--grado', type=int, action='append', help="ID de grado (repetible).")
+        parser.add_argument('--salida', required=True, help="Directorio de salida, o archivo .zip.")
+        parser.add_argument('--procesos', type=int, default=None, help="Procesos para renderizar (por defecto, uno por núcleo).")
+        parser.add_argument('--reanudar', action='store_true', help="Omite los boletines ya generados en el directorio.")
+        parser.add_argument('--desde', help="Fecha inicial del periodo (AAAA-MM-DD).")
+        parser.add_argument('--hasta', help="Fecha final del periodo (AAAA-MM-DD).")
+
+    def handle(self, *args, **options):
+        if not options['grupo'] and not options['grado']:
+            raise CommandError("Indica al menos un --grupo o un --grado.")
+        desde = self._fecha(options['desde'])
+        hasta = self._fecha(options['hasta'])
+        grupos = grupos_de(options['grupo'], options['grado'])
+        if not grupos:
+            raise CommandError("No se encontraron grupos.")
+
+        salida = options['salida']
+        if salida.endswith('.zip'):
+            if options['reanudar']:
+                raise CommandError("--reanudar solo aplica a la salida en directorio.")
+            with open(salida, 'wb') as archivo:
+                for parte in generar_zip(grupos, options['procesos'] or os.cpu_count() or 1, desde, hasta):
+                    archivo.write(parte)
+            self.stdout.write(self.style.SUCCESS(f"Boletines guardados en {salida}."))
+            return
+
+        def progreso(hechos, total, grupo):
+            self.stdout.write(f"\rGrupo {grupo}: {hechos}/{total}", ending='\n' if hechos == total else '')
+            self.stdout.flush()
+
+        escritos = generar_en_disco(
+            grupos, salida, procesos=options['procesos'], reanudar=options['reanudar'],
+            desde=desde, hasta=hasta, progreso=progreso if options['verbosity'] > 0 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Boletines generados: {escritos}."))
+
+    def _fecha(self, valor):
+        if not valor:
+            return None
+        fecha = parse_date(valor)
+        if fecha is None:
+            raise CommandError(f"Fecha inválida: {valor}")
+        return fecha
@@ -0,0 +1,36 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importacion import TIPOS, importar_personas
+
+
+class Command(BaseCommand):
+    help = "Importa estudiantes, docentes o acudientes desde un archivo CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipo', choices=sorted(TIPOS))
+        parser.add_argument('archivo', help="Archivo CSV con encabezados (UTF-8).")
+        parser.add_argument('--delimitador', default=',')
+        parser.add_argument('--errores', help="Archivo CSV donde escribir las filas rechazadas.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['archivo'], encoding='utf-8-sig', newline='') as archivo:
+                resultado = importar_personas(options['tipo'], archivo, options['delimitador'])
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        if options['errores'] and resultado.errores:
+            with open(options['errores'], 'w', encoding='utf-8', newline='') as salida:
+                escritor = csv.DictWriter(salida, fieldnames=['fila', 'numero_documento', 'error'])
+                escritor.writeheader()
+                escritor.writerows(resultado.errores)
+        elif resultado.errores:
+            for error in resultado.errores:
+                self.stderr.write(f"Fila {error['fila']} ({error['numero_documento']}): {error['error']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Registros creados: {resultado.creados}. Ya registrados: {len(resultado.ya_registrados)}. "
+            f"Filas rechazadas: {len(resultado.errores)}."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.busqueda import reconstruir_indice
+
+
+class Command(BaseCommand):
+    help = "Rehace desde cero el índice de búsqueda de personas (perfiles, docentes, estudiantes y acudientes)."
+
+    def handle(self, *args, **options):
+        personas = reconstruir_indice()
+        self.stdout.write(self.style.SUCCESS(f"Índice de personas reconstruido: {personas} personas."))
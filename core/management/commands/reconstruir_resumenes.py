@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.resumenes import reconstruir_resumenes
+
+
+class Command(BaseCommand):
+    help = "Recalcula desde cero la tabla de resúmenes de calificaciones."
+
+    def handle(self, *args, **options):
+        celdas = reconstruir_resumenes()
+        self.stdout.write(self.style.SUCCESS(f"Resúmenes reconstruidos: {celdas} celdas."))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sintetico import CLAVE, CORREO_COORDINADOR, Configuracion, sembrar
+
+
+class Command(BaseCommand):
+    help = "Crea una institución sintética (niveles, grados, grupos, estudiantes y calificaciones) para pruebas de carga."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--niveles', type=int, default=3)
+        parser.add_argument('--grados-por-nivel', type=int, default=4)
+        parser.add_argument('--grupos-por-grado', type=int, default=4)
+        parser.add_argument('--estudiantes-por-grupo', type=int, default=35)
+        parser.add_argument('--areas', type=int, default=8)
+        parser.add_argument('--asignaturas-por-area', type=int, default=1)
+        parser.add_argument('--temas-por-asignatura', type=int, default=5)
+        parser.add_argument('--logros-por-asignatura', type=int, default=3)
+        parser.add_argument('--actividades-por-asignacion', type=int, default=10)
+        parser.add_argument('--semilla', type=int, default=2025)
+
+    def handle(self, *args, **options):
+        config = Configuracion(
+            niveles=options['niveles'],
+            grados_por_nivel=options['grados_por_nivel'],
+            grupos_por_grado=options['grupos_por_grado'],
+            estudiantes_por_grupo=options['estudiantes_por_grupo'],
+            areas=options['areas'],
+            asignaturas_por_area=options['asignaturas_por_area'],
+            temas_por_asignatura=options['temas_por_asignatura'],
+            logros_por_asignatura=options['logros_por_asignatura'],
+            actividades_por_asignacion=options['actividades_por_asignacion'],
+            semilla=options['semilla'],
+        )
+        inicio = time.perf_counter()
+        try:
+            conteo = sembrar(config, progreso=lambda mensaje: self.stdout.write(f"· {mensaje}"))
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for nombre, cantidad in conteo.items():
+            self.stdout.write(f"{nombre}: {cantidad}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Institución sintética creada en {time.perf_counter() - inicio:.1f} s. "
+            f"Coordinador: {CORREO_COORDINADOR} / {CLAVE}"
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.tareas import trabajar
+
+
+class Command(BaseCommand):
+    help = "Ejecuta las tareas en segundo plano encoladas en la base de datos (importaciones, boletines, borrados...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--una-vez', action='store_true', help="Termina cuando la cola quede vacía.")
+        parser.add_argument('--tipo', action='append', dest='tipos', help="Solo tareas de este tipo (repetible).")
+        parser.add_argument('--intervalo', type=float, default=2.0, help="Segundos de espera cuando no hay tareas.")
+        parser.add_argument('--max-tareas', type=int, default=None, help="Termina tras ejecutar este número de tareas.")
+        parser.add_argument('--nombre', default=None, help="Nombre del trabajador (por defecto, host:pid).")
+
+    def handle(self, *args, **options):
+        try:
+            ejecutadas = trabajar(
+                trabajador=options['nombre'], tipos=options['tipos'], una_vez=options['una_vez'],
+                intervalo=options['intervalo'], max_tareas=options['max_tareas'],
+            )
+        except KeyboardInterrupt:
+            return
+        self.stdout.write(self.style.SUCCESS(f"Tareas ejecutadas: {ejecutadas}."))
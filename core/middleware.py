@@ -0,0 +1,229 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import replicas
+
+logger = logging.getLogger('core.sql')
+
+# ────────────────────────────────
+# INSTRUMENTACIÓN SQL POR PETICIÓN
+# ────────────────────────────────
+
+# Número de repeticiones de una misma consulta a partir del cual se avisa
+# de un posible N+1
+UMBRAL_N_MAS_1 = getattr(settings, 'SQL_UMBRAL_N_MAS_1', 5)
+
+_LISTA_PARAMETROS = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_ESPACIOS = re.compile(r'\s+')
+
+
+def huella(sql):
+    """
+    Forma canónica de una consulta: sin literales, con las listas IN (...)
+    colapsadas y los espacios normalizados, para agrupar repeticiones.
+    """
+    sql = _LISTA_PARAMETROS.sub('(%s…)', sql)
+    sql = _LITERALES.sub('?', sql)
+    return _ESPACIOS.sub(' ', sql).strip()
+
+
+class RegistroConsultas:
+    """execute_wrapper que cuenta, cronometra y agrupa las consultas ejecutadas."""
+
+    def __init__(self):
+        self.cantidad = 0
+        self.duracion = 0.0
+        self.huellas = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duracion += time.perf_counter() - inicio
+            self.cantidad += 1
+            self.huellas[huella(sql)] += 1
+
+    def repetidas(self, umbral=2):
+        return [(sql, veces) for sql, veces in self.huellas.most_common() if veces >= umbral]
+
+    def registrar(self):
+        """Instala el registro en todas las conexiones; devuelve un ExitStack."""
+        pila = ExitStack()
+        for alias in connections:
+            pila.enter_context(connections[alias].execute_wrapper(self))
+        return pila
+
+
+class InstrumentacionSQLMiddleware:
+    """
+    Mide cuántas consultas hace cada petición y cuánto tardan. Lo publica en
+    la cabecera Server-Timing (visible en las herramientas del navegador) y
+    en el logger 'core.sql' como JSON; si una misma consulta se repite
+    UMBRAL_N_MAS_1 veces o más, lo registra como posible N+1.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.es_async = iscoroutinefunction(get_response)
+        if self.es_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.es_async:
+            return self.__acall__(request)
+        registro = RegistroConsultas()
+        inicio = time.perf_counter()
+        with registro.registrar():
+            response = self.get_response(request)
+        self._publicar(request, response, registro, inicio)
+        return response
+
+    async def __acall__(self, request):
+        # Bajo ASGI el ORM corre en el hilo de sync_to_async de la petición,
+        # que tiene sus propias conexiones: el registro se instala allí
+        registro = RegistroConsultas()
+        inicio = time.perf_counter()
+        pila = await sync_to_async(registro.registrar)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(pila.close)()
+        self._publicar(request, response, registro, inicio)
+        return response
+
+    def _publicar(self, request, response, registro, inicio):
+        """
+        Server-Timing sale con las cabeceras, así que solo cubre la vista.
+        En las respuestas en flujo (exportar, API, boletines) casi todas las
+        consultas ocurren mientras se envía el cuerpo: el registro se vuelve a
+        instalar en cada trozo y el log se escribe al terminar el flujo.
+        Los flujos asíncronos (async iterators) no se miden más allá de la vista.
+        """
+        total = time.perf_counter() - inicio
+        response['Server-Timing'] = (
+            f'db;dur={registro.duracion * 1000:.1f};desc="{registro.cantidad} consultas", '
+            f'total;dur={total * 1000:.1f}'
+        )
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._medir_flujo(
+                iter(response.streaming_content), request, response, registro, inicio,
+            )
+        else:
+            self._registrar(request, response, registro, total)
+
+    def _medir_flujo(self, partes, request, response, registro, inicio):
+        try:
+            while True:
+                with registro.registrar():
+                    parte = next(partes, None)
+                if parte is None:
+                    return
+                yield parte
+        finally:
+            self._registrar(request, response, registro, time.perf_counter() - inicio)
+
+    def _registrar(self, request, response, registro, total):
+        # Armar el JSON cuesta; con el logger en WARNING solo se arma para N+1
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+        repetidas = registro.repetidas(UMBRAL_N_MAS_1)
+        if repetidas:
+            nivel, evento = logging.WARNING, 'posible_n_mas_1'
+        elif logger.isEnabledFor(logging.INFO):
+            nivel, evento = logging.INFO, 'peticion'
+        else:
+            return
+        match = getattr(request, 'resolver_match', None)
+        datos = {
+            'evento': evento,
+            'metodo': request.method,
+            'ruta': request.path,
+            'vista': match.url_name if match else None,
+            'estado': response.status_code,
+            'consultas': registro.cantidad,
+            'db_ms': round(registro.duracion * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+            'repetidas': [{'sql': sql[:300], 'veces': veces} for sql, veces in repetidas],
+        }
+        logger.log(nivel, json.dumps(datos, ensure_ascii=False))
+
+
+# ────────────────────────────────
+# LECTURAS EN RÉPLICAS POR PETICIÓN
+# ────────────────────────────────
+
+METODOS_DE_LECTURA = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class ReplicasMiddleware:
+    """
+    Decide de qué base de datos lee cada petición (ver core/replicas.py):
+    las de solo lectura van a una réplica salvo que la vista pida la
+    primaria o que el usuario haya escrito hace menos de
+    REPLICA_FIJAR_SEGUNDOS; las demás van a la primaria y, al terminar,
+    dejan al usuario fijado a ella en su sesión. Sin réplicas configuradas
+    Django lo descarta al arrancar.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replicas.REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.es_async = iscoroutinefunction(get_response)
+        if self.es_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.es_async:
+            return self.__acall__(request)
+        hasta = request.session.get(replicas.SESION_FIJADA, 0) if self._tiene_sesion(request) else 0
+        request.primaria_fijada = hasta > time.time()
+        try:
+            response = self.get_response(request)
+        finally:
+            replicas.usar(None)
+        if request.method not in METODOS_DE_LECTURA and not request.session.is_empty():
+            request.session[replicas.SESION_FIJADA] = time.time() + replicas.FIJAR_SEGUNDOS
+        return response
+
+    async def __acall__(self, request):
+        hasta = await request.session.aget(replicas.SESION_FIJADA, 0) if self._tiene_sesion(request) else 0
+        request.primaria_fijada = hasta > time.time()
+        try:
+            response = await self.get_response(request)
+        finally:
+            replicas.usar(None)
+        if request.method not in METODOS_DE_LECTURA and not request.session.is_empty():
+            await request.session.aset(replicas.SESION_FIJADA, time.time() + replicas.FIJAR_SEGUNDOS)
+        return response
+
+    @staticmethod
+    def _tiene_sesion(request):
+        # Sin cookie no hay nada que leer: no se crea una sesión por esto
+        return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+    def process_view(self, request, vista, args, kwargs):
+        modo = getattr(vista, 'base_de_datos', None)
+        if request.method not in METODOS_DE_LECTURA or modo == replicas.PRIMARIA:
+            return None
+        if request.primaria_fijada and modo != replicas.REPLICA:
+            return None
+        replicas.usar(replicas.elegir_replica())
+        return None
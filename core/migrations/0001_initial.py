@@ -0,0 +1,284 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Area',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100)),
+                ('obligatoria', models.BooleanField(default=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AsignacionDocente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Aula',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=50)),
+                ('capacidad', models.PositiveIntegerField()),
+                ('estado', models.CharField(choices=[('Disponible', 'Disponible'), ('Ocupada', 'Ocupada'), ('Mantenimiento', 'Mantenimiento')], default='Disponible', max_length=20)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Departamento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=50)),
+            ],
+            options={
+                'verbose_name': 'Departamento',
+                'verbose_name_plural': 'Departamentos',
+            },
+        ),
+        migrations.CreateModel(
+            name='Grado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=10)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NivelEducativo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=50, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Rol',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Rol',
+                'verbose_name_plural': 'Roles',
+            },
+        ),
+        migrations.CreateModel(
+            name='TipoDocumento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=30)),
+            ],
+            options={
+                'verbose_name': 'Tipo de Documento',
+                'verbose_name_plural': 'Tipos de Documento',
+            },
+        ),
+        migrations.CreateModel(
+            name='Usuario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('correo', models.EmailField(max_length=254, unique=True)),
+                ('fecha_creacion', models.DateTimeField(default=django.utils.timezone.now)),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_staff', models.BooleanField(default=False)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
+                ('rol', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.rol')),
+            ],
+            options={
+                'verbose_name': 'Usuario',
+                'verbose_name_plural': 'Usuarios',
+            },
+        ),
+        migrations.CreateModel(
+            name='Actividad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('titulo', models.CharField(max_length=100)),
+                ('descripcion', models.TextField()),
+                ('es_calificable', models.BooleanField(default=True)),
+                ('fecha_publicacion', models.DateField(auto_now_add=True)),
+                ('asignacion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.asignaciondocente')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Asignatura',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100)),
+                ('area', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asignaturas', to='core.area')),
+                ('grado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asignaturas', to='core.grado')),
+            ],
+            options={
+                'unique_together': {('nombre', 'grado', 'area')},
+            },
+        ),
+        migrations.AddField(
+            model_name='asignaciondocente',
+            name='asignatura',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.asignatura'),
+        ),
+        migrations.CreateModel(
+            name='Ciudad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=50)),
+                ('departamento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.departamento')),
+            ],
+            options={
+                'verbose_name': 'Ciudad',
+                'verbose_name_plural': 'Ciudades',
+            },
+        ),
+        migrations.CreateModel(
+            name='Docente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('primer_nombre', models.CharField(max_length=50)),
+                ('segundo_nombre', models.CharField(blank=True, max_length=50, null=True)),
+                ('primer_apellido', models.CharField(max_length=50)),
+                ('segundo_apellido', models.CharField(blank=True, max_length=50, null=True)),
+                ('numero_documento', models.CharField(max_length=20, unique=True)),
+                ('direccion_linea1', models.CharField(max_length=100)),
+                ('direccion_linea2', models.CharField(blank=True, max_length=100, null=True)),
+                ('especialidad', models.CharField(max_length=100)),
+                ('ciudad', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.ciudad')),
+                ('tipo_documento', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.tipodocumento')),
+            ],
+            options={
+                'verbose_name': 'Docente',
+                'verbose_name_plural': 'Docentes',
+            },
+        ),
+        migrations.AddField(
+            model_name='asignaciondocente',
+            name='docente',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.docente'),
+        ),
+        migrations.CreateModel(
+            name='Estudiante',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('primer_nombre', models.CharField(max_length=50)),
+                ('segundo_nombre', models.CharField(blank=True, max_length=50, null=True)),
+                ('primer_apellido', models.CharField(max_length=50)),
+                ('segundo_apellido', models.CharField(blank=True, max_length=50, null=True)),
+                ('numero_documento', models.CharField(max_length=20, unique=True)),
+                ('direccion_linea1', models.CharField(max_length=100)),
+                ('direccion_linea2', models.CharField(blank=True, max_length=100, null=True)),
+                ('ciudad', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.ciudad')),
+                ('tipo_documento', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.tipodocumento')),
+            ],
+            options={
+                'verbose_name': 'Estudiante',
+                'verbose_name_plural': 'Estudiantes',
+            },
+        ),
+        migrations.CreateModel(
+            name='Calificacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nota', models.DecimalField(decimal_places=1, max_digits=3)),
+                ('fecha_registro', models.DateField(auto_now_add=True)),
+                ('actividad', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.actividad')),
+                ('estudiante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.estudiante')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Grupo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=10)),
+                ('aula', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.aula')),
+                ('grado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grupos', to='core.grado')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='asignaciondocente',
+            name='grupo',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.grupo'),
+        ),
+        migrations.CreateModel(
+            name='Logro',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('descripcion', models.TextField(unique=True)),
+                ('asignatura', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='logros', to='core.asignatura')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='grado',
+            name='nivel',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grados', to='core.niveleducativo'),
+        ),
+        migrations.CreateModel(
+            name='Tema',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100, unique=True)),
+                ('asignatura', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='temas', to='core.asignatura')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PerfilDeUsuario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('primer_nombre', models.CharField(max_length=50)),
+                ('segundo_nombre', models.CharField(blank=True, max_length=50, null=True)),
+                ('primer_apellido', models.CharField(max_length=50)),
+                ('segundo_apellido', models.CharField(blank=True, max_length=50, null=True)),
+                ('numero_documento', models.CharField(max_length=20, unique=True)),
+                ('direccion_linea1', models.CharField(max_length=100)),
+                ('direccion_linea2', models.CharField(blank=True, max_length=100, null=True)),
+                ('ciudad', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.ciudad')),
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='perfil', to=settings.AUTH_USER_MODEL)),
+                ('tipo_documento', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.tipodocumento')),
+            ],
+            options={
+                'verbose_name': 'Perfil de Usuario',
+                'verbose_name_plural': 'Perfiles de Usuario',
+            },
+        ),
+        migrations.CreateModel(
+            name='Acudiente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('primer_nombre', models.CharField(max_length=50)),
+                ('segundo_nombre', models.CharField(blank=True, max_length=50, null=True)),
+                ('primer_apellido', models.CharField(max_length=50)),
+                ('segundo_apellido', models.CharField(blank=True, max_length=50, null=True)),
+                ('numero_documento', models.CharField(max_length=20, unique=True)),
+                ('direccion_linea1', models.CharField(max_length=100)),
+                ('direccion_linea2', models.CharField(blank=True, max_length=100, null=True)),
+                ('ciudad', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.ciudad')),
+                ('tipo_documento', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.tipodocumento')),
+            ],
+            options={
+                'verbose_name': 'Acudiente',
+                'verbose_name_plural': 'Acudientes',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='asignaciondocente',
+            unique_together={('docente', 'grupo', 'asignatura')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='grado',
+            unique_together={('nivel', 'nombre')},
+        ),
+    ]
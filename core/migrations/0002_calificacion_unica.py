@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Exists, OuterRef, Q
+
+
+def descartar_repetidas(apps, schema_editor):
+    """
+    Deja una sola nota por (actividad, estudiante): la más reciente (por
+    fecha de registro y, a igual fecha, la de mayor id). Sin esto la
+    restricción única no se puede crear sobre datos que ya tienen repetidas.
+    """
+    Calificacion = apps.get_model('core', 'Calificacion')
+    db = schema_editor.connection.alias
+    mas_reciente = Calificacion.objects.using(db).filter(
+        actividad_id=OuterRef('actividad_id'), estudiante_id=OuterRef('estudiante_id'),
+    ).filter(
+        Q(fecha_registro__gt=OuterRef('fecha_registro'))
+        | Q(fecha_registro=OuterRef('fecha_registro'), pk__gt=OuterRef('pk'))
+    )
+    Calificacion.objects.using(db).filter(Exists(mas_reciente)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(descartar_repetidas, migrations.RunPython.noop, elidable=True),
+        migrations.AlterUniqueTogether(
+            name='calificacion',
+            unique_together={('actividad', 'estudiante')},
+        ),
+    ]
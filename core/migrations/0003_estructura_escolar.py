@@ -0,0 +1,232 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_calificacion_unica'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Eliminacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(max_length=100)),
+                ('objeto_id', models.PositiveIntegerField()),
+                ('descripcion', models.CharField(max_length=255)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_curso', 'En curso'), ('terminada', 'Terminada'), ('fallida', 'Fallida')], default='pendiente', max_length=20)),
+                ('impacto', models.JSONField(default=dict)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('eliminados', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('actualizada', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Eliminación',
+                'verbose_name_plural': 'Eliminaciones',
+            },
+        ),
+        migrations.CreateModel(
+            name='IndicePersona',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('perfil', 'Usuario'), ('docente', 'Docente'), ('estudiante', 'Estudiante'), ('acudiente', 'Acudiente')], max_length=20)),
+                ('objeto_id', models.PositiveBigIntegerField()),
+                ('nombre', models.CharField(max_length=210)),
+                ('numero_documento', models.CharField(db_index=True, max_length=20)),
+            ],
+            options={
+                'verbose_name': 'Índice de Persona',
+                'verbose_name_plural': 'Índice de Personas',
+            },
+        ),
+        migrations.CreateModel(
+            name='PalabraPersona',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('palabra', models.CharField(max_length=50)),
+            ],
+            options={
+                'verbose_name': 'Palabra de Persona',
+                'verbose_name_plural': 'Palabras de Personas',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenCalificacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cantidad', models.PositiveIntegerField(default=0)),
+                ('suma', models.DecimalField(decimal_places=1, default=0, max_digits=10)),
+                ('promedio', models.DecimalField(decimal_places=2, max_digits=4, null=True)),
+                ('minima', models.DecimalField(decimal_places=1, max_digits=3, null=True)),
+                ('maxima', models.DecimalField(decimal_places=1, max_digits=3, null=True)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Resumen de Calificaciones',
+                'verbose_name_plural': 'Resúmenes de Calificaciones',
+            },
+        ),
+        migrations.CreateModel(
+            name='Tarea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=50)),
+                ('descripcion', models.CharField(max_length=255)),
+                ('parametros', models.JSONField(default=dict)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_curso', 'En curso'), ('terminada', 'Terminada'), ('fallida', 'Fallida')], default='pendiente', max_length=20)),
+                ('prioridad', models.SmallIntegerField(default=0)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('max_intentos', models.PositiveSmallIntegerField(default=3)),
+                ('disponible_desde', models.DateTimeField(default=django.utils.timezone.now)),
+                ('hechos', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('mensaje', models.CharField(blank=True, max_length=255)),
+                ('resultado', models.JSONField(blank=True, default=dict)),
+                ('archivo', models.CharField(blank=True, max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('trabajador', models.CharField(blank=True, max_length=100)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('iniciada', models.DateTimeField(blank=True, null=True)),
+                ('terminada', models.DateTimeField(blank=True, null=True)),
+                ('latido', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tarea',
+                'verbose_name_plural': 'Tareas',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='actividad',
+            options={'verbose_name': 'Actividad', 'verbose_name_plural': 'Actividades'},
+        ),
+        migrations.AlterModelOptions(
+            name='area',
+            options={'verbose_name': 'Área', 'verbose_name_plural': 'Áreas'},
+        ),
+        migrations.AlterModelOptions(
+            name='asignaciondocente',
+            options={'verbose_name': 'Asignación Docente', 'verbose_name_plural': 'Asignaciones Docentes'},
+        ),
+        migrations.AlterModelOptions(
+            name='calificacion',
+            options={'verbose_name': 'Calificación', 'verbose_name_plural': 'Calificaciones'},
+        ),
+        migrations.AlterModelOptions(
+            name='niveleducativo',
+            options={'verbose_name': 'Nivel Educativo', 'verbose_name_plural': 'Niveles Educativos'},
+        ),
+        migrations.AddField(
+            model_name='acudiente',
+            name='estudiantes',
+            field=models.ManyToManyField(blank=True, related_name='acudientes', to='core.estudiante'),
+        ),
+        migrations.AddField(
+            model_name='acudiente',
+            name='usuario',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='acudiente', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='docente',
+            name='usuario',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='docente', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='estudiante',
+            name='grupo',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='estudiantes', to='core.grupo'),
+        ),
+        migrations.AddField(
+            model_name='estudiante',
+            name='usuario',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='estudiante', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='area',
+            index=models.Index(fields=['nombre', 'id'], name='area_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asignatura',
+            index=models.Index(fields=['nombre', 'id'], name='asignatura_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asignatura',
+            index=models.Index(fields=['grado', 'nombre', 'id'], name='asignatura_grado_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asignatura',
+            index=models.Index(fields=['area', 'nombre', 'id'], name='asignatura_area_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calificacion',
+            index=models.Index(fields=['estudiante', '-fecha_registro'], name='calificacion_estudiante_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grado',
+            index=models.Index(fields=['nombre', 'id'], name='grado_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logro',
+            index=models.Index(fields=['asignatura', 'id'], name='logro_asignatura_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tema',
+            index=models.Index(fields=['asignatura', 'nombre'], name='tema_asignatura_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eliminacion',
+            index=models.Index(fields=['estado'], name='eliminacion_estado_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='indicepersona',
+            unique_together={('tipo', 'objeto_id')},
+        ),
+        migrations.AddField(
+            model_name='palabrapersona',
+            name='persona',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='palabras', to='core.indicepersona'),
+        ),
+        migrations.AddField(
+            model_name='resumencalificacion',
+            name='asignatura',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes', to='core.asignatura'),
+        ),
+        migrations.AddField(
+            model_name='resumencalificacion',
+            name='estudiante',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes', to='core.estudiante'),
+        ),
+        migrations.AddField(
+            model_name='resumencalificacion',
+            name='grupo',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes', to='core.grupo'),
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='creada_por',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tareas', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='palabrapersona',
+            index=models.Index(fields=['palabra'], name='palabra_persona_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='resumencalificacion',
+            index=models.Index(fields=['grupo', 'asignatura'], name='resumen_grupo_asignatura_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='resumencalificacion',
+            unique_together={('estudiante', 'asignatura', 'grupo')},
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['estado', '-prioridad', 'disponible_desde', 'id'], name='tarea_cola_idx'),
+        ),
+    ]
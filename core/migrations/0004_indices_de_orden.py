@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_estructura_escolar'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tema',
+            name='tema_asignatura_nombre_idx',
+        ),
+        migrations.AddIndex(
+            model_name='grado',
+            index=models.Index(fields=['nivel', 'nombre', 'id'], name='grado_nivel_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tema',
+            index=models.Index(fields=['asignatura', 'nombre', 'id'], name='tema_asignatura_nombre_idx'),
+        ),
+    ]
@@ -120,6 +120,7 @@ class PerfilDeUsuario(Persona):
 
 class Docente(Persona):
     especialidad = models.CharField(max_length=100)
+    usuario = models.OneToOneField(Usuario, on_delete=models.SET_NULL, null=True, blank=True, related_name="docente")
 
     class Meta:
         verbose_name = "Docente"
@@ -129,6 +130,9 @@ class Docente(Persona):
         return f"{self.primer_nombre} {self.primer_apellido}"
 
 class Estudiante(Persona):
+    grupo = models.ForeignKey('Grupo', on_delete=models.SET_NULL, null=True, blank=True, related_name="estudiantes")
+    usuario = models.OneToOneField(Usuario, on_delete=models.SET_NULL, null=True, blank=True, related_name="estudiante")
+
     class Meta:
         verbose_name = "Estudiante"
         verbose_name_plural = "Estudiantes"
@@ -137,6 +141,9 @@ class Estudiante(Persona):
         return f"{self.primer_nombre} {self.primer_apellido}"
 
 class Acudiente(Persona):
+    usuario = models.OneToOneField(Usuario, on_delete=models.SET_NULL, null=True, blank=True, related_name="acudiente")
+    estudiantes = models.ManyToManyField(Estudiante, blank=True, related_name="acudientes")
+
     class Meta:
         verbose_name = "Acudiente"
         verbose_name_plural = "Acudientes"
@@ -151,6 +158,10 @@ class Acudiente(Persona):
 class NivelEducativo(models.Model):
     nombre = models.CharField(max_length=50, unique=True)
 
+    class Meta:
+        verbose_name = "Nivel Educativo"
+        verbose_name_plural = "Niveles Educativos"
+
     def __str__(self):
         return self.nombre
 
@@ -160,6 +171,11 @@ class Grado(models.Model):
 
     class Meta:
         unique_together = ('nivel', 'nombre')
+        # Índices para la paginación por cursor (orden, id) y el filtro por nivel
+        indexes = [
+            models.Index(fields=['nombre', 'id'], name='grado_nombre_idx'),
+            models.Index(fields=['nivel', 'nombre', 'id'], name='grado_nivel_nombre_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nivel.nombre} - {self.nombre}"
@@ -168,6 +184,13 @@ class Area(models.Model):
     nombre = models.CharField(max_length=100)
     obligatoria = models.BooleanField(default=True)
 
+    class Meta:
+        verbose_name = "Área"
+        verbose_name_plural = "Áreas"
+        indexes = [
+            models.Index(fields=['nombre', 'id'], name='area_nombre_idx'),
+        ]
+
     def __str__(self):
         return self.nombre
 
@@ -178,6 +201,12 @@ class Asignatura(models.Model):
 
     class Meta:
         unique_together = ('nombre', 'grado', 'area')
+        # Índices para la paginación por cursor y los filtros del panel
+        indexes = [
+            models.Index(fields=['nombre', 'id'], name='asignatura_nombre_idx'),
+            models.Index(fields=['grado', 'nombre', 'id'], name='asignatura_grado_nombre_idx'),
+            models.Index(fields=['area', 'nombre', 'id'], name='asignatura_area_nombre_idx'),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -186,6 +215,12 @@ class Tema(models.Model):
     asignatura = models.ForeignKey(Asignatura, on_delete=models.CASCADE, related_name="temas")
     nombre = models.CharField(max_length=100, unique=True)  # Para evitar duplicados
 
+    class Meta:
+        # El filtro por asignatura con la paginación por cursor (nombre, id)
+        indexes = [
+            models.Index(fields=['asignatura', 'nombre', 'id'], name='tema_asignatura_nombre_idx'),
+        ]
+
     def __str__(self):
         return f"{self.nombre} ({self.asignatura.nombre})"
 
@@ -194,6 +229,11 @@ class Logro(models.Model):
     asignatura = models.ForeignKey(Asignatura, on_delete=models.CASCADE, related_name="logros")
     descripcion = models.TextField(unique=True)  # Para evitar descripciones duplicadas
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['asignatura', 'id'], name='logro_asignatura_idx'),
+        ]
+
     def __str__(self):
         return f"Logro: {self.descripcion[:30]}..."
 
@@ -225,6 +265,8 @@ class AsignacionDocente(models.Model):
     asignatura = models.ForeignKey(Asignatura, on_delete=models.CASCADE)
 
     class Meta:
+        verbose_name = "Asignación Docente"
+        verbose_name_plural = "Asignaciones Docentes"
         unique_together = ('docente', 'grupo', 'asignatura')
 
 class Actividad(models.Model):
@@ -234,8 +276,206 @@ class Actividad(models.Model):
     es_calificable = models.BooleanField(default=True)
     fecha_publicacion = models.DateField(auto_now_add=True)
 
+    class Meta:
+        verbose_name = "Actividad"
+        verbose_name_plural = "Actividades"
+
 class Calificacion(models.Model):
     actividad = models.ForeignKey(Actividad, on_delete=models.CASCADE)
     estudiante = models.ForeignKey(Estudiante, on_delete=models.CASCADE)
     nota = models.DecimalField(max_digits=3, decimal_places=1)
     fecha_registro = models.DateField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Calificación"
+        verbose_name_plural = "Calificaciones"
+        # Una sola nota por estudiante en cada actividad (clave del upsert masivo)
+        unique_together = ('actividad', 'estudiante')
+        indexes = [
+            # Últimas notas de un estudiante (tablero del estudiante)
+            models.Index(fields=['estudiante', '-fecha_registro'], name='calificacion_estudiante_idx'),
+        ]
+
+# ────────────────────────────────
+# RESÚMENES DE CALIFICACIONES
+# ────────────────────────────────
+
+class ResumenCalificacion(models.Model):
+    """
+    Acumulado de notas por estudiante, asignatura y grupo. Se mantiene al día
+    desde core/resumenes.py cada vez que cambia una Calificacion, para que
+    informes y paneles lo lean sin agregar sobre todas las notas.
+    """
+    estudiante = models.ForeignKey(Estudiante, on_delete=models.CASCADE, related_name="resumenes")
+    asignatura = models.ForeignKey(Asignatura, on_delete=models.CASCADE, related_name="resumenes")
+    grupo = models.ForeignKey(Grupo, on_delete=models.CASCADE, related_name="resumenes")
+    cantidad = models.PositiveIntegerField(default=0)
+    suma = models.DecimalField(max_digits=10, decimal_places=1, default=0)
+    promedio = models.DecimalField(max_digits=4, decimal_places=2, null=True)
+    minima = models.DecimalField(max_digits=3, decimal_places=1, null=True)
+    maxima = models.DecimalField(max_digits=3, decimal_places=1, null=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Resumen de Calificaciones"
+        verbose_name_plural = "Resúmenes de Calificaciones"
+        unique_together = ('estudiante', 'asignatura', 'grupo')
+        indexes = [
+            models.Index(fields=['grupo', 'asignatura'], name='resumen_grupo_asignatura_idx'),
+        ]
+
+# ────────────────────────────────
+# ELIMINACIONES EN SEGUNDO PLANO
+# ────────────────────────────────
+
+class Eliminacion(models.Model):
+    """
+    Borrado en cascada de un registro de la estructura académica, ejecutado
+    por lotes fuera de la petición (ver core/eliminacion.py). `impacto`
+    guarda el conteo de la vista previa y `eliminados` el avance.
+    """
+    PENDIENTE = 'pendiente'
+    EN_CURSO = 'en_curso'
+    TERMINADA = 'terminada'
+    FALLIDA = 'fallida'
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_CURSO, 'En curso'),
+        (TERMINADA, 'Terminada'),
+        (FALLIDA, 'Fallida'),
+    ]
+
+    modelo = models.CharField(max_length=100)
+    objeto_id = models.PositiveIntegerField()
+    descripcion = models.CharField(max_length=255)
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    impacto = models.JSONField(default=dict)
+    total = models.PositiveIntegerField(default=0)
+    eliminados = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    creada = models.DateTimeField(auto_now_add=True)
+    actualizada = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Eliminación"
+        verbose_name_plural = "Eliminaciones"
+        indexes = [
+            models.Index(fields=['estado'], name='eliminacion_estado_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.descripcion} ({self.get_estado_display()})"
+
+    @property
+    def porcentaje(self):
+        return 100 if not self.total else min(100, self.eliminados * 100 // self.total)
+
+# ────────────────────────────────
+# COLA DE TAREAS
+# ────────────────────────────────
+
+class Tarea(models.Model):
+    """
+    Trabajo pesado (importaciones, boletines, borrados, reconstrucciones)
+    que ejecuta el comando trabajador_tareas fuera de las peticiones. Ver
+    core/tareas.py.
+    """
+    PENDIENTE = 'pendiente'
+    EN_CURSO = 'en_curso'
+    TERMINADA = 'terminada'
+    FALLIDA = 'fallida'
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_CURSO, 'En curso'),
+        (TERMINADA, 'Terminada'),
+        (FALLIDA, 'Fallida'),
+    ]
+
+    tipo = models.CharField(max_length=50)
+    descripcion = models.CharField(max_length=255)
+    parametros = models.JSONField(default=dict)
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    prioridad = models.SmallIntegerField(default=0)  # mayor = antes
+    intentos = models.PositiveSmallIntegerField(default=0)
+    max_intentos = models.PositiveSmallIntegerField(default=3)
+    disponible_desde = models.DateTimeField(default=timezone.now)
+    hechos = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    mensaje = models.CharField(max_length=255, blank=True)
+    resultado = models.JSONField(default=dict, blank=True)
+    archivo = models.CharField(max_length=255, blank=True)  # relativo a TAREAS_DIR
+    error = models.TextField(blank=True)
+    trabajador = models.CharField(max_length=100, blank=True)
+    creada_por = models.ForeignKey(Usuario, on_delete=models.SET_NULL, null=True, blank=True, related_name="tareas")
+    creada = models.DateTimeField(auto_now_add=True)
+    iniciada = models.DateTimeField(null=True, blank=True)
+    terminada = models.DateTimeField(null=True, blank=True)
+    latido = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Tarea"
+        verbose_name_plural = "Tareas"
+        indexes = [
+            # Orden en que los trabajadores reclaman tareas
+            models.Index(fields=['estado', '-prioridad', 'disponible_desde', 'id'], name='tarea_cola_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.descripcion} ({self.get_estado_display()})"
+
+    @property
+    def porcentaje(self):
+        if self.estado == self.TERMINADA:
+            return 100
+        return min(100, self.hechos * 100 // self.total) if self.total else 0
+
+    @property
+    def activa(self):
+        return self.estado in (self.PENDIENTE, self.EN_CURSO)
+
+# ────────────────────────────────
+# ÍNDICE DE BÚSQUEDA DE PERSONAS
+# ────────────────────────────────
+
+class IndicePersona(models.Model):
+    """
+    Copia desnormalizada de nombre y documento de cada persona (perfiles,
+    docentes, estudiantes y acudientes) en una sola tabla, para buscar
+    sin consultar las cuatro. Se mantiene desde core/busqueda.py.
+    """
+    PERFIL = 'perfil'
+    DOCENTE = 'docente'
+    ESTUDIANTE = 'estudiante'
+    ACUDIENTE = 'acudiente'
+    TIPOS = [
+        (PERFIL, 'Usuario'),
+        (DOCENTE, 'Docente'),
+        (ESTUDIANTE, 'Estudiante'),
+        (ACUDIENTE, 'Acudiente'),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPOS)
+    objeto_id = models.PositiveBigIntegerField()
+    nombre = models.CharField(max_length=210)
+    numero_documento = models.CharField(max_length=20, db_index=True)
+
+    class Meta:
+        verbose_name = "Índice de Persona"
+        verbose_name_plural = "Índice de Personas"
+        unique_together = ('tipo', 'objeto_id')
+
+    def __str__(self):
+        return f"{self.nombre} ({self.get_tipo_display()})"
+
+class PalabraPersona(models.Model):
+    """Cada palabra normalizada (sin tildes, en minúsculas) del nombre de una persona."""
+    persona = models.ForeignKey(IndicePersona, on_delete=models.CASCADE, related_name="palabras")
+    palabra = models.CharField(max_length=50)
+
+    class Meta:
+        verbose_name = "Palabra de Persona"
+        verbose_name_plural = "Palabras de Personas"
+        indexes = [
+            # varchar_pattern_ops: LIKE 'prefijo%' usa el índice en PostgreSQL con cualquier collation
+            models.Index(fields=['palabra'], name='palabra_persona_idx', opclasses=['varchar_pattern_ops']),
+        ]
@@ -0,0 +1,116 @@
+from asgiref.sync import sync_to_async
+from django import forms
+from django.core.cache import cache
+from django.db import transaction
+from django.forms.models import ModelChoiceIterator, ModelChoiceIteratorValue
+
+from .models import (
+    Rol, TipoDocumento, Departamento, Ciudad,
+    NivelEducativo, Grado, Area, Asignatura, Grupo,
+)
+from .replicas import en_primaria
+
+# ────────────────────────────────
+# OPCIONES EN CACHÉ PARA LOS <select>
+# ────────────────────────────────
+#
+# Las tablas paramétricas y la estructura académica cambian poco y se
+# pintan en casi todos los formularios. Cada lista de opciones (pk, texto)
+# se calcula con una sola consulta values_list (sin N+1 en __str__) y se
+# guarda en la caché configurada, que comparten todos los procesos. Las
+# señales de core/signals.py la invalidan al confirmarse cada cambio.
+
+CACHE_PREFIJO = 'opciones'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+FUENTES = {
+    Rol: lambda: Rol.objects.order_by('nombre').values_list('pk', 'nombre'),
+    TipoDocumento: lambda: TipoDocumento.objects.order_by('nombre').values_list('pk', 'nombre'),
+    Departamento: lambda: Departamento.objects.order_by('nombre').values_list('pk', 'nombre'),
+    Ciudad: lambda: (
+        (pk, f"{nombre} ({departamento})")
+        for pk, nombre, departamento in Ciudad.objects.order_by('nombre').values_list('pk', 'nombre', 'departamento__nombre')
+    ),
+    NivelEducativo: lambda: NivelEducativo.objects.order_by('nombre').values_list('pk', 'nombre'),
+    Grado: lambda: (
+        (pk, f"{nivel} - {nombre}")
+        for pk, nivel, nombre in Grado.objects.order_by('nivel__nombre', 'nombre').values_list('pk', 'nivel__nombre', 'nombre')
+    ),
+    Area: lambda: Area.objects.order_by('nombre').values_list('pk', 'nombre'),
+    Asignatura: lambda: (
+        (pk, f"{nombre} ({grado})")
+        for pk, nombre, grado in Asignatura.objects.order_by('nombre', 'grado__nombre').values_list('pk', 'nombre', 'grado__nombre')
+    ),
+    Grupo: lambda: (
+        (pk, f"{nivel} - {grado} - {nombre}")
+        for pk, nivel, grado, nombre in Grupo.objects.order_by('grado__nivel__nombre', 'grado__nombre', 'nombre')
+        .values_list('pk', 'grado__nivel__nombre', 'grado__nombre', 'nombre')
+    ),
+}
+
+# Modelos cuyas etiquetas muestran datos de otro modelo
+DEPENDIENTES = {
+    Departamento: [Ciudad],
+    NivelEducativo: [Grado, Grupo],
+    Grado: [Asignatura, Grupo],
+}
+
+
+def _clave(modelo):
+    return f"{CACHE_PREFIJO}:{modelo._meta.label_lower}"
+
+
+def opciones(modelo):
+    """Lista de pares (pk, texto) del modelo, desde la caché si es posible."""
+    clave = _clave(modelo)
+    lista = cache.get(clave)
+    if lista is None:
+        # Lo que se guarda en la caché se lee de la primaria (ver core/replicas.py)
+        with en_primaria():
+            lista = [(pk, str(texto)) for pk, texto in FUENTES[modelo]()]
+        cache.set(clave, lista, CACHE_TIMEOUT)
+    return lista
+
+
+async def aopciones(modelo):
+    """Versión async de opciones(): la caché se lee sin bloquear el hilo."""
+    lista = await cache.aget(_clave(modelo))
+    if lista is None:
+        lista = await sync_to_async(opciones)(modelo)
+    return lista
+
+
+def invalidar_opciones(modelo):
+    claves = [_clave(m) for m in [modelo, *DEPENDIENTES.get(modelo, [])]]
+    cache.delete_many(claves)
+
+
+def invalidar_opciones_al_confirmar(modelo):
+    """
+    invalidar_opciones() cuando la transacción en curso se confirme (o ya,
+    si no hay ninguna). Antes del commit otra petición volvería a llenar la
+    caché con los datos viejos, y tras un rollback no hay nada que invalidar.
+    """
+    transaction.on_commit(lambda: invalidar_opciones(modelo))
+
+
+class OpcionesEnCacheIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for pk, texto in opciones(self.queryset.model):
+            yield (ModelChoiceIteratorValue(pk, None), texto)
+
+    def __len__(self):
+        return len(opciones(self.queryset.model)) + (1 if self.field.empty_label is not None else 0)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(opciones(self.queryset.model))
+
+
+class CampoOpcionesEnCache(forms.ModelChoiceField):
+    """
+    ModelChoiceField que pinta sus opciones desde la caché. La validación
+    sigue usando el queryset, con una sola consulta al enviar el formulario.
+    """
+    iterator = OpcionesEnCacheIterator
@@ -0,0 +1,154 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# ────────────────────────────────
+# PAGINACIÓN POR CURSOR (KEYSET)
+# ────────────────────────────────
+#
+# En lugar de OFFSET, cada página recuerda el valor de ordenamiento y la
+# clave primaria de su última fila y la siguiente consulta continúa con
+# "WHERE (campo, id) > (valor, último_id)". Con un índice sobre las columnas
+# de orden la página N cuesta lo mismo que la primera, y los registros que se
+# inserten mientras alguien navega no desplazan ni repiten filas.
+
+TAMANO_PAGINA = 50
+TAMANO_MAXIMO = 200
+
+
+class CursorInvalido(ValueError):
+    pass
+
+
+def codificar_cursor(orden, valor, pk, direccion):
+    datos = json.dumps({'o': orden, 'v': valor, 'k': pk, 'd': direccion}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(datos.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return datos['o'], datos['v'], datos['k'], datos['d']
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise CursorInvalido(cursor)
+
+
+def _valor_de(objeto, campo):
+    # Recorre relaciones como 'grado__nombre' sobre el objeto ya cargado
+    for parte in campo.split('__'):
+        objeto = getattr(objeto, parte)
+    return objeto
+
+
+class Pagina:
+    def __init__(self, objetos, cursor_siguiente, cursor_anterior):
+        self.objetos = objetos
+        self.cursor_siguiente = cursor_siguiente
+        self.cursor_anterior = cursor_anterior
+
+    @property
+    def tiene_siguiente(self):
+        return self.cursor_siguiente is not None
+
+    @property
+    def tiene_anterior(self):
+        return self.cursor_anterior is not None
+
+    def __iter__(self):
+        return iter(self.objetos)
+
+    def __len__(self):
+        return len(self.objetos)
+
+
+class PaginadorKeyset:
+    """
+    Pagina un queryset ordenado por un campo y, para desempatar, por la
+    clave primaria. `orden` es el nombre del campo, con '-' delante si es
+    descendente (igual que en order_by). El campo es del propio modelo: la
+    condición del cursor sobre una columna de otra tabla no puede usar el
+    índice (campo, id).
+    """
+
+    def __init__(self, queryset, orden='pk', tamano=TAMANO_PAGINA):
+        self.queryset = queryset
+        self.orden = orden
+        self.descendente = orden.startswith('-')
+        self.campo = orden.lstrip('-')
+        if '__' in self.campo:
+            # (campo, id) de otra tabla: ningún índice sirve al WHERE del cursor
+            raise ValueError(f"Solo se pagina por campos propios del modelo, no por {self.campo}")
+        self.tamano = max(1, min(int(tamano), TAMANO_MAXIMO))
+
+    def _condicion(self, valor, pk, hacia_adelante):
+        mayor = hacia_adelante != self.descendente
+        comparacion = 'gt' if mayor else 'lt'
+        if self.campo == 'pk':
+            return Q(**{f'pk__{comparacion}': pk})
+        return (
+            Q(**{f'{self.campo}__{comparacion}': valor})
+            | Q(**{self.campo: valor, f'pk__{comparacion}': pk})
+        )
+
+    def _orden_sql(self, hacia_adelante):
+        invertir = not hacia_adelante
+        descendente = self.descendente != invertir
+        prefijo = '-' if descendente else ''
+        if self.campo == 'pk':
+            return [f'{prefijo}pk']
+        return [f'{prefijo}{self.campo}', f'{prefijo}pk']
+
+    def _cursor(self, objeto, direccion):
+        valor = None if self.campo == 'pk' else _valor_de(objeto, self.campo)
+        return codificar_cursor(self.orden, valor, objeto.pk, direccion)
+
+    def _consulta(self, cursor):
+        """Queryset de la página pedida, dirección y cursor que sigue siendo válido."""
+        hacia_adelante = True
+        queryset = self.queryset
+        if cursor:
+            try:
+                orden, valor, pk, direccion = decodificar_cursor(cursor)
+            except CursorInvalido:
+                orden = None
+            # Un cursor de otro ordenamiento, o alterado (cualquier JSON puede
+            # venir en la URL), no sirve: se vuelve al inicio
+            condicion = None
+            if orden == self.orden and direccion in ('sig', 'ant') and not isinstance(valor, (list, dict)):
+                try:
+                    condicion = self._condicion(valor, pk, direccion == 'sig')
+                    queryset = queryset.filter(condicion)
+                except (ValueError, TypeError, ValidationError):
+                    condicion = None
+            if condicion is None:
+                cursor = None
+            else:
+                hacia_adelante = direccion == 'sig'
+        queryset = queryset.order_by(*self._orden_sql(hacia_adelante))[:self.tamano + 1]
+        return queryset, hacia_adelante, cursor
+
+    def _armar(self, filas, hacia_adelante, cursor):
+        hay_mas = len(filas) > self.tamano
+        filas = filas[:self.tamano]
+        if not hacia_adelante:
+            filas.reverse()
+
+        cursor_siguiente = cursor_anterior = None
+        if filas:
+            if hay_mas or not hacia_adelante:
+                cursor_siguiente = self._cursor(filas[-1], 'sig')
+            if cursor and (hay_mas or hacia_adelante):
+                cursor_anterior = self._cursor(filas[0], 'ant')
+        return Pagina(filas, cursor_siguiente, cursor_anterior)
+
+    def pagina(self, cursor=None):
+        queryset, hacia_adelante, cursor = self._consulta(cursor)
+        return self._armar(list(queryset), hacia_adelante, cursor)
+
+    async def apagina(self, cursor=None):
+        queryset, hacia_adelante, cursor = self._consulta(cursor)
+        return self._armar([fila async for fila in queryset], hacia_adelante, cursor)
@@ -0,0 +1,201 @@
+from django.db import transaction
+
+from .calificaciones import bloquear_asignacion, leer_nota
+from .eliminacion import borrar_por_pk
+from .models import Actividad, Calificacion, Estudiante
+from .resumenes import actualizar_resumenes
+
+# ────────────────────────────────
+# PLANILLA DEL DOCENTE
+# ────────────────────────────────
+#
+# La planilla de una AsignacionDocente es la matriz estudiantes × actividades.
+# Se arma con tres consultas (estudiantes, actividades y una sola sobre
+# Calificacion con las ternas estudiante, actividad, nota) y el pivote es
+# una pasada lineal sobre las ternas con índices de fila y columna
+# precalculados, sin buscar cada celda.
+#
+# Los cambios llegan como diferencias: solo las celdas editadas, cada una
+# con el valor que el docente veía ('anterior'). Si otra sesión cambió la
+# celda entretanto se informa el conflicto en vez de pisarla.
+
+
+def _texto(nota):
+    return None if nota is None else str(nota)
+
+
+class Planilla:
+    def __init__(self, asignacion, estudiantes, actividades, ternas):
+        """
+        `estudiantes` son pares (pk, nombre), `actividades` pares (pk, título)
+        y `ternas` tuplas (estudiante_id, actividad_id, nota).
+        """
+        self.asignacion = asignacion
+        self.estudiantes = estudiantes
+        self.actividades = actividades
+        fila_de = {pk: i for i, (pk, _) in enumerate(estudiantes)}
+        columna_de = {pk: j for j, (pk, _) in enumerate(actividades)}
+        self.notas = [[None] * len(actividades) for _ in estudiantes]
+        for estudiante_id, actividad_id, nota in ternas:
+            i = fila_de.get(estudiante_id)
+            j = columna_de.get(actividad_id)
+            if i is not None and j is not None:
+                self.notas[i][j] = nota
+
+    def filas(self):
+        """[(pk, nombre, [(actividad_id, nota o None), ...]), ...] para la plantilla."""
+        columnas = [pk for pk, _ in self.actividades]
+        return [
+            (pk, nombre, list(zip(columnas, self.notas[i])))
+            for i, (pk, nombre) in enumerate(self.estudiantes)
+        ]
+
+    def como_dict(self):
+        return {
+            'estudiantes': [{'id': pk, 'nombre': nombre} for pk, nombre in self.estudiantes],
+            'actividades': [{'id': pk, 'titulo': titulo} for pk, titulo in self.actividades],
+            'notas': [[_texto(nota) for nota in fila] for fila in self.notas],
+        }
+
+
+def _consultas(asignacion):
+    estudiantes = (
+        Estudiante.objects.filter(grupo_id=asignacion.grupo_id)
+        .order_by('primer_apellido', 'segundo_apellido', 'primer_nombre', 'pk')
+        .values_list('pk', 'primer_apellido', 'segundo_apellido', 'primer_nombre')
+    )
+    actividades = (
+        Actividad.objects.filter(asignacion=asignacion, es_calificable=True)
+        .order_by('fecha_publicacion', 'pk').values_list('pk', 'titulo')
+    )
+    ternas = (
+        Calificacion.objects.filter(actividad__asignacion=asignacion)
+        .values_list('estudiante_id', 'actividad_id', 'nota')
+    )
+    return estudiantes, actividades, ternas
+
+
+def _nombre(primer_apellido, segundo_apellido, primer_nombre):
+    return ' '.join(parte for parte in (primer_apellido, segundo_apellido) if parte) + f", {primer_nombre}"
+
+
+def cargar_planilla(asignacion):
+    estudiantes, actividades, ternas = _consultas(asignacion)
+    return Planilla(
+        asignacion,
+        [(pk, _nombre(*nombre)) for pk, *nombre in estudiantes],
+        list(actividades),
+        list(ternas),
+    )
+
+
+async def acargar_planilla(asignacion):
+    estudiantes, actividades, ternas = _consultas(asignacion)
+    return Planilla(
+        asignacion,
+        [(pk, _nombre(*nombre)) async for pk, *nombre in estudiantes],
+        [fila async for fila in actividades],
+        [terna async for terna in ternas],
+    )
+
+
+class ResultadoCambios:
+    def __init__(self, guardadas=0, borradas=0, errores=None, conflictos=None):
+        self.guardadas = guardadas
+        self.borradas = borradas
+        self.errores = errores or []
+        self.conflictos = conflictos or []
+
+    @property
+    def ok(self):
+        return not self.errores and not self.conflictos
+
+    def como_dict(self):
+        return {
+            'guardadas': self.guardadas, 'borradas': self.borradas,
+            'errores': self.errores, 'conflictos': self.conflictos,
+        }
+
+
+def _leer_celda(valor):
+    if valor is None or str(valor).strip() == '':
+        return None
+    return leer_nota(valor)
+
+
+def aplicar_cambios(asignacion, cambios):
+    """
+    Aplica una lista de celdas cambiadas {'estudiante', 'actividad', 'nota',
+    'anterior'} (nota vacía o null borra la calificación). Todo o nada: con
+    errores o conflictos no se guarda ninguna celda.
+    """
+    errores = []
+    validas = {}
+    del_grupo = set(Estudiante.objects.filter(grupo_id=asignacion.grupo_id).values_list('pk', flat=True))
+    calificables = set(
+        Actividad.objects.filter(asignacion=asignacion, es_calificable=True).values_list('pk', flat=True)
+    )
+    for posicion, cambio in enumerate(cambios):
+        if not isinstance(cambio, dict):
+            errores.append({'fila': posicion, 'error': "Cambio inválido."})
+            continue
+        try:
+            celda = (int(cambio.get('estudiante')), int(cambio.get('actividad')))
+        except (TypeError, ValueError):
+            errores.append({'fila': posicion, 'error': "Estudiante o actividad inválidos."})
+            continue
+        if celda[0] not in del_grupo:
+            errores.append({'fila': posicion, 'error': "El estudiante no pertenece al grupo."})
+            continue
+        if celda[1] not in calificables:
+            errores.append({'fila': posicion, 'error': "La actividad no es calificable en esta asignación."})
+            continue
+        if celda in validas:
+            errores.append({'fila': posicion, 'error': "Celda repetida en los cambios."})
+            continue
+        try:
+            validas[celda] = (_leer_celda(cambio.get('nota')), _leer_celda(cambio.get('anterior')), posicion)
+        except ValueError as exc:
+            errores.append({'fila': posicion, 'error': str(exc)})
+    if errores or not validas:
+        return ResultadoCambios(errores=errores)
+
+    with transaction.atomic():
+        # Con la asignación bloqueada se lee el valor actual de las celdas
+        # tocadas, también las vacías: otra sesión que guarde en esta
+        # asignación espera y luego ve lo que esta escribió
+        bloquear_asignacion(asignacion.pk)
+        actuales = {
+            (estudiante_id, actividad_id): (pk, nota)
+            for pk, estudiante_id, actividad_id, nota in Calificacion.objects
+            .filter(actividad_id__in={a for _, a in validas}, estudiante_id__in={e for e, _ in validas})
+            .values_list('pk', 'estudiante_id', 'actividad_id', 'nota')
+        }
+        conflictos = []
+        guardar, borrar = [], []
+        for (estudiante_id, actividad_id), (nota, anterior, posicion) in validas.items():
+            pk, actual = actuales.get((estudiante_id, actividad_id), (None, None))
+            if actual != anterior:
+                conflictos.append({
+                    'fila': posicion, 'estudiante': estudiante_id, 'actividad': actividad_id, 'actual': _texto(actual),
+                })
+            elif nota is None:
+                if pk is not None:
+                    borrar.append(pk)
+            elif nota != actual:
+                guardar.append(Calificacion(actividad_id=actividad_id, estudiante_id=estudiante_id, nota=nota))
+        if conflictos:
+            return ResultadoCambios(conflictos=conflictos)
+
+        if guardar:
+            Calificacion.objects.bulk_create(
+                guardar, update_conflicts=True,
+                unique_fields=['actividad', 'estudiante'], update_fields=['nota'],
+            )
+        if borrar:
+            # Sin señales: los resúmenes se recalculan abajo una sola vez
+            borrar_por_pk(Calificacion, borrar)
+        actualizar_resumenes(
+            (estudiante_id, asignacion.asignatura_id, asignacion.grupo_id) for estudiante_id, _ in validas
+        )
+    return ResultadoCambios(guardadas=len(guardar), borradas=len(borrar))
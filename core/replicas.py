@@ -0,0 +1,134 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# ────────────────────────────────
+# LECTURAS EN RÉPLICAS
+# ────────────────────────────────
+#
+# Con réplicas configuradas (DATABASE_REPLICAS en settings) las peticiones
+# GET/HEAD/OPTIONS leen de una réplica elegida al azar al comenzar la
+# petición; todo lo demás va a la primaria:
+#
+# - las escrituras, y las lecturas de una petición que no es de solo lectura;
+# - las lecturas dentro de una transacción abierta en la primaria
+#   (select_for_update, lee-y-escribe de la cola de tareas, etc.);
+# - las sesiones, que se escriben en cada login y no pueden llegar tarde;
+# - lo que corre fuera de una petición (comandos, trabajador de tareas),
+#   salvo que se pida con en_replica();
+# - las peticiones de un usuario durante REPLICA_FIJAR_SEGUNDOS después de
+#   que escribió algo, para que vea lo que acaba de guardar aunque la
+#   réplica vaya atrasada (ver ReplicasMiddleware en core/middleware.py);
+# - lo que se calcula para guardarlo en la caché (opciones, tableros,
+#   estadísticas), con en_primaria(): una lectura atrasada quedaría en la
+#   caché hasta la siguiente invalidación.
+#
+# Cada vista puede cambiarlo con @solo_primaria o @lectura_en_replica. Los
+# cuerpos en flujo (exportaciones, ZIP de boletines) se envuelven con
+# en_flujo() para que sus lecturas sigan en la réplica de la petición.
+# Sin réplicas configuradas todo esto no hace nada.
+
+REPLICAS = list(getattr(settings, 'DATABASE_REPLICAS', []))
+FIJAR_SEGUNDOS = getattr(settings, 'REPLICA_FIJAR_SEGUNDOS', 5)
+SESION_FIJADA = '_primaria_hasta'
+
+# Modelos (app_label) que se leen siempre de la primaria
+SIEMPRE_PRIMARIA = {'sessions'}
+
+PRIMARIA = 'primaria'
+REPLICA = 'replica'
+
+# Alias de la réplica de la que leer en el contexto actual, o None (primaria)
+_lectura = ContextVar('lectura_replica', default=None)
+
+
+def elegir_replica():
+    return random.choice(REPLICAS) if REPLICAS else None
+
+
+def usar(alias):
+    """Fija la réplica (o None, la primaria) de la que se lee en el contexto actual."""
+    _lectura.set(alias)
+
+
+@contextmanager
+def en_primaria():
+    """Las lecturas del bloque van a la primaria. Sirve también como decorador."""
+    token = _lectura.set(None)
+    try:
+        yield
+    finally:
+        _lectura.reset(token)
+
+
+@contextmanager
+def en_replica(alias=None):
+    """
+    Las lecturas del bloque van a una réplica (para informes y tareas que
+    toleran datos con unos segundos de atraso).
+    """
+    token = _lectura.set(alias or elegir_replica())
+    try:
+        yield
+    finally:
+        _lectura.reset(token)
+
+
+def en_flujo(iterable):
+    """
+    Envuelve el cuerpo de una respuesta en flujo para que sus lecturas vayan
+    a la base de datos elegida para la petición: el cuerpo se consume
+    después de que ReplicasMiddleware devolvió el contexto a la primaria.
+    """
+    # El alias se toma ya, al armar la respuesta, no al empezar a consumirla
+    return _en_flujo(iter(iterable), _lectura.get())
+
+
+def _en_flujo(iterador, alias):
+    while True:
+        token = _lectura.set(alias)
+        try:
+            parte = next(iterador)
+        except StopIteration:
+            return
+        finally:
+            _lectura.reset(token)
+        yield parte
+
+
+def _marcar(modo):
+    def decorador(vista):
+        vista.base_de_datos = modo
+        return vista
+    return decorador
+
+
+# Lee siempre de la primaria, aunque sea GET (p. ej. el progreso de una tarea)
+solo_primaria = _marcar(PRIMARIA)
+# Lee de una réplica aunque el usuario acabe de escribir (búsquedas, informes)
+lectura_en_replica = _marcar(REPLICA)
+
+
+class RouterReplicas:
+    """Router de DATABASE_ROUTERS: escribe en la primaria y lee donde diga el contexto."""
+
+    def db_for_read(self, model, **hints):
+        alias = _lectura.get()
+        if alias is None or model._meta.app_label in SIEMPRE_PRIMARIA:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaria y réplicas tienen los mismos datos
+        grupo = {DEFAULT_DB_ALIAS, *REPLICAS}
+        if obj1._state.db in grupo and obj2._state.db in grupo:
+            return True
+        return None
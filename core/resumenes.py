@@ -0,0 +1,179 @@
+from collections import defaultdict
+from contextvars import ContextVar
+
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Max, Min, Sum
+from django.utils import timezone
+
+from .analitica import invalidar_analitica
+from .models import Actividad, AsignacionDocente, Calificacion, ResumenCalificacion
+from .tablero import invalidar_tableros
+
+# ────────────────────────────────
+# MANTENIMIENTO DE RESÚMENES DE CALIFICACIONES
+# ────────────────────────────────
+#
+# Una "celda" del resumen es la terna (estudiante, asignatura, grupo). Cuando
+# cambian notas solo se recalculan las celdas afectadas, al confirmar la
+# transacción, con una consulta agregada que usa los índices de
+# Calificacion y un upsert por lotes.
+# También se descartan de la caché las estadísticas de los grupos tocados
+# y los tableros de los estudiantes afectados.
+
+TAMANO_LOTE = 500
+
+# (estudiante, actividad) de las notas que el ORM está por borrar
+_por_borrar = ContextVar('calificaciones_por_borrar', default=None)
+
+
+def celda_de_calificacion(calificacion):
+    asignatura_id, grupo_id = (
+        Actividad.objects.filter(pk=calificacion.actividad_id)
+        .values_list('asignacion__asignatura_id', 'asignacion__grupo_id')
+        .get()
+    )
+    return calificacion.estudiante_id, asignatura_id, grupo_id
+
+
+# Borrados con el ORM (delete() de una nota, o en cascada desde una
+# actividad o un estudiante). El Collector de Django envía pre_delete por
+# todas las filas antes de borrar ninguna, y borra todas las notas antes
+# que sus actividades: se anotan las claves en pre_delete y, con el primer
+# post_delete, se resuelven todas las celdas en una consulta y se
+# recalculan de una vez, en lugar de una consulta y un recálculo por nota.
+
+def anotar_borrado(calificacion):
+    pendientes = _por_borrar.get()
+    if pendientes is None:
+        pendientes = set()
+        _por_borrar.set(pendientes)
+    pendientes.add((calificacion.estudiante_id, calificacion.actividad_id))
+
+
+def actualizar_borradas():
+    pendientes = _por_borrar.get()
+    if not pendientes:
+        return
+    _por_borrar.set(None)
+    destino = {
+        pk: (asignatura_id, grupo_id)
+        for pk, asignatura_id, grupo_id in Actividad.objects.filter(pk__in={a for _, a in pendientes})
+        .values_list('pk', 'asignacion__asignatura_id', 'asignacion__grupo_id')
+    }
+    actualizar_resumenes({
+        (estudiante_id, *destino[actividad_id])
+        for estudiante_id, actividad_id in pendientes if actividad_id in destino
+    })
+
+
+def actualizar_resumenes(celdas):
+    """
+    Recalcula las celdas indicadas (iterable de (estudiante, asignatura,
+    grupo)) cuando se confirme la transacción en curso, o ya mismo si no
+    hay ninguna abierta.
+    """
+    celdas = list(celdas)
+    if celdas:
+        transaction.on_commit(lambda: recalcular_resumenes(celdas))
+
+
+# Dos transacciones que escriben notas de la misma celda a la vez no ven
+# la nota de la otra: si cada una agregara dentro de su transacción, la que
+# confirma de última dejaría un resumen sin la nota de la otra. Por eso el
+# recálculo corre después de confirmar, y cada (asignatura, grupo) se
+# agrega con sus asignaciones bloqueadas: el segundo recálculo espera al
+# primero y, ya con el bloqueo, lee las notas de ambas.
+
+def _bloquear(asignatura_id, grupo_id):
+    # FOR NO KEY UPDATE no choca con las claves foráneas que apuntan a la
+    # asignación (actividades que se crean mientras tanto)
+    list(
+        AsignacionDocente.objects
+        .select_for_update(no_key=connection.features.has_select_for_no_key_update)
+        .filter(asignatura_id=asignatura_id, grupo_id=grupo_id)
+        .order_by('pk').values_list('pk', flat=True)
+    )
+
+
+def recalcular_resumenes(celdas):
+    """Recalcula ya las celdas indicadas, cada (asignatura, grupo) en su transacción."""
+    por_asignatura_grupo = defaultdict(set)
+    for estudiante_id, asignatura_id, grupo_id in celdas:
+        por_asignatura_grupo[(asignatura_id, grupo_id)].add(estudiante_id)
+
+    for (asignatura_id, grupo_id), estudiantes in por_asignatura_grupo.items():
+        with transaction.atomic():
+            _bloquear(asignatura_id, grupo_id)
+            filas = (
+                Calificacion.objects
+                .filter(
+                    estudiante_id__in=estudiantes,
+                    actividad__asignacion__asignatura_id=asignatura_id,
+                    actividad__asignacion__grupo_id=grupo_id,
+                )
+                .values('estudiante_id')
+                .annotate(
+                    cantidad=Count('pk'), suma=Sum('nota'), promedio=Avg('nota'),
+                    minima=Min('nota'), maxima=Max('nota'),
+                )
+            )
+            ahora = timezone.now()
+            resumenes = [
+                ResumenCalificacion(
+                    estudiante_id=fila['estudiante_id'], asignatura_id=asignatura_id, grupo_id=grupo_id,
+                    cantidad=fila['cantidad'], suma=fila['suma'], promedio=round(fila['promedio'], 2),
+                    minima=fila['minima'], maxima=fila['maxima'], actualizado=ahora,
+                )
+                for fila in filas
+            ]
+            ResumenCalificacion.objects.bulk_create(
+                resumenes,
+                batch_size=TAMANO_LOTE,
+                update_conflicts=True,
+                unique_fields=['estudiante', 'asignatura', 'grupo'],
+                update_fields=['cantidad', 'suma', 'promedio', 'minima', 'maxima', 'actualizado'],
+            )
+            # Celdas que se quedaron sin notas
+            con_notas = {r.estudiante_id for r in resumenes}
+            vacias = estudiantes - con_notas
+            if vacias:
+                ResumenCalificacion.objects.filter(
+                    estudiante_id__in=vacias, asignatura_id=asignatura_id, grupo_id=grupo_id,
+                ).delete()
+
+    # Tras el commit: antes, otra petición podría volver a cachear las notas viejas
+    grupos = {grupo_id for _, grupo_id in por_asignatura_grupo}
+    if grupos:
+        transaction.on_commit(lambda: invalidar_analitica(grupos))
+        estudiantes = set().union(*por_asignatura_grupo.values())
+        transaction.on_commit(lambda: invalidar_tableros(estudiantes))
+
+
+def reconstruir_resumenes():
+    """
+    Recalcula todos los resúmenes desde cero con un único INSERT ... SELECT
+    agregado en la base de datos. Devuelve el número de celdas creadas.
+    """
+    resumen = ResumenCalificacion._meta.db_table
+    calificacion = Calificacion._meta.db_table
+    actividad = Actividad._meta.db_table
+    asignacion = AsignacionDocente._meta.db_table
+    qn = connection.ops.quote_name
+    sql = f"""
+        INSERT INTO {qn(resumen)}
+            (estudiante_id, asignatura_id, grupo_id, cantidad, suma, promedio, minima, maxima, actualizado)
+        SELECT c.estudiante_id, a.asignatura_id, a.grupo_id,
+               COUNT(*), SUM(c.nota), ROUND(AVG(c.nota), 2), MIN(c.nota), MAX(c.nota), %s
+        FROM {qn(calificacion)} c
+        INNER JOIN {qn(actividad)} ac ON ac.id = c.actividad_id
+        INNER JOIN {qn(asignacion)} a ON a.id = ac.asignacion_id
+        GROUP BY c.estudiante_id, a.asignatura_id, a.grupo_id
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {qn(resumen)}")
+            cursor.execute(sql, [connection.ops.adapt_datetimefield_value(timezone.now())])
+            creados = cursor.rowcount
+        transaction.on_commit(invalidar_analitica)
+        transaction.on_commit(invalidar_tableros)
+    return creados
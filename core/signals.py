@@ -0,0 +1,111 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .busqueda import MODELOS, desindexar, indexar
+from .models import Acudiente, Calificacion, Estudiante, Rol
+from .opciones import FUENTES, invalidar_opciones_al_confirmar
+from .resumenes import actualizar_borradas, actualizar_resumenes, anotar_borrado, celda_de_calificacion
+from .tablero import invalidar_acudientes, invalidar_tableros
+from .versiones import MODELOS as MODELOS_VERSIONADOS, incrementar_al_confirmar
+
+# ────────────────────────────────
+# INVALIDACIÓN DE CACHÉS
+# ────────────────────────────────
+
+# Conectada modelo por modelo: un receptor sin sender en post_delete
+# impide el borrado rápido (sin cargar filas) de todos los modelos
+def invalidar_opciones_en_cache(sender, **kwargs):
+    invalidar_opciones_al_confirmar(sender)
+
+
+for modelo in FUENTES:
+    post_save.connect(invalidar_opciones_en_cache, sender=modelo)
+    post_delete.connect(invalidar_opciones_en_cache, sender=modelo)
+
+
+# El tablero muestra el nombre y el grupo del estudiante
+@receiver(post_save, sender=Estudiante)
+def invalidar_tablero_de_estudiante(sender, instance, **kwargs):
+    invalidar_tableros([instance.pk])
+
+
+# Al borrar un estudiante la cascada quita sus filas de la tabla intermedia
+# sin enviar m2m_changed: sus acudientes se leen antes del borrado
+@receiver(pre_delete, sender=Estudiante)
+def anotar_acudientes_de_estudiante(sender, instance, **kwargs):
+    instance._acudientes_previos = list(instance.acudientes.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Estudiante)
+def invalidar_estudiante_borrado(sender, instance, **kwargs):
+    acudientes = getattr(instance, '_acudientes_previos', [])
+
+    def invalidar():
+        invalidar_acudientes(acudientes)
+        invalidar_tableros([instance.pk])
+    transaction.on_commit(invalidar)
+
+
+# La lista de estudiantes de cada acudiente, desde cualquiera de los dos lados
+@receiver(m2m_changed, sender=Acudiente.estudiantes.through)
+def invalidar_estudiantes_de_acudiente(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        invalidar_acudientes([instance.pk])
+    elif action == 'pre_clear':
+        # En clear() desde el estudiante pk_set llega vacío: se toman antes
+        invalidar_acudientes(instance.acudientes.values_list('pk', flat=True))
+    else:
+        invalidar_acudientes(pk_set or [])
+
+
+# Versión de las tablas del catálogo (ETag y fragmentos de las listas)
+def cambiar_version(sender, **kwargs):
+    incrementar_al_confirmar(sender)
+
+
+# Rol no es del catálogo, pero su versión invalida el nombre del rol que
+# rol_de() guarda en la sesión (core/autenticacion.py)
+for modelo in [*MODELOS_VERSIONADOS, Rol]:
+    post_save.connect(cambiar_version, sender=modelo)
+    post_delete.connect(cambiar_version, sender=modelo)
+
+
+# ────────────────────────────────
+# RESÚMENES DE CALIFICACIONES
+# ────────────────────────────────
+
+@receiver(post_save, sender=Calificacion)
+def actualizar_resumen_de_calificacion(sender, instance, **kwargs):
+    actualizar_resumenes([celda_de_calificacion(instance)])
+
+
+@receiver(pre_delete, sender=Calificacion)
+def anotar_calificacion_borrada(sender, instance, **kwargs):
+    anotar_borrado(instance)
+
+
+@receiver(post_delete, sender=Calificacion)
+def actualizar_resumenes_de_borradas(sender, instance, **kwargs):
+    actualizar_borradas()
+
+
+# ────────────────────────────────
+# ÍNDICE DE BÚSQUEDA DE PERSONAS
+# ────────────────────────────────
+
+# Conectadas modelo por modelo: un receptor sin sender en post_delete
+# impide el borrado rápido (sin cargar filas) de todos los modelos
+def indexar_persona(sender, instance, **kwargs):
+    indexar(sender, pk=instance.pk)
+
+
+def desindexar_persona(sender, instance, **kwargs):
+    desindexar(sender, [instance.pk])
+
+
+for modelo in MODELOS.values():
+    post_save.connect(indexar_persona, sender=modelo)
+    post_delete.connect(desindexar_persona, sender=modelo)
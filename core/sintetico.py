@@ -0,0 +1,221 @@
+import random
+from decimal import Decimal
+
+from django.db import transaction
+
+from .models import (
+    Rol, TipoDocumento, Departamento, Ciudad, Usuario,
+    Docente, Estudiante, Acudiente,
+    NivelEducativo, Grado, Area, Asignatura, Tema, Logro,
+    Aula, Grupo, AsignacionDocente, Actividad, Calificacion,
+)
+from .autenticacion import ROL_COORDINADOR, ROL_DOCENTE, ROL_ESTUDIANTE, ROL_ACUDIENTE
+from .busqueda import reconstruir_indice
+from .opciones import FUENTES, invalidar_opciones
+from .resumenes import reconstruir_resumenes
+from .versiones import MODELOS as MODELOS_VERSIONADOS, incrementar
+
+# ────────────────────────────────
+# INSTITUCIÓN SINTÉTICA PARA PRUEBAS DE CARGA
+# ────────────────────────────────
+#
+# Genera una institución completa con bulk_create por lotes. Todos los
+# nombres llevan el prefijo PREFIJO para poder reconocerlos; los usuarios de
+# prueba usan la contraseña CLAVE.
+
+PREFIJO = 'SIM'
+CLAVE = 'Sim#2025x'
+CORREO_COORDINADOR = 'coordinador@sim.edu.co'
+TAMANO_LOTE = 5000
+
+NOMBRES = ['Ana', 'Luis', 'María', 'José', 'Camila', 'Andrés', 'Valentina', 'Juan', 'Sofía', 'Carlos', 'Daniela', 'Santiago']
+APELLIDOS = ['García', 'Rodríguez', 'Martínez', 'López', 'González', 'Pérez', 'Sánchez', 'Ramírez', 'Torres', 'Gómez']
+
+
+class Configuracion:
+    def __init__(self, niveles=3, grados_por_nivel=4, grupos_por_grado=4, estudiantes_por_grupo=35,
+                 areas=8, asignaturas_por_area=1, temas_por_asignatura=5, logros_por_asignatura=3,
+                 actividades_por_asignacion=10, semilla=2025):
+        self.niveles = niveles
+        self.grados_por_nivel = grados_por_nivel
+        self.grupos_por_grado = grupos_por_grado
+        self.estudiantes_por_grupo = estudiantes_por_grupo
+        self.areas = areas
+        self.asignaturas_por_area = asignaturas_por_area
+        self.temas_por_asignatura = temas_por_asignatura
+        self.logros_por_asignatura = logros_por_asignatura
+        self.actividades_por_asignacion = actividades_por_asignacion
+        self.semilla = semilla
+
+
+def _en_lotes(modelo, objetos):
+    return modelo.objects.bulk_create(objetos, batch_size=TAMANO_LOTE)
+
+
+def _persona(aleatorio, documento, tipo, ciudad, **extra):
+    return dict(
+        primer_nombre=aleatorio.choice(NOMBRES),
+        primer_apellido=aleatorio.choice(APELLIDOS),
+        segundo_apellido=aleatorio.choice(APELLIDOS),
+        tipo_documento_id=tipo,
+        numero_documento=documento,
+        direccion_linea1=f"Calle {aleatorio.randint(1, 120)} # {aleatorio.randint(1, 90)}-{aleatorio.randint(1, 99)}",
+        ciudad_id=ciudad,
+        **extra,
+    )
+
+
+def sembrar(config, progreso=None):
+    """
+    Crea la institución sintética. `progreso(mensaje)` recibe avisos por
+    etapa. Devuelve un dict con cuántos registros se crearon de cada tipo.
+    """
+    aviso = progreso or (lambda mensaje: None)
+    aleatorio = random.Random(config.semilla)
+    conteo = {}
+
+    if NivelEducativo.objects.filter(nombre__startswith=f'{PREFIJO} Nivel').exists():
+        raise ValueError("La base de datos ya tiene una institución sintética.")
+
+    with transaction.atomic():
+        roles = {nombre: Rol.objects.get_or_create(nombre=nombre)[0]
+                 for nombre in (ROL_COORDINADOR, ROL_DOCENTE, ROL_ESTUDIANTE, ROL_ACUDIENTE)}
+        tipo = TipoDocumento.objects.get_or_create(nombre='Tarjeta de Identidad')[0].pk
+        departamento = Departamento.objects.get_or_create(nombre=f'{PREFIJO} Departamento')[0]
+        ciudad = Ciudad.objects.get_or_create(nombre=f'{PREFIJO} Ciudad', departamento=departamento)[0].pk
+        if not Usuario.objects.filter(correo=CORREO_COORDINADOR).exists():
+            Usuario.objects.create_user(CORREO_COORDINADOR, CLAVE, rol=roles[ROL_COORDINADOR])
+
+        aviso("Estructura académica")
+        niveles = _en_lotes(NivelEducativo, [
+            NivelEducativo(nombre=f'{PREFIJO} Nivel {n + 1}') for n in range(config.niveles)
+        ])
+        grados = _en_lotes(Grado, [
+            Grado(nivel=nivel, nombre=f'{PREFIJO}-{nivel.pk}-{g + 1}')
+            for nivel in niveles for g in range(config.grados_por_nivel)
+        ])
+        areas = _en_lotes(Area, [Area(nombre=f'{PREFIJO} Área {a + 1}') for a in range(config.areas)])
+        asignaturas = _en_lotes(Asignatura, [
+            Asignatura(nombre=f'{PREFIJO} {area.nombre[len(PREFIJO) + 1:]}.{s + 1} G{grado.pk}', grado=grado, area=area)
+            for grado in grados for area in areas for s in range(config.asignaturas_por_area)
+        ])
+        _en_lotes(Tema, [
+            Tema(asignatura=asignatura, nombre=f'{PREFIJO} Tema {asignatura.pk}.{t + 1}')
+            for asignatura in asignaturas for t in range(config.temas_por_asignatura)
+        ])
+        _en_lotes(Logro, [
+            Logro(asignatura=asignatura, descripcion=f'{PREFIJO} Logro {asignatura.pk}.{l + 1}: el estudiante demuestra comprensión.')
+            for asignatura in asignaturas for l in range(config.logros_por_asignatura)
+        ])
+        conteo.update(niveles=len(niveles), grados=len(grados), areas=len(areas), asignaturas=len(asignaturas))
+
+        aviso("Grupos y docentes")
+        aula = Aula.objects.create(nombre=f'{PREFIJO} Aula', capacidad=config.estudiantes_por_grupo)
+        grupos = _en_lotes(Grupo, [
+            Grupo(grado=grado, nombre=f'{chr(65 + g % 26)}{g // 26 or ""}', aula=aula)
+            for grado in grados for g in range(config.grupos_por_grado)
+        ])
+        # Un docente por área y nivel, con usuario propio
+        inicio = Docente.objects.count()
+        usuarios = [
+            Usuario(correo=f'docente{inicio + d}@sim.edu.co', rol=roles[ROL_DOCENTE])
+            for d in range(len(niveles) * len(areas))
+        ]
+        for usuario in usuarios:
+            usuario.set_unusable_password()
+        usuarios = _en_lotes(Usuario, usuarios)
+        docentes = _en_lotes(Docente, [
+            Docente(**_persona(aleatorio, f'{PREFIJO}D{inicio + d}', tipo, ciudad,
+                               especialidad=areas[d % len(areas)].nombre, usuario=usuario))
+            for d, usuario in enumerate(usuarios)
+        ])
+        docente_de = {
+            (niveles[d // len(areas)].pk, areas[d % len(areas)].pk): docente for d, docente in enumerate(docentes)
+        }
+        conteo.update(grupos=len(grupos), docentes=len(docentes))
+
+        aviso("Estudiantes y acudientes")
+        inicio = Estudiante.objects.count()
+        total_estudiantes = len(grupos) * config.estudiantes_por_grupo
+        usuarios = [
+            Usuario(correo=f'estudiante{inicio + i}@sim.edu.co', rol=roles[ROL_ESTUDIANTE])
+            for i in range(total_estudiantes)
+        ]
+        for usuario in usuarios:
+            usuario.set_unusable_password()
+        usuarios = _en_lotes(Usuario, usuarios)
+        estudiantes = _en_lotes(Estudiante, [
+            Estudiante(**_persona(aleatorio, f'{PREFIJO}E{inicio + i}', tipo, ciudad, grupo=grupo, usuario=usuario))
+            for i, (grupo, usuario) in enumerate(zip(
+                (g for g in grupos for _ in range(config.estudiantes_por_grupo)), usuarios,
+            ))
+        ])
+        # Un acudiente por cada dos estudiantes, con usuario propio
+        inicio = Acudiente.objects.count()
+        usuarios = [
+            Usuario(correo=f'acudiente{inicio + i}@sim.edu.co', rol=roles[ROL_ACUDIENTE])
+            for i in range(len(estudiantes) // 2)
+        ]
+        for usuario in usuarios:
+            usuario.set_unusable_password()
+        usuarios = _en_lotes(Usuario, usuarios)
+        acudientes = _en_lotes(Acudiente, [
+            Acudiente(**_persona(aleatorio, f'{PREFIJO}A{inicio + i}', tipo, ciudad, usuario=usuario))
+            for i, usuario in enumerate(usuarios)
+        ])
+        _en_lotes(Acudiente.estudiantes.through, [
+            Acudiente.estudiantes.through(acudiente_id=acudiente.pk, estudiante_id=estudiante.pk)
+            for i, acudiente in enumerate(acudientes) for estudiante in estudiantes[2 * i:2 * i + 2]
+        ])
+        conteo.update(estudiantes=len(estudiantes), acudientes=len(estudiantes) // 2)
+
+        aviso("Asignaciones y actividades")
+        nivel_de_grado = {grado.pk: grado.nivel_id for grado in grados}
+        asignaturas_de_grado = {}
+        for asignatura in asignaturas:
+            asignaturas_de_grado.setdefault(asignatura.grado_id, []).append(asignatura)
+        asignaciones = _en_lotes(AsignacionDocente, [
+            AsignacionDocente(
+                docente=docente_de[(nivel_de_grado[grupo.grado_id], asignatura.area_id)],
+                grupo=grupo, asignatura=asignatura,
+            )
+            for grupo in grupos for asignatura in asignaturas_de_grado[grupo.grado_id]
+        ])
+        actividades = _en_lotes(Actividad, [
+            Actividad(asignacion=asignacion, titulo=f'Actividad {a + 1}', descripcion='Actividad generada.')
+            for asignacion in asignaciones for a in range(config.actividades_por_asignacion)
+        ])
+        conteo.update(asignaciones=len(asignaciones), actividades=len(actividades))
+
+    # Las notas se insertan en transacciones por lote para no retener millones de objetos
+    aviso("Calificaciones")
+    por_grupo = {}
+    for estudiante in estudiantes:
+        por_grupo.setdefault(estudiante.grupo_id, []).append(estudiante.pk)
+    grupo_de_asignacion = {asignacion.pk: asignacion.grupo_id for asignacion in asignaciones}
+    total = 0
+    lote = []
+    for actividad in actividades:
+        for estudiante_id in por_grupo.get(grupo_de_asignacion[actividad.asignacion_id], []):
+            nota = Decimal(aleatorio.randint(10, 50)) / 10
+            lote.append(Calificacion(actividad_id=actividad.pk, estudiante_id=estudiante_id, nota=nota))
+            if len(lote) >= TAMANO_LOTE:
+                Calificacion.objects.bulk_create(lote)
+                total += len(lote)
+                lote = []
+                aviso(f"Calificaciones: {total}")
+    if lote:
+        Calificacion.objects.bulk_create(lote)
+        total += len(lote)
+    conteo['calificaciones'] = total
+
+    aviso("Resúmenes")
+    reconstruir_resumenes()
+    aviso("Índice de búsqueda de personas")
+    reconstruir_indice()
+    # bulk_create no emite señales: se invalidan aquí las opciones en caché
+    # y el catálogo cambia de versión
+    for modelo in FUENTES:
+        invalidar_opciones(modelo)
+    incrementar(*MODELOS_VERSIONADOS)
+    return conteo
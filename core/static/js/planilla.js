@@ -0,0 +1,56 @@
+// Planilla del docente: envía solo las celdas modificadas, cada una con el
+// valor que tenía al cargarse, para que el servidor detecte conflictos.
+(function () {
+  const planilla = document.getElementById('planilla');
+  if (!planilla) return;
+  const estado = document.getElementById('estado');
+  const token = planilla.querySelector('[name=csrfmiddlewaretoken]').value;
+  const celdas = () => Array.from(planilla.querySelectorAll('input[data-estudiante]'));
+  const cambiada = (celda) => celda.value.trim() !== celda.dataset.anterior;
+
+  planilla.addEventListener('input', (evento) => {
+    const celda = evento.target;
+    if (celda.dataset.estudiante) celda.classList.toggle('bg-yellow-100', cambiada(celda));
+  });
+
+  document.getElementById('guardar').addEventListener('click', async () => {
+    const pendientes = celdas().filter(cambiada);
+    if (!pendientes.length) {
+      estado.textContent = 'No hay cambios.';
+      return;
+    }
+    const cambios = pendientes.map((celda) => ({
+      estudiante: Number(celda.dataset.estudiante),
+      actividad: Number(celda.dataset.actividad),
+      nota: celda.value.trim() || null,
+      anterior: celda.dataset.anterior || null,
+    }));
+    const respuesta = await fetch(planilla.dataset.url, {
+      method: 'POST',
+      headers: {'Content-Type': 'application/json', 'X-CSRFToken': token},
+      body: JSON.stringify({cambios}),
+    });
+    const datos = await respuesta.json();
+    if (respuesta.ok) {
+      pendientes.forEach((celda) => {
+        celda.value = celda.value.trim();
+        celda.dataset.anterior = celda.value;
+        celda.classList.remove('bg-yellow-100', 'bg-red-100');
+      });
+      estado.textContent = `Guardadas ${datos.guardadas}, borradas ${datos.borradas}.`;
+      return;
+    }
+    (datos.conflictos || []).forEach((conflicto) => {
+      const celda = pendientes[conflicto.fila];
+      celda.classList.add('bg-red-100');
+      celda.title = `Otra sesión la cambió a: ${conflicto.actual ?? 'vacía'}`;
+      celda.dataset.anterior = conflicto.actual ?? '';
+    });
+    (datos.errores || []).forEach((error) => {
+      if (error.fila !== undefined) pendientes[error.fila].classList.add('bg-red-100');
+    });
+    estado.textContent = datos.conflictos && datos.conflictos.length
+      ? 'Algunas celdas cambiaron en otra sesión (en rojo). Revísalas y guarda de nuevo.'
+      : (datos.error || 'Revisa las celdas marcadas en rojo.');
+  });
+})();
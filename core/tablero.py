@@ -0,0 +1,226 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .analitica import NOTA_APROBATORIA
+from .models import Calificacion, Estudiante, ResumenCalificacion
+from .replicas import en_primaria
+
+# ────────────────────────────────
+# TABLERO DEL ESTUDIANTE
+# ────────────────────────────────
+#
+# Lo que ve el estudiante al entrar (sus notas por asignatura, las últimas
+# actividades calificadas y su promedio) se arma una vez y se guarda en la
+# caché como un dict listo para la plantilla. Se calcula desde
+# ResumenCalificacion, que ya tiene los agregados por asignatura, y no
+# sobre todas las notas. core/resumenes.py borra el tablero de cada
+# estudiante cuyas notas cambian.
+#
+# reconstruir_resumenes() recalcula todo: en vez de borrar un tablero por
+# estudiante se cambia la GENERACION, y los tableros guardados con otra
+# generación se dan por vencidos. Tablero y generación se leen juntos con
+# un solo get_many.
+
+CACHE_PREFIJO = 'tablero'
+CACHE_TIMEOUT = 60 * 60 * 24
+GENERACION = f'{CACHE_PREFIJO}:generacion'
+ULTIMAS = 10
+TAMANO_LOTE = 500
+
+
+def _clave(estudiante_id):
+    return f"{CACHE_PREFIJO}:estudiante:{estudiante_id}"
+
+
+def _generacion():
+    generacion = cache.get(GENERACION)
+    if generacion is None:
+        # Si la caché la perdió, la nueva no coincide con ninguna anterior
+        cache.add(GENERACION, time.time_ns(), None)
+        generacion = cache.get(GENERACION)
+    return generacion
+
+
+@en_primaria()
+def calcular_tableros(estudiantes):
+    """
+    Tableros de varios estudiantes (ids): {estudiante_id: dict}. Tres
+    consultas por llamada, sin importar cuántos estudiantes sean.
+    """
+    tableros = {
+        pk: {
+            'estudiante': {'id': pk, 'nombre': f"{nombre} {apellido}", 'grupo': grupo and f"{grupo} ({grado})"},
+            'asignaturas': [],
+            'ultimas': [],
+            'promedio': None,
+        }
+        for pk, nombre, apellido, grupo, grado in Estudiante.objects.filter(pk__in=estudiantes)
+        .values_list('pk', 'primer_nombre', 'primer_apellido', 'grupo__nombre', 'grupo__grado__nombre')
+    }
+    resumenes = (
+        ResumenCalificacion.objects.filter(estudiante_id__in=tableros)
+        .order_by('asignatura__nombre')
+        .values_list('estudiante_id', 'asignatura_id', 'asignatura__nombre', 'cantidad', 'promedio', 'minima', 'maxima')
+    )
+    for estudiante_id, asignatura_id, asignatura, cantidad, promedio, minima, maxima in resumenes:
+        tableros[estudiante_id]['asignaturas'].append({
+            'id': asignatura_id, 'nombre': asignatura, 'cantidad': cantidad,
+            'promedio': str(promedio), 'minima': str(minima), 'maxima': str(maxima),
+            'en_riesgo': float(promedio) < NOTA_APROBATORIA,
+        })
+
+    # Las ULTIMAS calificaciones de cada estudiante, numeradas en la base de datos
+    ultimas = (
+        Calificacion.objects.filter(estudiante_id__in=tableros)
+        .annotate(orden=Window(
+            RowNumber(), partition_by=F('estudiante_id'), order_by=[F('fecha_registro').desc(), F('pk').desc()],
+        ))
+        .filter(orden__lte=ULTIMAS)
+        .order_by('estudiante_id', 'orden')
+        .values_list(
+            'estudiante_id', 'actividad__titulo', 'actividad__asignacion__asignatura__nombre', 'nota', 'fecha_registro',
+        )
+    )
+    for estudiante_id, actividad, asignatura, nota, fecha in ultimas:
+        tableros[estudiante_id]['ultimas'].append(
+            {'actividad': actividad, 'asignatura': asignatura, 'nota': str(nota), 'fecha': fecha}
+        )
+
+    for datos in tableros.values():
+        promedios = [float(a['promedio']) for a in datos['asignaturas']]
+        if promedios:
+            datos['promedio'] = round(sum(promedios) / len(promedios), 2)
+    return tableros
+
+
+def _vigentes(estudiantes, guardados):
+    """Los tableros de `guardados` (resultado de get_many) que no vencieron."""
+    generacion = guardados.get(GENERACION)
+    vigentes = {}
+    for pk in estudiantes:
+        guardado = guardados.get(_clave(pk))
+        if guardado is not None and generacion is not None and guardado['generacion'] == generacion:
+            vigentes[pk] = guardado
+    return vigentes
+
+
+def _existentes(estudiantes, vigentes):
+    # Sin las marcas de los ids que ya no tienen estudiante
+    return {pk: vigentes[pk] for pk in estudiantes if pk in vigentes and vigentes[pk]['estudiante'] is not None}
+
+
+def tableros(estudiantes):
+    """
+    Tableros de varios estudiantes {estudiante_id: dict}, en un solo get_many.
+    Los que faltan o vencieron se calculan juntos con calcular_tableros() y
+    se guardan; los ids sin estudiante se omiten.
+    """
+    estudiantes = list(estudiantes)
+    guardados = cache.get_many([GENERACION, *(_clave(pk) for pk in estudiantes)])
+    vigentes = _vigentes(estudiantes, guardados)
+    faltantes = [pk for pk in estudiantes if pk not in vigentes]
+    if faltantes:
+        generacion = guardados.get(GENERACION)
+        generacion = generacion if generacion is not None else _generacion()
+        calculados = calcular_tableros(faltantes)
+        # Un id que ya no existe (estudiante borrado, lista de un acudiente
+        # aún sin invalidar) queda marcado: si no, cada petición lo tomaría
+        # por un tablero que falta y volvería a calcular
+        for pk in faltantes:
+            calculados.setdefault(pk, {'estudiante': None})
+        for datos in calculados.values():
+            datos['generacion'] = generacion
+        cache.set_many({_clave(pk): datos for pk, datos in calculados.items()}, CACHE_TIMEOUT)
+        vigentes.update(calculados)
+    return _existentes(estudiantes, vigentes)
+
+
+async def atableros(estudiantes):
+    estudiantes = list(estudiantes)
+    guardados = await cache.aget_many([GENERACION, *(_clave(pk) for pk in estudiantes)])
+    vigentes = _vigentes(estudiantes, guardados)
+    if len(vigentes) < len(estudiantes):
+        return await sync_to_async(tableros)(estudiantes)
+    return _existentes(estudiantes, vigentes)
+
+
+def tablero(estudiante_id):
+    """Tablero del estudiante desde la caché; si no está o venció, se calcula y se guarda."""
+    return tableros([estudiante_id]).get(estudiante_id)
+
+
+async def atablero(estudiante_id):
+    return (await atableros([estudiante_id])).get(estudiante_id)
+
+
+def precalcular_tableros(estudiantes=None, progreso=None):
+    """
+    Calcula y guarda en la caché los tableros de `estudiantes` (ids; por
+    omisión, los que tienen usuario) en lotes de TAMANO_LOTE, para que el
+    primer ingreso de cada uno ya encuentre su tablero. Devuelve cuántos guardó.
+    """
+    if estudiantes is None:
+        estudiantes = Estudiante.objects.filter(usuario__isnull=False).order_by('pk').values_list('pk', flat=True)
+    estudiantes = list(estudiantes)
+    generacion = _generacion()
+    guardados = 0
+    for inicio in range(0, len(estudiantes), TAMANO_LOTE):
+        lote = calcular_tableros(estudiantes[inicio:inicio + TAMANO_LOTE])
+        for datos in lote.values():
+            datos['generacion'] = generacion
+        cache.set_many({_clave(pk): datos for pk, datos in lote.items()}, CACHE_TIMEOUT)
+        guardados += len(lote)
+        if progreso:
+            progreso(guardados, len(estudiantes))
+    return guardados
+
+
+def invalidar_tableros(estudiantes=None):
+    """Borra los tableros de `estudiantes` (ids), o vence todos cambiando la generación."""
+    if estudiantes is None:
+        cache.set(GENERACION, time.time_ns(), None)
+    else:
+        cache.delete_many([_clave(pk) for pk in estudiantes])
+
+
+# ────────────────────────────────
+# TABLEROS DE LOS HIJOS DE UN ACUDIENTE
+# ────────────────────────────────
+#
+# Por acudiente solo se guarda la lista de sus estudiantes; los tableros
+# son los mismos de cada estudiante, compartidos con su propio panel y con
+# los demás acudientes, así que no hay una copia por acudiente que
+# invalidar cuando cambian las notas. Con todo en la caché, el panel del
+# acudiente no consulta la base de datos; si no, son una consulta por la
+# lista más las tres de calcular_tableros(), tenga los hijos que tenga.
+
+def _clave_acudiente(acudiente_id):
+    return f"{CACHE_PREFIJO}:acudiente:{acudiente_id}"
+
+
+def estudiantes_de_acudiente(acudiente_id):
+    clave = _clave_acudiente(acudiente_id)
+    estudiantes = cache.get(clave)
+    if estudiantes is None:
+        with en_primaria():
+            estudiantes = list(
+                Estudiante.objects.filter(acudientes=acudiente_id)
+                .order_by('primer_apellido', 'primer_nombre', 'pk').values_list('pk', flat=True)
+            )
+        cache.set(clave, estudiantes, CACHE_TIMEOUT)
+    return estudiantes
+
+
+async def aestudiantes_de_acudiente(acudiente_id):
+    estudiantes = await cache.aget(_clave_acudiente(acudiente_id))
+    if estudiantes is None:
+        estudiantes = await sync_to_async(estudiantes_de_acudiente)(acudiente_id)
+    return estudiantes
+
+
+def invalidar_acudientes(acudientes):
+    cache.delete_many([_clave_acudiente(pk) for pk in acudientes])
@@ -0,0 +1,298 @@
+import csv
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .boletines import ARCHIVO_PROGRESO, generar_en_disco, grupos_de
+from .eliminacion import reanudar
+from .importacion import importar_personas
+from .models import Eliminacion, Estudiante, Tarea
+from .resumenes import reconstruir_resumenes
+from .tablero import precalcular_tableros
+
+logger = logging.getLogger(__name__)
+
+# ────────────────────────────────
+# COLA DE TAREAS EN LA BASE DE DATOS
+# ────────────────────────────────
+#
+# Sin broker externo: las tareas son filas de core_tarea. Un trabajador
+# (manage.py trabajador_tareas) reclama la siguiente disponible por
+# prioridad y antigüedad. En PostgreSQL lo hace con SELECT ... FOR UPDATE
+# SKIP LOCKED, así varios trabajadores no se estorban; en SQLite (que no
+# tiene bloqueo por fila) se marca la tarea con un UPDATE condicionado al
+# estado, y si otro trabajador se adelantó se prueba con la siguiente.
+#
+# Una tarea que falla vuelve a la cola con espera exponencial hasta agotar
+# max_intentos. Los manejadores deben poder repetirse sin efectos dobles.
+#
+# Mientras un manejador corre, un hilo aparte renueva el latido de la tarea
+# cada cierto tiempo, aunque el manejador no informe avance (un borrado o
+# una importación larga). Si el trabajador muere, el latido se detiene y
+# otro trabajador devuelve la tarea a la cola; eso cuenta como un intento,
+# así una tarea que tumba a su trabajador no se reclama para siempre.
+
+ESPERA_REINTENTO = 30  # segundos; se duplica en cada intento
+MAX_ERRORES_RESULTADO = 1000
+
+MANEJADORES = {}
+
+
+def tarea(tipo):
+    """Registra la función que ejecuta las tareas de `tipo`."""
+    def decorador(funcion):
+        MANEJADORES[tipo] = funcion
+        return funcion
+    return decorador
+
+
+def encolar(tipo, descripcion, parametros=None, prioridad=0, max_intentos=3, usuario=None):
+    if tipo not in MANEJADORES:
+        raise ValueError(f"Tipo de tarea desconocido: {tipo}")
+    return Tarea.objects.create(
+        tipo=tipo, descripcion=descripcion[:255], parametros=parametros or {},
+        prioridad=prioridad, max_intentos=max_intentos, creada_por=usuario,
+    )
+
+
+def directorio_de(tarea):
+    return os.path.join(settings.TAREAS_DIR, f'tarea_{tarea.pk}')
+
+
+def ruta_archivo(tarea):
+    return os.path.join(settings.TAREAS_DIR, tarea.archivo) if tarea.archivo else None
+
+
+class Contexto:
+    """Lo que recibe un manejador: la tarea, su directorio y el avance."""
+
+    def __init__(self, tarea):
+        self.tarea = tarea
+        self.directorio = directorio_de(tarea)
+
+    def progreso(self, hechos, total=None, mensaje=None):
+        cambios = {'hechos': hechos, 'latido': timezone.now()}
+        if total is not None:
+            cambios['total'] = total
+        if mensaje is not None:
+            cambios['mensaje'] = mensaje[:255]
+        Tarea.objects.filter(pk=self.tarea.pk).update(**cambios)
+        for campo, valor in cambios.items():
+            setattr(self.tarea, campo, valor)
+
+    def archivo(self, nombre):
+        """Ruta absoluta para un archivo de resultado dentro del directorio de la tarea."""
+        os.makedirs(self.directorio, exist_ok=True)
+        return os.path.join(self.directorio, nombre)
+
+
+class Latido:
+    """
+    Hilo que renueva el latido de `tarea` cada `intervalo` segundos mientras
+    dura el bloque `with`. Usa su propia conexión a la base de datos y la
+    cierra al terminar.
+    """
+
+    def __init__(self, tarea, intervalo=None):
+        self.tarea = tarea
+        self.intervalo = max(1, settings.TAREAS_ABANDONO_SEGUNDOS // 4) if intervalo is None else intervalo
+        self._fin = threading.Event()
+        self._hilo = threading.Thread(target=self._latir, name=f'latido-tarea-{tarea.pk}', daemon=True)
+
+    def _latir(self):
+        try:
+            while not self._fin.wait(self.intervalo):
+                try:
+                    Tarea.objects.filter(pk=self.tarea.pk, estado=Tarea.EN_CURSO).update(latido=timezone.now())
+                except Exception:
+                    logger.exception("No se pudo renovar el latido de la tarea %s", self.tarea.pk)
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._fin.set()
+        self._hilo.join()
+
+
+def _disponibles(tipos=None):
+    queryset = Tarea.objects.filter(estado=Tarea.PENDIENTE, disponible_desde__lte=timezone.now())
+    if tipos:
+        queryset = queryset.filter(tipo__in=tipos)
+    return queryset.order_by('-prioridad', 'disponible_desde', 'pk')
+
+
+def reclamar(trabajador, tipos=None):
+    """Marca como EN_CURSO la siguiente tarea disponible y la devuelve (o None)."""
+    cambios = dict(estado=Tarea.EN_CURSO, trabajador=trabajador[:100], iniciada=timezone.now(), latido=timezone.now())
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            tarea = _disponibles(tipos).select_for_update(skip_locked=True).first()
+            if tarea is None:
+                return None
+            Tarea.objects.filter(pk=tarea.pk).update(**cambios)
+    else:
+        for pk in _disponibles(tipos).values_list('pk', flat=True)[:10]:
+            if Tarea.objects.filter(pk=pk, estado=Tarea.PENDIENTE).update(**cambios):
+                break
+        else:
+            return None
+        tarea = Tarea.objects.get(pk=pk)
+    for campo, valor in cambios.items():
+        setattr(tarea, campo, valor)
+    return tarea
+
+
+def recuperar_abandonadas(segundos=None):
+    """
+    Devuelve a la cola las tareas EN_CURSO cuyo trabajador dejó de dar
+    señales, contando un intento; las que agotan max_intentos quedan
+    FALLIDAS. Devuelve cuántas devolvió a la cola.
+    """
+    segundos = settings.TAREAS_ABANDONO_SEGUNDOS if segundos is None else segundos
+    limite = timezone.now() - timedelta(seconds=segundos)
+    abandonadas = Tarea.objects.filter(estado=Tarea.EN_CURSO, latido__lt=limite)
+    mensaje = 'Se perdió al trabajador que la ejecutaba.'
+    abandonadas.filter(intentos__gte=F('max_intentos') - 1).update(
+        estado=Tarea.FALLIDA, terminada=timezone.now(), intentos=F('intentos') + 1,
+        mensaje=mensaje, error=mensaje,
+    )
+    return abandonadas.update(
+        estado=Tarea.PENDIENTE, trabajador='', intentos=F('intentos') + 1,
+        mensaje='Recuperada tras perder al trabajador.',
+    )
+
+
+def ejecutar(tarea):
+    """Ejecuta una tarea ya reclamada y registra el resultado o el reintento."""
+    contexto = Contexto(tarea)
+    try:
+        with Latido(tarea):
+            resultado = MANEJADORES[tarea.tipo](contexto, **tarea.parametros)
+    except Exception:
+        intentos = tarea.intentos + 1
+        error = traceback.format_exc()
+        logger.exception("Falló la tarea %s (%s), intento %s", tarea.pk, tarea.tipo, intentos)
+        if intentos < tarea.max_intentos:
+            espera = timedelta(seconds=ESPERA_REINTENTO * 2 ** (intentos - 1))
+            cambios = dict(estado=Tarea.PENDIENTE, disponible_desde=timezone.now() + espera, trabajador='')
+        else:
+            cambios = dict(estado=Tarea.FALLIDA, terminada=timezone.now())
+        cambios.update(intentos=intentos, error=error)
+    else:
+        cambios = dict(estado=Tarea.TERMINADA, terminada=timezone.now(), error='', resultado=resultado or {})
+    Tarea.objects.filter(pk=tarea.pk).update(**cambios)
+    for campo, valor in cambios.items():
+        setattr(tarea, campo, valor)
+    return tarea
+
+
+def trabajar(trabajador=None, tipos=None, una_vez=False, intervalo=2.0, max_tareas=None):
+    """
+    Bucle del trabajador: reclama y ejecuta tareas hasta que se interrumpa,
+    o hasta vaciar la cola con `una_vez`. Devuelve cuántas ejecutó.
+    """
+    trabajador = trabajador or f'{socket.gethostname()}:{os.getpid()}'
+    ejecutadas = 0
+    while max_tareas is None or ejecutadas < max_tareas:
+        close_old_connections()
+        recuperar_abandonadas()
+        tarea = reclamar(trabajador, tipos)
+        if tarea is None:
+            if una_vez:
+                break
+            time.sleep(intervalo)
+            continue
+        ejecutar(tarea)
+        ejecutadas += 1
+    return ejecutadas
+
+# ────────────────────────────────
+# MANEJADORES
+# ────────────────────────────────
+
+@tarea('importar_personas')
+def _importar_personas(contexto, tipo, archivo, delimitador=','):
+    ruta = os.path.join(settings.TAREAS_DIR, archivo)
+
+    def progreso(resultado):
+        contexto.progreso(resultado.filas, mensaje=(
+            f"{resultado.creados} creados, {len(resultado.ya_registrados)} ya registrados, "
+            f"{len(resultado.errores)} rechazadas"
+        ))
+
+    with open(ruta, encoding='utf-8-sig', newline='') as entrada:
+        # Una pasada rápida para conocer el total de filas (sin el encabezado)
+        total = max(sum(1 for _ in csv.reader(entrada, delimiter=delimitador)) - 1, 0)
+        entrada.seek(0)
+        contexto.progreso(0, total, "Importando…")
+        resultado = importar_personas(tipo, entrada, delimitador, progreso=progreso)
+    os.remove(ruta)
+    contexto.progreso(resultado.filas, total, "Importación terminada.")
+    return {
+        'creados': resultado.creados,
+        'ya_registrados': len(resultado.ya_registrados),
+        'rechazadas': len(resultado.errores),
+        'errores': resultado.errores[:MAX_ERRORES_RESULTADO],
+    }
+
+
+@tarea('generar_boletines')
+def _generar_boletines(contexto, grupos=None, grados=None, desde=None, hasta=None):
+    grupos = grupos_de(grupos, grados)
+    directorio = contexto.archivo('boletines')
+    total = Estudiante.objects.filter(grupo_id__in=grupos).count()
+    escritos = [0]
+
+    def progreso(hechos, total_grupo, grupo):
+        escritos[0] += 1
+        contexto.progreso(escritos[0], mensaje=f"Grupo {grupo}: {hechos} de {total_grupo}")
+
+    contexto.progreso(0, total, f"{len(grupos)} grupos")
+    # Si la tarea se reintenta, no se repiten los boletines ya escritos
+    generar_en_disco(
+        grupos, directorio, reanudar=os.path.exists(os.path.join(directorio, ARCHIVO_PROGRESO)),
+        desde=parse_date(desde) if desde else None, hasta=parse_date(hasta) if hasta else None,
+        progreso=progreso,
+    )
+    os.remove(os.path.join(directorio, ARCHIVO_PROGRESO))
+    zip_final = shutil.make_archive(directorio, 'zip', directorio)
+    shutil.rmtree(directorio, ignore_errors=True)
+    Tarea.objects.filter(pk=contexto.tarea.pk).update(archivo=os.path.relpath(zip_final, settings.TAREAS_DIR))
+    return {'grupos': len(grupos), 'boletines': total}
+
+
+@tarea('eliminar')
+def _eliminar(contexto, eliminacion):
+    eliminacion = reanudar(Eliminacion.objects.get(pk=eliminacion))
+    contexto.progreso(eliminacion.eliminados, eliminacion.total, eliminacion.get_estado_display())
+    if eliminacion.estado == Eliminacion.FALLIDA:
+        raise RuntimeError(eliminacion.error)
+    return {'eliminados': eliminacion.eliminados}
+
+
+@tarea('reconstruir_resumenes')
+def _reconstruir_resumenes(contexto):
+    contexto.progreso(0, mensaje="Reconstruyendo resúmenes…")
+    return {'resumenes': reconstruir_resumenes()}
+
+
+@tarea('precalcular_tableros')
+def _precalcular_tableros(contexto):
+    contexto.progreso(0, mensaje="Calculando tableros de estudiantes…")
+    guardados = precalcular_tableros(progreso=lambda hechos, total: contexto.progreso(hechos, total))
+    return {'tableros': guardados}
@@ -0,0 +1,149 @@
+from contextlib import contextmanager
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import get_resolver, reverse
+
+from .middleware import RegistroConsultas
+
+# ────────────────────────────────
+# PRESUPUESTOS DE CONSULTAS PARA PRUEBAS
+# ────────────────────────────────
+#
+# Número máximo de consultas SQL que puede hacer cada vista de core/urls.py,
+# contando la sesión y el usuario. Una vista nueva sin presupuesto hace
+# fallar verificar_presupuestos(), igual que una que lo exceda.
+
+PRESUPUESTOS = {
+    'inicio': 0,
+    'registro': 2,
+    'login': 2,
+    'panel_docente': 3,
+    'panel_estudiante': 2,
+    'panel_coordinador': 2,
+    'panel_acudiente': 2,
+    'lista_niveles': 3,
+    'crear_nivel': 2,
+    'editar_nivel': 3,
+    'eliminar_nivel': 17,
+    'lista_grados': 4,
+    'crear_grado': 3,
+    'editar_grado': 4,
+    'eliminar_grado': 15,
+    'lista_areas': 3,
+    'crear_area': 2,
+    'editar_area': 3,
+    'eliminar_area': 12,
+    'lista_asignaturas': 5,
+    'crear_asignatura': 4,
+    'editar_asignatura': 5,
+    'eliminar_asignatura': 11,
+    'lista_temas': 4,
+    'crear_tema': 3,
+    'editar_tema': 4,
+    'eliminar_tema': 5,
+    'lista_logros': 4,
+    'crear_logro': 3,
+    'editar_logro': 4,
+    'eliminar_logro': 5,
+    'calificar_actividad': 2,
+    'planilla_docente': 6,
+    'guardar_planilla': 2,
+    'descargar_boletines': 6,
+    'exportar': 3,
+    'api_recurso': 3,
+    'importar_personas': 2,
+    'buscar_personas': 3,
+    'buscar_textos': 3,
+    'estado_conexiones': 2,
+    'arbol_academico': 7,
+    'estado_eliminacion': 4,
+    'lista_tareas': 3,
+    'estado_tarea': 3,
+    'descargar_tarea': 3,
+    'programar_tarea': 4,
+}
+
+
+# Vistas que con la caché vacía hacen más consultas que con la caché
+# caliente (PRESUPUESTOS): las que calculan y guardan lo que después leen.
+# Son cantidades fijas, no dependen del número de filas.
+PRESUPUESTOS_CACHE_FRIA = {
+    # calcular_tableros(): resúmenes, asignaturas y actividades del estudiante
+    'panel_estudiante': 5,
+    # lo mismo, más los estudiantes vinculados al acudiente
+    'panel_acudiente': 6,
+    # opciones de grados y grupos del formulario de boletines
+    'panel_coordinador': 4,
+    # opciones de grados y asignaturas del formulario (core/opciones.py)
+    'buscar_textos': 4,
+}
+
+
+class PresupuestoExcedido(AssertionError):
+    pass
+
+
+@contextmanager
+def presupuesto_consultas(maximo, descripcion=''):
+    """Falla si el bloque ejecuta más de `maximo` consultas SQL."""
+    registro = RegistroConsultas()
+    with registro.registrar():
+        yield registro
+    if registro.cantidad > maximo:
+        detalle = '\n'.join(f'  {veces}× {sql}' for sql, veces in registro.huellas.most_common())
+        raise PresupuestoExcedido(
+            f"{descripcion or 'Bloque'}: {registro.cantidad} consultas (máximo {maximo}).\n{detalle}"
+        )
+
+
+def nombres_de_urls(urlconf='core.urls'):
+    return sorted(nombre for nombre in get_resolver(urlconf).reverse_dict if isinstance(nombre, str))
+
+
+def verificar_presupuesto(cliente, nombre_url, kwargs=None, metodo='get', datos=None, maximo=None):
+    """Pide la URL con `cliente` y verifica su presupuesto. Devuelve la respuesta."""
+    maximo = PRESUPUESTOS[nombre_url] if maximo is None else maximo
+    url = reverse(nombre_url, kwargs=kwargs)
+    with presupuesto_consultas(maximo, f"{nombre_url} ({url})"):
+        respuesta = getattr(cliente, metodo)(url, datos or {})
+        if getattr(respuesta, 'streaming', False):
+            b''.join(respuesta.streaming_content)
+    return respuesta
+
+
+def verificar_presupuestos(cliente, kwargs_por_url=None, omitir=(), clientes=None, cache_fria=False):
+    """
+    Recorre todas las URL con nombre de core/urls.py. `kwargs_por_url` da los
+    argumentos de las rutas que los necesitan; `omitir` excluye nombres (por
+    ejemplo, las vistas que eliminan con GET); `clientes` da el cliente de
+    las vistas que se piden con la sesión de otro rol.
+
+    Con `cache_fria` la caché se vacía antes de cada vista y se aplica
+    PRESUPUESTOS_CACHE_FRIA; si no, cada vista se pide una vez antes de
+    medirla, con la caché ya caliente. Vaciar la caché solo se permite con
+    LocMemCache (override_settings(CACHES=...) en la prueba): con la
+    configuración normal se borrarían la caché en disco o el Redis compartido.
+    """
+    if cache_fria and not isinstance(caches['default'], LocMemCache):
+        raise ValueError(
+            'verificar_presupuestos(cache_fria=True) vacía la caché: use una LocMemCache '
+            f"en la prueba, no {type(caches['default']).__name__}"
+        )
+    kwargs_por_url = kwargs_por_url or {}
+    clientes = clientes or {}
+    sin_presupuesto = [n for n in nombres_de_urls() if n not in PRESUPUESTOS]
+    if sin_presupuesto:
+        raise PresupuestoExcedido(f"URL sin presupuesto de consultas: {', '.join(sin_presupuesto)}")
+    for nombre in nombres_de_urls():
+        if nombre in omitir:
+            continue
+        cliente_url = clientes.get(nombre, cliente)
+        kwargs = kwargs_por_url.get(nombre)
+        if cache_fria:
+            cache.clear()
+            maximo = PRESUPUESTOS_CACHE_FRIA.get(nombre, PRESUPUESTOS[nombre])
+        else:
+            verificar_presupuesto(cliente_url, nombre, kwargs, maximo=float('inf'))
+            maximo = PRESUPUESTOS[nombre]
+        verificar_presupuesto(cliente_url, nombre, kwargs, maximo=maximo)
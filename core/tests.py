@@ -1,3 +1,1603 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import logging
+import math
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.sessions.backends.signed_cookies import SessionStore as SesionFirmada
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings, skipIfDBFeature, skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import analitica, arbol, busqueda, eliminacion, importacion, replicas, tareas, texto_completo
+from .api import RECURSOS
+from .autenticacion import ROL_COORDINADOR, ROL_DOCENTE, SESION_ROL, rol_de
+from .benchmark import CLIENTE_DE, EXCLUIDAS, _argumentos, _clientes
+from .calificaciones import guardar_calificaciones
+from .conexiones import estadisticas_pool, estadisticas_pools
+from .listas import ListaCoordinador
+from .middleware import UMBRAL_N_MAS_1, InstrumentacionSQLMiddleware, ReplicasMiddleware
+from .models import (
+    Actividad, Acudiente, Area, AsignacionDocente, Asignatura, Calificacion, Ciudad, Departamento, Docente, Eliminacion,
+    Estudiante, Grado, Grupo, IndicePersona, Logro, NivelEducativo, PalabraPersona, ResumenCalificacion, Rol, Tarea,
+    Tema, TipoDocumento, Usuario,
+)
+from .paginacion import TAMANO_PAGINA, PaginadorKeyset, codificar_cursor
+from .planillas import aplicar_cambios, cargar_planilla
+from .resumenes import actualizar_resumenes, reconstruir_resumenes
+from .opciones import opciones
+from .sintetico import Configuracion, sembrar
+from .tablero import atableros, estudiantes_de_acudiente, tableros
+from .testing import verificar_presupuestos
+
+CACHE_PRUEBAS = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def _institucion_pequena():
+    return Configuracion(
+        niveles=1, grados_por_nivel=2, grupos_por_grado=1, estudiantes_por_grupo=4, areas=2,
+        temas_por_asignatura=2, logros_por_asignatura=2, actividades_por_asignacion=2,
+    )
+
+
+def _resumenes():
+    """Contenido de ResumenCalificacion, sin la fecha de actualización."""
+    return set(ResumenCalificacion.objects.values_list(
+        'estudiante_id', 'asignatura_id', 'grupo_id', 'cantidad', 'suma', 'promedio', 'minima', 'maxima',
+    ))
+
+
+def _resumenes_reconstruidos():
+    """Lo que debería haber en ResumenCalificacion, recalculado desde cero."""
+    reconstruir_resumenes()
+    return _resumenes()
+
+
+class ConDirectorioDeTareas:
+    """TAREAS_DIR en un directorio temporal mientras corre la clase."""
+
+    @classmethod
+    def setUpClass(cls):
+        directorio = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        cls.enterClassContext(override_settings(TAREAS_DIR=directorio))
+        super().setUpClass()
+
+
+# ────────────────────────────────
+# PRESUPUESTOS DE CONSULTAS
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class PresupuestosTests(ConDirectorioDeTareas, TestCase):
+    """Ninguna vista de core/urls.py excede su presupuesto de consultas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+        # Para las rutas de estado y descarga
+        Eliminacion.objects.create(modelo='core.area', objeto_id=1, descripcion="Área: prueba")
+        with open(os.path.join(settings.TAREAS_DIR, 'resultado.txt'), 'w') as archivo:
+            archivo.write('ok')
+        Tarea.objects.create(
+            tipo='generar_boletines', descripcion="Boletines", estado=Tarea.TERMINADA, archivo='resultado.txt',
+        )
+
+    def _verificar(self, cache_fria):
+        clientes = _clientes()
+        por_url = {nombre: clientes[rol] for nombre, rol in CLIENTE_DE.items()}
+        # force_login no pasa por la vista de login, que guarda el rol en la
+        # sesión: una primera petición lo hace, como tras un login real
+        for rol, cliente in clientes.items():
+            cliente.get(reverse(f'panel_{rol}'))
+        verificar_presupuestos(
+            clientes['coordinador'], _argumentos(), omitir=EXCLUIDAS, clientes=por_url, cache_fria=cache_fria,
+        )
+
+    def test_cache_fria(self):
+        self._verificar(cache_fria=True)
+
+    def test_cache_caliente(self):
+        self._verificar(cache_fria=False)
+
+
+class VaciarCacheTests(TestCase):
+    """cache_fria solo vacía una LocMemCache de prueba, nunca la caché real."""
+
+    def test_rechaza_cache_compartida(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        compartida = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directorio}}
+        with override_settings(CACHES=compartida):
+            cache.set('clave', 'valor')
+            with self.assertRaises(ValueError):
+                verificar_presupuestos(None, cache_fria=True)
+            self.assertEqual(cache.get('clave'), 'valor')
+
+
+# ────────────────────────────────
+# INSTRUMENTACIÓN SQL
+# ────────────────────────────────
+
+def _consultar(veces):
+    for _ in range(veces):
+        Grado.objects.filter(pk=1).exists()
+
+
+class InstrumentacionSQLTests(TestCase):
+    """El middleware cuenta las consultas de la vista y las del cuerpo en flujo."""
+
+    def _pedir(self, vista):
+        middleware = InstrumentacionSQLMiddleware(vista)
+        return middleware(RequestFactory().get('/prueba/'))
+
+    def _nivel(self, nivel):
+        # setLevel y no mock.patch: isEnabledFor() guarda en caché la respuesta
+        logger = logging.getLogger('core.sql')
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(nivel)
+
+    def _vista(self, veces):
+        def vista(request):
+            _consultar(veces)
+            return HttpResponse('ok')
+        return vista
+
+    def test_server_timing(self):
+        respuesta = self._pedir(self._vista(2))
+        self.assertIn('desc="2 consultas"', respuesta['Server-Timing'])
+
+    def test_n_mas_1_como_warning(self):
+        with self.assertLogs('core.sql', 'WARNING') as logs:
+            self._pedir(self._vista(UMBRAL_N_MAS_1))
+        datos = json.loads(logs.records[0].getMessage())
+        self.assertEqual((logs.records[0].levelname, datos['evento']), ('WARNING', 'posible_n_mas_1'))
+        self.assertEqual(datos['repetidas'][0]['veces'], UMBRAL_N_MAS_1)
+
+    def test_sin_json_si_el_nivel_lo_descarta(self):
+        self._nivel(logging.WARNING)
+        with mock.patch('core.middleware.json.dumps') as dumps:
+            self._pedir(self._vista(1))
+        dumps.assert_not_called()
+
+    def test_cuenta_el_cuerpo_en_flujo(self):
+        def vista(request):
+            _consultar(1)
+
+            def cuerpo():
+                for _ in range(3):
+                    _consultar(1)
+                    yield b'fila\n'
+            return StreamingHttpResponse(cuerpo())
+
+        self._nivel(logging.INFO)
+        respuesta = self._pedir(vista)
+        # Las cabeceras salen antes del cuerpo: solo cubren la vista
+        self.assertIn('desc="1 consultas"', respuesta['Server-Timing'])
+        with self.assertLogs('core.sql', 'INFO') as logs:
+            self.assertEqual(b''.join(respuesta.streaming_content), b'fila\n' * 3)
+        self.assertEqual(json.loads(logs.records[0].getMessage())['consultas'], 4)
+
+
+# ────────────────────────────────
+# ROL EN CACHÉ POR SESIÓN
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class RolEnSesionTests(TestCase):
+    """La copia del rol en la sesión deja de valer al renombrar el rol o cambiarlo."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+        cls.usuario = Usuario.objects.filter(rol__nombre=ROL_DOCENTE).order_by('pk').first()
+
+    def setUp(self):
+        self.sesion = SesionFirmada()
+
+    def _rol(self):
+        """rol_de() con el usuario cargado sin su Rol, como en una petición sin el JOIN."""
+        request = RequestFactory().get('/')
+        request.user = Usuario.objects.get(pk=self.usuario.pk)
+        request.session = self.sesion
+        return rol_de(request)
+
+    def test_la_copia_evita_la_consulta(self):
+        self.assertEqual(self._rol(), ROL_DOCENTE)
+        usuario = Usuario.objects.get(pk=self.usuario.pk)
+        request = RequestFactory().get('/')
+        request.user, request.session = usuario, self.sesion
+        with self.assertNumQueries(0):
+            self.assertEqual(rol_de(request), ROL_DOCENTE)
+
+    def test_renombrar_el_rol_invalida_la_copia(self):
+        self.assertEqual(self._rol(), ROL_DOCENTE)
+        rol = Rol.objects.get(nombre=ROL_DOCENTE)
+        with self.captureOnCommitCallbacks(execute=True):
+            rol.nombre = "Profesor"
+            rol.save()
+        self.assertEqual(self._rol(), "Profesor")
+        self.assertEqual(self.sesion[SESION_ROL]['nombre'], "Profesor")
+
+    def test_cambiar_el_rol_del_usuario_invalida_la_copia(self):
+        self.assertEqual(self._rol(), ROL_DOCENTE)
+        Usuario.objects.filter(pk=self.usuario.pk).update(rol=Rol.objects.get(nombre=ROL_COORDINADOR))
+        self.assertEqual(self._rol(), ROL_COORDINADOR)
+
+    def test_la_vista_deja_de_aceptar_el_rol_renombrado(self):
+        cliente = _clientes()['docente']
+        self.assertEqual(cliente.get(reverse('panel_docente')).status_code, 200)
+        rol = Rol.objects.get(nombre=ROL_DOCENTE)
+        with self.captureOnCommitCallbacks(execute=True):
+            rol.nombre = "Profesor"
+            rol.save()
+        self.assertEqual(cliente.get(reverse('panel_docente')).status_code, 302)
+
+
+# ────────────────────────────────
+# INSTITUCIÓN SINTÉTICA
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class SembrarTests(TestCase):
+    def test_sembrar_invalida_las_opciones_en_cache(self):
+        cache.clear()
+        self.assertEqual((opciones(Grado), opciones(Grupo)), ([], []))
+        sembrar(_institucion_pequena())
+        self.assertEqual({pk for pk, _ in opciones(Grado)}, set(Grado.objects.values_list('pk', flat=True)))
+        self.assertEqual(len(opciones(Grupo)), Grupo.objects.count())
+
+
+# ────────────────────────────────
+# OPCIONES EN CACHÉ
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class OpcionesTests(TestCase):
+    """Las opciones en caché se invalidan cuando el cambio se confirma."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+        cls.grado = Grado.objects.order_by('pk').first()
+
+    def setUp(self):
+        cache.clear()
+        self.antes = dict(opciones(Grado))[self.grado.pk]
+
+    def _renombrar(self):
+        self.grado.nombre = "Renombrado"
+        self.grado.save()
+
+    def test_guardar_un_grado_cambia_las_opciones(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._renombrar()
+        self.assertEqual(dict(opciones(Grado))[self.grado.pk], f"{self.grado.nivel.nombre} - Renombrado")
+        # Las asignaturas muestran el nombre del grado
+        asignatura = Asignatura.objects.filter(grado=self.grado).first()
+        self.assertEqual(dict(opciones(Asignatura))[asignatura.pk], f"{asignatura.nombre} (Renombrado)")
+
+    def test_no_invalida_antes_del_commit(self):
+        with self.captureOnCommitCallbacks() as pendientes:
+            self._renombrar()
+            self.assertEqual(dict(opciones(Grado))[self.grado.pk], self.antes)
+        for callback in pendientes:
+            callback()
+        self.assertIn("Renombrado", dict(opciones(Grado))[self.grado.pk])
+
+    def test_rollback_no_invalida(self):
+        with self.captureOnCommitCallbacks() as pendientes:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self._renombrar()
+                raise RuntimeError
+        self.assertEqual(pendientes, [])
+        self.assertEqual(dict(opciones(Grado))[self.grado.pk], self.antes)
+
+
+# ────────────────────────────────
+# REGISTRO MASIVO DE CALIFICACIONES
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class GuardarCalificacionesTests(TestCase):
+    """guardar_calificaciones(): upsert de la planilla y resúmenes al día."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+
+    def setUp(self):
+        self.actividad = Actividad.objects.select_related('asignacion').filter(es_calificable=True).first()
+        self.estudiantes = list(
+            Estudiante.objects.filter(grupo_id=self.actividad.asignacion.grupo_id).values_list('pk', flat=True)
+        )
+
+    def _notas(self):
+        return dict(Calificacion.objects.filter(actividad=self.actividad).values_list('estudiante_id', 'nota'))
+
+    def test_inserta_las_que_faltan_y_actualiza_las_existentes(self):
+        Calificacion.objects.filter(actividad=self.actividad, estudiante_id=self.estudiantes[0]).delete()
+        existentes = dict(Calificacion.objects.filter(actividad=self.actividad).values_list('estudiante_id', 'pk'))
+        self.assertTrue(existentes)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resultado = guardar_calificaciones(
+                self.actividad, [{'estudiante': pk, 'nota': '4,5'} for pk in self.estudiantes],
+            )
+
+        self.assertTrue(resultado.ok)
+        self.assertEqual(resultado.guardadas, len(self.estudiantes))
+        self.assertEqual(self._notas(), {pk: Decimal('4.5') for pk in self.estudiantes})
+        # Las existentes se actualizan en su lugar, sin borrar y volver a crear
+        despues = dict(Calificacion.objects.filter(actividad=self.actividad).values_list('estudiante_id', 'pk'))
+        self.assertEqual({pk: despues[pk] for pk in existentes}, existentes)
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+    def test_repetir_la_planilla_no_duplica(self):
+        filas = [{'estudiante': pk, 'nota': '3.0'} for pk in self.estudiantes]
+        guardar_calificaciones(self.actividad, filas)
+        guardar_calificaciones(self.actividad, filas)
+        self.assertEqual(Calificacion.objects.filter(actividad=self.actividad).count(), len(self.estudiantes))
+
+    def test_una_fila_invalida_no_guarda_nada(self):
+        antes = self._notas()
+        resumenes = _resumenes()
+        filas = [{'estudiante': pk, 'nota': '1.0'} for pk in self.estudiantes]
+        filas.append({'estudiante': self.estudiantes[0], 'nota': '2.0'})
+        filas.append({'estudiante': -1, 'nota': '2.0'})
+        filas[0]['nota'] = '5.5'
+
+        resultado = guardar_calificaciones(self.actividad, filas)
+
+        self.assertFalse(resultado.ok)
+        self.assertEqual(resultado.guardadas, 0)
+        self.assertEqual(
+            [(error['fila'], error['error']) for error in resultado.errores],
+            [
+                (0, "La nota debe estar entre 0.0 y 5.0."),
+                (len(self.estudiantes), "Estudiante repetido en la planilla."),
+                (len(self.estudiantes) + 1, "El estudiante no pertenece al grupo."),
+            ],
+        )
+        self.assertEqual(self._notas(), antes)
+        self.assertEqual(_resumenes(), resumenes)
+
+
+class MigracionCalificacionUnicaTests(TransactionTestCase):
+    """0002 deja la nota más reciente de cada (actividad, estudiante) antes de la restricción única."""
+
+    antes = [('core', '0001_initial')]
+    despues = [('core', '0002_calificacion_unica')]
+
+    def _migrar(self, destino):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(destino)
+        return executor.loader.project_state(destino).apps
+
+    def test_descarta_repetidas(self):
+        apps = self._migrar(self.antes)
+        try:
+            def nuevo(modelo, **campos):
+                return apps.get_model('core', modelo).objects.create(**campos)
+
+            nivel = nuevo('NivelEducativo', nombre="Primaria")
+            grado = nuevo('Grado', nombre="Primero", nivel=nivel)
+            area = nuevo('Area', nombre="Ciencias")
+            asignatura = nuevo('Asignatura', nombre="Biología", grado=grado, area=area)
+            tipo = nuevo('TipoDocumento', nombre="TI")
+            ciudad = nuevo('Ciudad', nombre="Cali", departamento=nuevo('Departamento', nombre="Valle"))
+            persona = dict(
+                tipo_documento=tipo, primer_nombre="Ana", primer_apellido="Gil", direccion_linea1="Calle 1", ciudad=ciudad,
+            )
+            docente = nuevo('Docente', numero_documento='1', especialidad="Biología", **persona)
+            estudiante = nuevo('Estudiante', numero_documento='2', **persona)
+            grupo = nuevo('Grupo', nombre="1A", grado=grado, aula=nuevo('Aula', nombre="101", capacidad=30))
+            asignacion = nuevo('AsignacionDocente', docente=docente, grupo=grupo, asignatura=asignatura)
+            actividad = nuevo('Actividad', asignacion=asignacion, titulo="Taller", descripcion="")
+            Calificacion = apps.get_model('core', 'Calificacion')
+            notas = [Calificacion.objects.create(actividad=actividad, estudiante=estudiante, nota=n) for n in (1, 2, 3)]
+            Calificacion.objects.filter(pk=notas[2].pk).update(fecha_registro=timezone.localdate() - timedelta(days=1))
+
+            apps = self._migrar(self.despues)
+
+            # La más reciente es la de fecha mayor y, entre las de hoy, la de mayor id
+            quedan = apps.get_model('core', 'Calificacion').objects.values_list('pk', flat=True)
+            self.assertEqual(list(quedan), [notas[1].pk])
+        finally:
+            self._migrar(MigrationExecutor(connection).loader.graph.leaf_nodes('core'))
+
+
+# ────────────────────────────────
+# RESÚMENES DE CALIFICACIONES
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class ResumenesTests(TestCase):
+    """Los resúmenes que se mantienen al cambiar notas coinciden con reconstruir_resumenes()."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+
+    def _upserts_de_resumen(self, consultas):
+        tabla = ResumenCalificacion._meta.db_table
+        return [c['sql'] for c in consultas if c['sql'].startswith(f'INSERT INTO "{tabla}"')]
+
+    def test_actualizar_resumenes_coincide_con_reconstruir(self):
+        celdas = set(Calificacion.objects.values_list(
+            'estudiante_id', 'actividad__asignacion__asignatura_id', 'actividad__asignacion__grupo_id',
+        ))
+        esperados = _resumenes_reconstruidos()
+        ResumenCalificacion.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            actualizar_resumenes(celdas)
+        self.assertEqual(_resumenes(), esperados)
+
+    def test_el_recalculo_espera_la_confirmacion(self):
+        calificacion = Calificacion.objects.first()
+        antes = _resumenes()
+        with self.captureOnCommitCallbacks() as pendientes:
+            calificacion.nota = Decimal('0.5') if calificacion.nota != Decimal('0.5') else Decimal('5.0')
+            calificacion.save()
+            self.assertEqual(_resumenes(), antes)
+        self.assertTrue(pendientes)
+        for funcion in pendientes:
+            funcion()
+        self.assertNotEqual(_resumenes(), antes)
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+    def test_guardar_una_nota(self):
+        calificacion = Calificacion.objects.first()
+        calificacion.nota = Decimal('0.5') if calificacion.nota != Decimal('0.5') else Decimal('5.0')
+        with self.captureOnCommitCallbacks(execute=True):
+            calificacion.save()
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+    def test_borrar_una_nota(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Calificacion.objects.first().delete()
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+    def test_borrar_la_ultima_nota_de_una_celda_la_quita(self):
+        estudiante_id, asignatura_id, grupo_id = ResumenCalificacion.objects.values_list(
+            'estudiante_id', 'asignatura_id', 'grupo_id',
+        ).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            Calificacion.objects.filter(
+                estudiante_id=estudiante_id, actividad__asignacion__asignatura_id=asignatura_id,
+                actividad__asignacion__grupo_id=grupo_id,
+            ).delete()
+        self.assertFalse(ResumenCalificacion.objects.filter(
+            estudiante_id=estudiante_id, asignatura_id=asignatura_id, grupo_id=grupo_id,
+        ).exists())
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+    def test_borrar_una_actividad_recalcula_una_vez(self):
+        actividad = Actividad.objects.filter(calificacion__isnull=False).distinct().first()
+        self.assertGreater(actividad.calificacion_set.count(), 1)
+        with CaptureQueriesContext(connection) as consultas, self.captureOnCommitCallbacks(execute=True):
+            actividad.delete()
+        # Un solo upsert para la única (asignatura, grupo) tocada, no uno por nota
+        self.assertEqual(len(self._upserts_de_resumen(consultas.captured_queries)), 1)
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+    def test_borrar_un_estudiante_recalcula_por_asignatura(self):
+        estudiante = Estudiante.objects.filter(calificacion__isnull=False).distinct().first()
+        celdas = ResumenCalificacion.objects.filter(estudiante=estudiante).count()
+        self.assertGreater(celdas, 0)
+        with CaptureQueriesContext(connection) as consultas, self.captureOnCommitCallbacks(execute=True):
+            estudiante.delete()
+        self.assertLessEqual(len(self._upserts_de_resumen(consultas.captured_queries)), celdas)
+        self.assertFalse(ResumenCalificacion.objects.filter(estudiante_id=estudiante.pk).exists())
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+
+@skipUnlessDBFeature('has_select_for_update')
+@override_settings(CACHES=CACHE_PRUEBAS)
+class ResumenesConcurrentesTests(TransactionTestCase):
+    """Dos transacciones que escriben en la misma celda a la vez dejan el resumen completo."""
+
+    def test_dos_escritores_intercalados(self):
+        sembrar(_institucion_pequena())
+        primera, segunda = Actividad.objects.filter(
+            asignacion=Actividad.objects.values('asignacion')[:1],
+        ).order_by('pk')[:2]
+        estudiante = Estudiante.objects.filter(grupo_id=primera.asignacion.grupo_id).values_list('pk', flat=True)[0]
+        Calificacion.objects.filter(actividad__in=[primera, segunda], estudiante_id=estudiante).delete()
+
+        agregado, seguir = threading.Event(), threading.Event()
+        upsert = ResumenCalificacion.objects.bulk_create
+
+        def upsert_con_pausa(*args, **kwargs):
+            # El primer escritor ya agregó su celda y se detiene antes de escribirla
+            if threading.current_thread().name == 'escritor-1':
+                agregado.set()
+                seguir.wait(5)
+            return upsert(*args, **kwargs)
+
+        def escribir(actividad, nota):
+            try:
+                with transaction.atomic():
+                    Calificacion.objects.create(actividad=actividad, estudiante_id=estudiante, nota=nota)
+            finally:
+                connection.close()
+
+        with mock.patch.object(ResumenCalificacion.objects, 'bulk_create', upsert_con_pausa):
+            primero = threading.Thread(target=escribir, args=(primera, Decimal('1.0')), name='escritor-1')
+            segundo = threading.Thread(target=escribir, args=(segunda, Decimal('5.0')), name='escritor-2')
+            primero.start()
+            self.assertTrue(agregado.wait(5))
+            # Sin bloqueo por celda el segundo terminaría aquí y el primero
+            # escribiría después un resumen sin su nota
+            segundo.start()
+            segundo.join(0.5)
+            seguir.set()
+            primero.join()
+            segundo.join()
+
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+
+# ────────────────────────────────
+# ESTADÍSTICAS POR GRUPO
+# ────────────────────────────────
+
+def _percentil(ordenadas, p):
+    """Interpolación lineal entre posiciones, como statistics.quantiles(method='inclusive')."""
+    posicion = (len(ordenadas) - 1) * p / 100
+    bajo = math.floor(posicion)
+    alto = min(bajo + 1, len(ordenadas) - 1)
+    return ordenadas[bajo] + (ordenadas[alto] - ordenadas[bajo]) * (posicion - bajo)
+
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class EstadisticasTests(TestCase):
+    """calcular_estadisticas() coincide con el cálculo directo sobre la lista de notas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+        cls.grupo = Grupo.objects.order_by('pk').first()
+
+    def _comparar(self, calculado, notas):
+        notas = sorted(float(nota) for nota in notas)
+        self.assertEqual(calculado['cantidad'], len(notas))
+        self.assertAlmostEqual(calculado['media'], statistics.fmean(notas), delta=0.005)
+        self.assertAlmostEqual(calculado['desviacion'], statistics.pstdev(notas), delta=0.005)
+        self.assertEqual((calculado['minima'], calculado['maxima']), (notas[0], notas[-1]))
+        self.assertAlmostEqual(calculado['percentiles'][50], statistics.median(notas), delta=0.005)
+        for p in analitica.PERCENTILES:
+            self.assertAlmostEqual(calculado['percentiles'][p], _percentil(notas, p), delta=0.005)
+        self.assertEqual(calculado['reprobadas'], sum(nota < analitica.NOTA_APROBATORIA for nota in notas))
+        self.assertEqual(sum(veces for _, _, veces in calculado['histograma']), len(notas))
+
+    def test_general_y_por_asignatura(self):
+        estadisticas = analitica.calcular_estadisticas(self.grupo.pk)
+        notas = Calificacion.objects.filter(actividad__asignacion__grupo=self.grupo)
+        self.assertTrue(notas.exists())
+
+        self._comparar(estadisticas['general'], notas.values_list('nota', flat=True))
+        self.assertTrue(estadisticas['asignaturas'])
+        for asignatura in estadisticas['asignaturas']:
+            self._comparar(
+                asignatura, notas.filter(actividad__asignacion__asignatura_id=asignatura['id']).values_list('nota', flat=True),
+            )
+
+    def test_notas_conocidas(self):
+        actividad = Actividad.objects.filter(asignacion__grupo=self.grupo).order_by('pk').first()
+        estudiantes = list(Estudiante.objects.filter(grupo=self.grupo).order_by('pk').values_list('pk', flat=True))
+        Calificacion.objects.filter(actividad__asignacion__grupo=self.grupo).delete()
+        notas = ['1.0', '2.5', '3.0', '4.5'][:len(estudiantes)]
+        Calificacion.objects.bulk_create(
+            Calificacion(actividad=actividad, estudiante_id=pk, nota=Decimal(nota)) for pk, nota in zip(estudiantes, notas)
+        )
+
+        general = analitica.calcular_estadisticas(self.grupo.pk)['general']
+
+        self._comparar(general, notas)
+        self.assertEqual(general['percentiles'], {10: 1.45, 25: 2.12, 50: 2.75, 75: 3.38, 90: 4.05})
+
+
+# ────────────────────────────────
+# EXPORTACIÓN EN FLUJO
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class ExportacionTests(TestCase):
+    """La exportación sale en flujo como CSV y, para Excel, sin fórmulas ejecutables."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+        Area.objects.all().delete()
+        for nombre in ('=HYPERLINK("http://x")', '+1', '-2', '@SUMA', 'Ciencias'):
+            Area.objects.create(nombre=nombre)
+
+    def _exportar(self, **parametros):
+        respuesta = _clientes()['coordinador'].get(reverse('exportar', kwargs={'nombre': 'areas'}), parametros)
+        self.assertTrue(respuesta.streaming)
+        self.assertEqual(respuesta['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(respuesta['Content-Disposition'], 'attachment; filename="areas.csv"')
+        return b''.join(respuesta.streaming_content).decode('utf-8')
+
+    def test_excel(self):
+        contenido = self._exportar(formato='excel')
+        self.assertTrue(contenido.startswith('\ufeff'))
+        filas = list(csv.reader(io.StringIO(contenido.removeprefix('\ufeff')), delimiter=';'))
+        self.assertEqual(filas[0], ['ID', 'Área', 'Obligatoria'])
+        self.assertEqual(
+            [fila[1] for fila in filas[1:]], ["'=HYPERLINK(\"http://x\")", "'+1", "'-2", "'@SUMA", 'Ciencias'],
+        )
+
+    def test_csv_tal_cual(self):
+        filas = list(csv.reader(io.StringIO(self._exportar())))
+        self.assertEqual(
+            [fila[1] for fila in filas[1:]], ['=HYPERLINK("http://x")', '+1', '-2', '@SUMA', 'Ciencias'],
+        )
+
+
+# ────────────────────────────────
+# PLANILLA DEL DOCENTE
+# ────────────────────────────────
+
+def _asignacion_con_notas():
+    return AsignacionDocente.objects.filter(
+        actividad__es_calificable=True, actividad__calificacion__isnull=False,
+    ).distinct().order_by('pk').first()
+
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class PlanillaTests(TestCase):
+    """aplicar_cambios(): diferencias, conflictos con el valor anterior y borrado de celdas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+
+    def setUp(self):
+        self.asignacion = _asignacion_con_notas()
+        planilla = cargar_planilla(self.asignacion)
+        # Dos celdas con nota: (estudiante, actividad, nota actual)
+        self.celdas = [
+            (estudiante, actividad, nota)
+            for estudiante, _, notas in planilla.filas() for actividad, nota in notas if nota is not None
+        ][:2]
+        self.assertEqual(len(self.celdas), 2)
+
+    def _nota(self, estudiante, actividad):
+        return Calificacion.objects.filter(estudiante_id=estudiante, actividad_id=actividad).values_list(
+            'nota', flat=True,
+        ).first()
+
+    def _aplicar(self, cambios):
+        with self.captureOnCommitCallbacks(execute=True):
+            return aplicar_cambios(self.asignacion, cambios)
+
+    def _otra(self, nota):
+        return '1.0' if nota != Decimal('1.0') else '2.0'
+
+    def test_solo_escribe_las_celdas_que_cambian(self):
+        (e1, a1, n1), (e2, a2, n2) = self.celdas
+        resultado = self._aplicar([
+            {'estudiante': e1, 'actividad': a1, 'nota': self._otra(n1), 'anterior': str(n1)},
+            {'estudiante': e2, 'actividad': a2, 'nota': str(n2), 'anterior': str(n2)},
+        ])
+        self.assertTrue(resultado.ok)
+        self.assertEqual((resultado.guardadas, resultado.borradas), (1, 0))
+        self.assertEqual(self._nota(e1, a1), Decimal(self._otra(n1)))
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+    def test_un_conflicto_no_guarda_ninguna_celda(self):
+        (e1, a1, n1), (e2, a2, n2) = self.celdas
+        resultado = self._aplicar([
+            {'estudiante': e1, 'actividad': a1, 'nota': self._otra(n1), 'anterior': str(n1)},
+            {'estudiante': e2, 'actividad': a2, 'nota': '4.0', 'anterior': self._otra(n2)},
+        ])
+        self.assertFalse(resultado.ok)
+        self.assertEqual(
+            resultado.conflictos, [{'fila': 1, 'estudiante': e2, 'actividad': a2, 'actual': str(n2)}],
+        )
+        self.assertEqual((self._nota(e1, a1), self._nota(e2, a2)), (n1, n2))
+
+    def test_una_celda_vacia_borra_la_nota(self):
+        (e1, a1, n1), _ = self.celdas
+        resultado = self._aplicar([{'estudiante': e1, 'actividad': a1, 'nota': '', 'anterior': str(n1)}])
+        self.assertEqual((resultado.guardadas, resultado.borradas), (0, 1))
+        self.assertIsNone(self._nota(e1, a1))
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+    def test_dos_sesiones_llenan_la_misma_celda_vacia(self):
+        (e1, a1, _), _ = self.celdas
+        Calificacion.objects.filter(estudiante_id=e1, actividad_id=a1).delete()
+        primera = self._aplicar([{'estudiante': e1, 'actividad': a1, 'nota': '3.0', 'anterior': None}])
+        segunda = self._aplicar([{'estudiante': e1, 'actividad': a1, 'nota': '4.0', 'anterior': None}])
+        self.assertTrue(primera.ok)
+        self.assertEqual(segunda.conflictos, [{'fila': 0, 'estudiante': e1, 'actividad': a1, 'actual': '3.0'}])
+        self.assertEqual(self._nota(e1, a1), Decimal('3.0'))
+
+
+@skipUnlessDBFeature('has_select_for_update')
+@override_settings(CACHES=CACHE_PRUEBAS)
+class PlanillaConcurrenteTests(TransactionTestCase):
+    """Dos sesiones que llenan a la vez la misma celda vacía: la segunda ve un conflicto."""
+
+    def test_la_segunda_sesion_espera_y_ve_el_conflicto(self):
+        sembrar(_institucion_pequena())
+        asignacion = _asignacion_con_notas()
+        estudiante, actividad = Calificacion.objects.filter(
+            actividad__asignacion=asignacion, actividad__es_calificable=True,
+        ).values_list('estudiante_id', 'actividad_id')[0]
+        Calificacion.objects.filter(estudiante_id=estudiante, actividad_id=actividad).delete()
+
+        leido, seguir = threading.Event(), threading.Event()
+        insertar = Calificacion.objects.bulk_create
+        resultados = {}
+
+        def insertar_con_pausa(*args, **kwargs):
+            # La primera sesión ya comprobó la celda vacía y se detiene antes de escribir
+            if threading.current_thread().name == 'sesion-1':
+                leido.set()
+                seguir.wait(5)
+            return insertar(*args, **kwargs)
+
+        def guardar(nombre, nota):
+            try:
+                resultados[nombre] = aplicar_cambios(asignacion, [
+                    {'estudiante': estudiante, 'actividad': actividad, 'nota': nota, 'anterior': None},
+                ])
+            finally:
+                connection.close()
+
+        with mock.patch.object(Calificacion.objects, 'bulk_create', insertar_con_pausa):
+            primera = threading.Thread(target=guardar, args=('sesion-1', '3.0'), name='sesion-1')
+            segunda = threading.Thread(target=guardar, args=('sesion-2', '4.0'), name='sesion-2')
+            primera.start()
+            self.assertTrue(leido.wait(5))
+            segunda.start()
+            segunda.join(0.5)
+            seguir.set()
+            primera.join()
+            segunda.join()
+
+        self.assertTrue(resultados['sesion-1'].ok)
+        self.assertEqual([c['actual'] for c in resultados['sesion-2'].conflictos], ['3.0'])
+        self.assertEqual(
+            Calificacion.objects.get(estudiante_id=estudiante, actividad_id=actividad).nota, Decimal('3.0'),
+        )
+
+
+# ────────────────────────────────
+# TABLEROS DE ESTUDIANTES Y ACUDIENTES
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class TablerosAcudienteTests(TestCase):
+    """La lista de hijos de un acudiente y los tableros ante estudiantes borrados."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+
+    def setUp(self):
+        cache.clear()
+        self.acudiente = Acudiente.objects.filter(estudiantes__isnull=False).distinct().first()
+
+    def test_borrar_un_estudiante_invalida_la_lista_de_sus_acudientes(self):
+        hijos = estudiantes_de_acudiente(self.acudiente.pk)
+        self.assertTrue(hijos)
+        with self.captureOnCommitCallbacks(execute=True):
+            Estudiante.objects.get(pk=hijos[0]).delete()
+        self.assertNotIn(hijos[0], estudiantes_de_acudiente(self.acudiente.pk))
+
+    def test_un_id_sin_estudiante_no_se_recalcula_en_cada_peticion(self):
+        existente = Estudiante.objects.values_list('pk', flat=True).first()
+        borrado = Estudiante.objects.order_by('-pk').values_list('pk', flat=True).first() + 1
+        self.assertEqual(list(tableros([existente, borrado])), [existente])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(list(tableros([existente, borrado])), [existente])
+        with mock.patch('core.tablero.tableros') as calcular, self.assertNumQueries(0):
+            self.assertEqual(list(async_to_sync(atableros)([existente, borrado])), [existente])
+        calcular.assert_not_called()
+
+
+# ────────────────────────────────
+# BORRADO EN CASCADA POR LOTES
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class PlanEliminacionTests(TestCase):
+    """PlanEliminacion y ejecutar(): hojas antes que padres, en lotes, reanudable."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+
+    def setUp(self):
+        self.area = Area.objects.filter(asignaturas__isnull=False).distinct().first()
+        self.plan = eliminacion.PlanEliminacion(self.area)
+
+    def _restantes(self):
+        plan = eliminacion.PlanEliminacion(self.area)
+        return {modelo: plan.consulta(modelo).count() for modelo in plan.orden()}
+
+    def test_cada_modelo_se_borra_antes_que_sus_padres(self):
+        orden = self.plan.orden()
+        self.assertIs(orden[-1], Area)
+        self.assertIn(Calificacion, orden)
+        for modelo in orden:
+            for _, padre in self.plan.padres[modelo]:
+                self.assertLess(orden.index(modelo), orden.index(padre), f"{modelo} antes que {padre}")
+
+    def test_impacto_cuenta_sin_borrar(self):
+        antes = Calificacion.objects.count()
+        impacto = self.plan.impacto()
+        self.assertEqual(impacto['protegidos'], {})
+        notas = Calificacion.objects.filter(actividad__asignacion__asignatura__area=self.area).count()
+        self.assertEqual(impacto['eliminar'][str(Calificacion._meta.verbose_name_plural)], notas)
+        self.assertEqual(Calificacion.objects.count(), antes)
+
+    def test_ejecutar_borra_en_lotes(self):
+        registro = eliminacion.programar(self.area)
+        with mock.patch.object(eliminacion, 'TAMANO_LOTE', 3), \
+                mock.patch.object(eliminacion, 'borrar_por_pk', wraps=eliminacion.borrar_por_pk) as borrar, \
+                self.captureOnCommitCallbacks(execute=True):
+            eliminacion.ejecutar(registro, self.area)
+
+        registro.refresh_from_db()
+        self.assertEqual(registro.estado, Eliminacion.TERMINADA)
+        self.assertEqual(registro.eliminados, registro.total)
+        self.assertFalse(Area.objects.filter(pk=self.area.pk).exists())
+        self.assertFalse(any(self._restantes().values()))
+        tamanos = [len(llamada.args[1]) for llamada in borrar.call_args_list]
+        self.assertLessEqual(max(tamanos), 3)
+        self.assertGreater(sum(1 for llamada in borrar.call_args_list if llamada.args[0] is Calificacion), 1)
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+    def test_un_lote_fallido_se_reanuda(self):
+        registro = eliminacion.programar(self.area)
+        original = eliminacion.borrar_por_pk
+        llamadas = []
+
+        def fallar_en_el_segundo(modelo, pks):
+            llamadas.append(modelo)
+            if len(llamadas) == 2:
+                raise RuntimeError("se cayó la conexión")
+            original(modelo, pks)
+
+        with mock.patch.object(eliminacion, 'TAMANO_LOTE', 3), \
+                mock.patch.object(eliminacion, 'borrar_por_pk', fallar_en_el_segundo), \
+                self.assertLogs('core.eliminacion', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            eliminacion.ejecutar(registro, self.area)
+        registro.refresh_from_db()
+        self.assertEqual(registro.estado, Eliminacion.FALLIDA)
+        # El primer lote quedó confirmado; el segundo se deshizo entero
+        self.assertEqual(registro.eliminados, 3)
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            eliminacion.reanudar(registro)
+        registro.refresh_from_db()
+        self.assertEqual(registro.estado, Eliminacion.TERMINADA)
+        self.assertFalse(Area.objects.filter(pk=self.area.pk).exists())
+        self.assertEqual(_resumenes(), _resumenes_reconstruidos())
+
+
+# ────────────────────────────────
+# COLA DE TAREAS
+# ────────────────────────────────
+
+def _manejador_exitoso(contexto):
+    return {'ok': True}
+
+
+def _manejador_fallido(contexto):
+    raise RuntimeError("falla a propósito")
+
+
+class TareasTests(TestCase):
+    """Reclamo, reintentos y recuperación de tareas abandonadas."""
+
+    def setUp(self):
+        manejadores = mock.patch.dict(tareas.MANEJADORES, {'exito': _manejador_exitoso, 'falla': _manejador_fallido})
+        manejadores.start()
+        self.addCleanup(manejadores.stop)
+
+    def test_reclamar_por_prioridad_y_una_sola_vez(self):
+        baja = tareas.encolar('exito', "Baja")
+        alta = tareas.encolar('exito', "Alta", prioridad=5)
+
+        self.assertEqual(tareas.reclamar('t1').pk, alta.pk)
+        self.assertEqual(tareas.reclamar('t2').pk, baja.pk)
+        self.assertIsNone(tareas.reclamar('t3'))
+        self.assertEqual(
+            dict(Tarea.objects.values_list('pk', 'trabajador')), {alta.pk: 't1', baja.pk: 't2'},
+        )
+
+    def test_reclamar_filtra_por_tipo(self):
+        tareas.encolar('falla', "Otra")
+        exito = tareas.encolar('exito', "Esta")
+        self.assertEqual(tareas.reclamar('t1', tipos=['exito']).pk, exito.pk)
+        self.assertIsNone(tareas.reclamar('t1', tipos=['exito']))
+
+    @skipIfDBFeature('has_select_for_update_skip_locked')
+    def test_reclamar_salta_la_que_otro_trabajador_tomo(self):
+        tomada = tareas.encolar('exito', "Tomada", prioridad=5)
+        libre = tareas.encolar('exito', "Libre")
+        # Otro trabajador la marcó entre la lectura de candidatas y el UPDATE
+        Tarea.objects.filter(pk=tomada.pk).update(estado=Tarea.EN_CURSO, trabajador='otro')
+        candidatas = Tarea.objects.order_by('-prioridad', 'pk')
+
+        with mock.patch.object(tareas, '_disponibles', return_value=candidatas):
+            reclamada = tareas.reclamar('t1')
+
+        self.assertEqual(reclamada.pk, libre.pk)
+        self.assertEqual(Tarea.objects.get(pk=tomada.pk).trabajador, 'otro')
+
+    def test_una_falla_vuelve_a_la_cola_con_espera_hasta_agotar_intentos(self):
+        tarea = tareas.encolar('falla', "Falla", max_intentos=2)
+
+        with self.assertLogs('core.tareas', 'ERROR'):
+            tareas.ejecutar(tareas.reclamar('t1'))
+        tarea.refresh_from_db()
+        self.assertEqual((tarea.estado, tarea.intentos), (Tarea.PENDIENTE, 1))
+        self.assertGreater(tarea.disponible_desde, timezone.now())
+        self.assertIn("falla a propósito", tarea.error)
+        self.assertIsNone(tareas.reclamar('t1'))
+
+        Tarea.objects.filter(pk=tarea.pk).update(disponible_desde=timezone.now())
+        with self.assertLogs('core.tareas', 'ERROR'):
+            tareas.ejecutar(tareas.reclamar('t1'))
+        tarea.refresh_from_db()
+        self.assertEqual((tarea.estado, tarea.intentos), (Tarea.FALLIDA, 2))
+
+    def test_ejecutar_guarda_el_resultado(self):
+        tarea = tareas.encolar('exito', "Éxito")
+        tareas.ejecutar(tareas.reclamar('t1'))
+        tarea.refresh_from_db()
+        self.assertEqual((tarea.estado, tarea.resultado), (Tarea.TERMINADA, {'ok': True}))
+
+    def test_recuperar_abandonadas_cuenta_un_intento(self):
+        abandonada = tareas.encolar('exito', "Abandonada", max_intentos=2)
+        viva = tareas.encolar('exito', "Viva")
+        hace_rato = timezone.now() - timedelta(minutes=10)
+        Tarea.objects.filter(pk=abandonada.pk).update(estado=Tarea.EN_CURSO, latido=hace_rato, trabajador='muerto')
+        Tarea.objects.filter(pk=viva.pk).update(estado=Tarea.EN_CURSO, latido=timezone.now(), trabajador='vivo')
+
+        self.assertEqual(tareas.recuperar_abandonadas(segundos=60), 1)
+        abandonada.refresh_from_db()
+        self.assertEqual((abandonada.estado, abandonada.intentos, abandonada.trabajador), (Tarea.PENDIENTE, 1, ''))
+        self.assertEqual(Tarea.objects.get(pk=viva.pk).estado, Tarea.EN_CURSO)
+
+        # La vuelve a tomar un trabajador que también muere: agotó sus intentos
+        Tarea.objects.filter(pk=abandonada.pk).update(estado=Tarea.EN_CURSO, latido=hace_rato)
+        self.assertEqual(tareas.recuperar_abandonadas(segundos=60), 0)
+        abandonada.refresh_from_db()
+        self.assertEqual((abandonada.estado, abandonada.intentos), (Tarea.FALLIDA, 2))
+        self.assertIsNotNone(abandonada.terminada)
+
+
+class LatidoTests(TransactionTestCase):
+    """El hilo de Latido renueva el latido con su propia conexión."""
+
+    def test_renueva_el_latido_sin_avance_del_manejador(self):
+        hace_rato = timezone.now() - timedelta(minutes=10)
+        tarea = Tarea.objects.create(tipo='exito', descripcion="Larga", estado=Tarea.EN_CURSO, latido=hace_rato)
+
+        with tareas.Latido(tarea, intervalo=0.05):
+            limite = time.monotonic() + 5
+            while Tarea.objects.get(pk=tarea.pk).latido == hace_rato and time.monotonic() < limite:
+                time.sleep(0.02)
+
+        tarea.refresh_from_db()
+        self.assertGreater(tarea.latido, hace_rato)
+        self.assertEqual(tareas.recuperar_abandonadas(segundos=60), 0)
+
+
+# ────────────────────────────────
+# IMPORTACIÓN DE PERSONAS
+# ────────────────────────────────
+
+ENCABEZADO_CSV = 'tipo_documento,numero_documento,primer_nombre,primer_apellido,direccion_linea1,ciudad\n'
+
+
+def _csv_personas(*filas):
+    return ENCABEZADO_CSV + ''.join(
+        f'TI,{documento},Ana,Gil,Calle 1,{ciudad}\n' for documento, ciudad in filas
+    )
+
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+@mock.patch.object(importacion, 'TAMANO_LOTE', 2)
+class ImportacionTests(ConDirectorioDeTareas, TestCase):
+    """Lotes, documentos ya registrados y reintentos de importar_personas."""
+
+    ARCHIVO = _csv_personas(('100', 'Cali'), ('101', 'Cali'), ('100', 'Cali'), ('102', 'Nowhere'), ('103', 'Cali'))
+
+    @classmethod
+    def setUpTestData(cls):
+        TipoDocumento.objects.create(nombre='TI')
+        Ciudad.objects.create(nombre='Cali', departamento=Departamento.objects.create(nombre='Valle'))
+
+    def _importar(self, texto, **kwargs):
+        return importacion.importar_personas('acudientes', io.StringIO(texto), **kwargs)
+
+    def test_cuentas_y_reimportar_el_mismo_archivo(self):
+        avances = []
+        resultado = self._importar(self.ARCHIVO, progreso=lambda r: avances.append((r.filas, r.creados)))
+
+        self.assertEqual(resultado.creados, 3)
+        self.assertEqual(resultado.ya_registrados, [])
+        self.assertEqual([(e['fila'], e['numero_documento']) for e in resultado.errores], [(4, '100'), (5, '102')])
+        self.assertEqual(avances, [(2, 2), (4, 2), (5, 3)])
+        self.assertEqual(
+            sorted(Acudiente.objects.values_list('numero_documento', flat=True)), ['100', '101', '103'],
+        )
+
+        # Un reintento no crea nada ni convierte lo ya cargado en errores
+        resultado = self._importar(self.ARCHIVO)
+        self.assertEqual(resultado.creados, 0)
+        self.assertEqual([r['numero_documento'] for r in resultado.ya_registrados], ['100', '101', '103'])
+        self.assertEqual(len(resultado.errores), 2)
+        self.assertEqual(Acudiente.objects.count(), 3)
+
+    def test_documento_registrado_durante_la_carga(self):
+        cargar = importacion._cargar
+
+        def otro_proceso_se_adelanta(modelo, registros):
+            Acudiente.objects.create(
+                tipo_documento=TipoDocumento.objects.get(), numero_documento='101', primer_nombre="Otro",
+                primer_apellido="Proceso", direccion_linea1="Calle 2", ciudad=Ciudad.objects.get(),
+            )
+            return cargar(modelo, registros)
+
+        with mock.patch.object(importacion, '_cargar', otro_proceso_se_adelanta):
+            resultado = self._importar(_csv_personas(('100', 'Cali'), ('101', 'Cali')))
+
+        self.assertEqual(resultado.creados, 1)
+        self.assertEqual(resultado.ya_registrados, [{'fila': 3, 'numero_documento': '101'}])
+        self.assertEqual(resultado.errores, [])
+        self.assertEqual(Acudiente.objects.get(numero_documento='101').primer_nombre, "Otro")
+
+    def test_tarea_informa_avance_por_lote(self):
+        ruta = os.path.join(settings.TAREAS_DIR, 'personas.csv')
+        with open(ruta, 'w') as archivo:
+            archivo.write(self.ARCHIVO)
+        tarea = tareas.encolar('importar_personas', "Importar", {'tipo': 'acudientes', 'archivo': 'personas.csv'})
+        progreso = tareas.Contexto.progreso
+
+        with mock.patch.object(tareas.Contexto, 'progreso', autospec=True, side_effect=progreso) as avances:
+            tareas.ejecutar(tareas.reclamar('t1'))
+
+        self.assertEqual([llamada.args[1] for llamada in avances.call_args_list], [0, 2, 4, 5, 5])
+        tarea.refresh_from_db()
+        self.assertEqual((tarea.estado, tarea.hechos, tarea.total), (Tarea.TERMINADA, 5, 5))
+        self.assertEqual(
+            {clave: tarea.resultado[clave] for clave in ('creados', 'ya_registrados', 'rechazadas')},
+            {'creados': 3, 'ya_registrados': 0, 'rechazadas': 2},
+        )
+
+
+# ────────────────────────────────
+# BÚSQUEDA DE PERSONAS
+# ────────────────────────────────
+
+class BusquedaPersonasTests(TestCase):
+    """Índice de palabras de IndicePersona: prefijos, tildes, cambios y reconstrucción."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.comunes = dict(
+            tipo_documento=TipoDocumento.objects.create(nombre='CC'), direccion_linea1="Calle 1",
+            ciudad=Ciudad.objects.create(nombre='Cali', departamento=Departamento.objects.create(nombre='Valle')),
+        )
+        cls.jose = Acudiente.objects.create(
+            numero_documento='10', primer_nombre="José", segundo_nombre="Ángel", primer_apellido="García",
+            segundo_apellido="Zúñiga", **cls.comunes,
+        )
+        cls.joaquin = Docente.objects.create(
+            numero_documento='20', primer_nombre="JOAQUÍN", primer_apellido="Gasca", especialidad="Física", **cls.comunes,
+        )
+        cls.ana = Acudiente.objects.create(
+            numero_documento='30', primer_nombre="Anabel", primer_apellido="Garzón", **cls.comunes,
+        )
+
+    def _buscar(self, texto, **kwargs):
+        return {(indice.tipo, indice.objeto_id) for indice in busqueda.buscar(texto, **kwargs)}
+
+    def _clave(self, persona):
+        return (busqueda.TIPO_DE[type(persona)], persona.pk)
+
+    def test_sin_importar_tildes_ni_mayusculas(self):
+        for texto in ("josé", "JOSE", "Jose", "zuniga", "ZÚÑIGA", "angel"):
+            self.assertEqual(self._buscar(texto), {self._clave(self.jose)}, texto)
+        self.assertEqual(self._buscar("joaquin"), {self._clave(self.joaquin)})
+
+    def test_prefijos_de_varias_palabras(self):
+        self.assertEqual(self._buscar("jo"), {self._clave(self.jose), self._clave(self.joaquin)})
+        self.assertEqual(self._buscar("ga"), {self._clave(p) for p in (self.jose, self.joaquin, self.ana)})
+        # Cada palabra buscada debe ser prefijo de alguna palabra del nombre
+        self.assertEqual(self._buscar("jo gar"), {self._clave(self.jose)})
+        self.assertEqual(self._buscar("gar jo"), {self._clave(self.jose)})
+        self.assertEqual(self._buscar("gar"), {self._clave(self.jose), self._clave(self.ana)})
+        self.assertEqual(self._buscar("jo garzon"), set())
+        # El rango de prefijo no se pasa a la palabra siguiente
+        self.assertEqual(self._buscar("gas"), {self._clave(self.joaquin)})
+        self.assertEqual(self._buscar("ana"), {self._clave(self.ana)})
+
+    def test_documento_tipos_y_largo_minimo(self):
+        self.assertEqual(self._buscar("20"), {self._clave(self.joaquin)})
+        self.assertEqual(self._buscar("j"), set())
+        self.assertEqual(
+            self._buscar("jo", tipos=[IndicePersona.ACUDIENTE]), {self._clave(self.jose)},
+        )
+
+    def test_cambio_de_nombre_y_borrado(self):
+        self.ana.primer_apellido = "Ospina"
+        self.ana.save()
+        self.assertEqual(self._buscar("garzon"), set())
+        self.assertEqual(self._buscar("anabel osp"), {self._clave(self.ana)})
+        self.assertEqual(
+            IndicePersona.objects.get(objeto_id=self.ana.pk, tipo=IndicePersona.ACUDIENTE).nombre, "Anabel Ospina",
+        )
+
+        self.ana.delete()
+        self.assertEqual(self._buscar("anabel"), set())
+        self.assertFalse(PalabraPersona.objects.filter(palabra='anabel').exists())
+
+    def test_reconstruir_indice(self):
+        # bulk_create no emite señales: la persona no queda en el índice
+        Acudiente.objects.bulk_create([Acudiente(
+            numero_documento='40', primer_nombre="Úrsula", primer_apellido="Iguarán", **self.comunes,
+        )])
+        self.assertEqual(self._buscar("ursula"), set())
+        IndicePersona.objects.filter(objeto_id=self.jose.pk, tipo=IndicePersona.ACUDIENTE).update(nombre="Viejo")
+
+        self.assertEqual(busqueda.reconstruir_indice(), 4)
+
+        ursula = Acudiente.objects.get(numero_documento='40')
+        self.assertEqual(self._buscar("urs igua"), {self._clave(ursula)})
+        self.assertEqual(self._buscar("jo gar"), {self._clave(self.jose)})
+        self.assertEqual(
+            IndicePersona.objects.get(objeto_id=self.jose.pk, tipo=IndicePersona.ACUDIENTE).nombre,
+            "José Ángel García Zúñiga",
+        )
+        self.assertEqual(IndicePersona.objects.count(), 4)
+
+
+# ────────────────────────────────
+# BÚSQUEDA DE TEXTO COMPLETO
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class TextoCompletoTests(TestCase):
+    """buscar_logros_y_temas() sobre el índice de texto del motor (FTS5 en SQLite)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+        cls.biologia = Asignatura.objects.order_by('pk').first()
+        cls.otra = Asignatura.objects.exclude(grado=cls.biologia.grado).order_by('pk').first()
+        cls.tema = Tema.objects.create(asignatura=cls.biologia, nombre="Fotosíntesis de las plantas")
+        cls.logro = Logro.objects.create(
+            asignatura=cls.biologia, descripcion="Explica la fotosíntesis y la respiración celular.",
+        )
+        Tema.objects.create(asignatura=cls.otra, nombre="Respiración de los peces")
+
+    def _buscar(self, texto, **kwargs):
+        return [(fila['tipo'], fila['pk']) for fila in texto_completo.buscar_logros_y_temas(texto, **kwargs)]
+
+    def test_filtros_y_tipos(self):
+        self.assertEqual(set(self._buscar("respiración", asignatura=self.biologia.pk)), {('logro', self.logro.pk)})
+        self.assertEqual(self._buscar("respiración", tipos=['tema'], asignatura=self.otra.pk)[0][0], 'tema')
+        self.assertEqual(self._buscar("plantas", grado=self.otra.grado_id), [])
+        self.assertEqual(self._buscar("plantas", grado=self.biologia.grado_id), [('tema', self.tema.pk)])
+        self.assertEqual(self._buscar("***"), [])
+
+    @skipUnless(connection.vendor == 'sqlite', "FTS5 solo en SQLite")
+    def test_fts5_sin_tildes_y_por_prefijo(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name IN ('core_tema_fts', 'core_logro_fts')")
+            self.assertEqual(len(cursor.fetchall()), 2)
+        self.assertEqual(
+            set(self._buscar("FOTOSINTESIS")), {('tema', self.tema.pk), ('logro', self.logro.pk)},
+        )
+        self.assertEqual(self._buscar("foto plan"), [('tema', self.tema.pk)])
+        # El tema nombra la palabra en un texto más corto: bm25 lo pone primero
+        self.assertEqual(self._buscar("fotosíntesis")[0], ('tema', self.tema.pk))
+
+    @skipUnless(connection.vendor == 'sqlite', "FTS5 solo en SQLite")
+    def test_fts5_sigue_los_cambios(self):
+        self.tema.nombre = "Ciclo del agua"
+        self.tema.save()
+        self.assertEqual(self._buscar("plantas"), [])
+        self.assertEqual(self._buscar("ciclo agua"), [('tema', self.tema.pk)])
+        self.logro.delete()
+        self.assertEqual(self._buscar("fotosintesis"), [])
+
+
+# ────────────────────────────────
+# PETICIONES CONDICIONALES DE LAS LISTAS
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class ListasVersionadasTests(TestCase):
+    """Las listas del coordinador responden 304 con su ETag hasta que cambia el catálogo."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+
+    def setUp(self):
+        self.cliente = _clientes()['coordinador']
+        self.url = reverse('lista_temas')
+
+    def _consultas_a_temas(self, contexto):
+        return [c['sql'] for c in contexto.captured_queries if 'core_tema' in c['sql']]
+
+    def test_if_none_match_responde_304_sin_consultar_la_lista(self):
+        primera = self.cliente.get(self.url)
+        self.assertEqual(primera.status_code, 200)
+        etag = primera['ETag']
+
+        with CaptureQueriesContext(connection) as contexto:
+            respuesta = self.cliente.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 304)
+        self.assertEqual(respuesta['ETag'], etag)
+        self.assertEqual(self._consultas_a_temas(contexto), [])
+
+        # Otros parámetros son otra página, con otro ETag
+        self.assertNotEqual(self.cliente.get(self.url, {'orden': '-nombre'})['ETag'], etag)
+
+    def test_una_escritura_cambia_el_etag(self):
+        etag = self.cliente.get(self.url)['ETag']
+        asignatura = Asignatura.objects.order_by('pk').first()
+        with self.captureOnCommitCallbacks(execute=True):
+            Tema.objects.create(asignatura=asignatura, nombre="Aaa tema nuevo")
+
+        respuesta = self.cliente.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta['ETag'], etag)
+        self.assertContains(respuesta, "Aaa tema nuevo")
+        # Cambiar una tabla que la lista no muestra no cambia su ETag
+        etag = respuesta['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Logro.objects.create(asignatura=asignatura, descripcion="Logro nuevo")
+        self.assertEqual(self.cliente.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+# ────────────────────────────────
+# ÁRBOL ACADÉMICO
+# ────────────────────────────────
+
+def _arbol_directo(nivel):
+    """El nodo de `nivel` recorriendo las relaciones una por una, sin optimizar."""
+    return {
+        'id': nivel.pk, 'nombre': nivel.nombre,
+        'grados': [
+            {
+                'id': grado.pk, 'nombre': grado.nombre,
+                'asignaturas': [
+                    {
+                        'id': asignatura.pk, 'nombre': asignatura.nombre, 'area': asignatura.area.nombre,
+                        'temas': [{'id': t.pk, 'nombre': t.nombre} for t in asignatura.temas.order_by('nombre', 'pk')],
+                        'logros': [{'id': l.pk, 'descripcion': l.descripcion} for l in asignatura.logros.order_by('pk')],
+                    }
+                    for asignatura in grado.asignaturas.order_by('nombre', 'pk')
+                ],
+            }
+            for grado in nivel.grados.order_by('nombre', 'pk')
+        ],
+    }
+
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class ArbolAcademicoTests(TestCase):
+    """El árbol se arma con consultas fijas y, ya en caché, se sirve sin consultar."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(Configuracion(
+            niveles=2, grados_por_nivel=2, grupos_por_grado=1, estudiantes_por_grupo=1, areas=2,
+            temas_por_asignatura=2, logros_por_asignatura=2, actividades_por_asignacion=1,
+        ))
+        cls.nivel = NivelEducativo.objects.order_by('pk').first()
+        cls.grado = cls.nivel.grados.order_by('pk').first()
+
+    def test_consultas_fijas_y_contenido(self):
+        with self.assertNumQueries(5):
+            completo = arbol.construir_arbol()
+        with self.assertNumQueries(5):
+            del_nivel = arbol.construir_arbol(nivel=self.nivel.pk)
+        with self.assertNumQueries(4):
+            del_grado = arbol.construir_arbol(grado=self.grado.pk)
+
+        niveles = NivelEducativo.objects.order_by('nombre', 'pk')
+        self.assertEqual(completo, {'niveles': [_arbol_directo(nivel) for nivel in niveles]})
+        self.assertEqual(del_nivel, _arbol_directo(self.nivel))
+        self.assertIn(del_grado, del_nivel['grados'])
+        self.assertIsNone(arbol.construir_arbol(grado=-1))
+
+    def test_gzip_desde_la_cache_sin_consultas(self):
+        cliente = _clientes()['docente']
+        url = reverse('arbol_academico')
+        primera = cliente.get(url, {'grado': self.grado.pk}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(primera['Content-Encoding'], 'gzip')
+
+        with CaptureQueriesContext(connection) as contexto:
+            respuesta = cliente.get(url, {'grado': self.grado.pk}, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        tablas = ('core_nivel', 'core_grado', 'core_asignatura', 'core_area', 'core_tema', 'core_logro')
+        self.assertEqual([c['sql'] for c in contexto.captured_queries if any(t in c['sql'] for t in tablas)], [])
+        self.assertEqual(respuesta['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', respuesta['Vary'])
+        esperado = next(g for g in _arbol_directo(self.nivel)['grados'] if g['id'] == self.grado.pk)
+        self.assertEqual(json.loads(gzip.decompress(respuesta.content)), esperado)
+
+        # Sin gzip: la misma versión en claro, con su propio ETag
+        claro = cliente.get(url, {'grado': self.grado.pk})
+        self.assertNotIn('Content-Encoding', claro)
+        self.assertEqual(claro.json(), json.loads(gzip.decompress(respuesta.content)))
+        self.assertNotEqual(claro['ETag'], respuesta['ETag'])
+
+    def test_serializado_en_cache(self):
+        version = 'prueba'
+        guardado = arbol.arbol_serializado(version)
+        with self.assertNumQueries(0):
+            self.assertEqual(arbol.arbol_serializado(version), guardado)
+        self.assertEqual(gzip.decompress(guardado[1]), guardado[0])
+
+
+# ────────────────────────────────
+# LECTURAS EN RÉPLICAS
+# ────────────────────────────────
+
+def _lee_de():
+    return Grado.objects.all().db
+
+
+@mock.patch.object(replicas, 'REPLICAS', ['replica1'])
+class ReplicasTests(SimpleTestCase):
+    """Qué base de datos usa cada lectura y escritura según el contexto y la petición."""
+
+    def setUp(self):
+        self.addCleanup(replicas.usar, None)
+        self.router = replicas.RouterReplicas()
+
+    def test_router(self):
+        self.assertEqual(_lee_de(), 'default')
+        with replicas.en_replica():
+            self.assertEqual(_lee_de(), 'replica1')
+            self.assertEqual(self.router.db_for_write(Grado), 'default')
+            self.assertEqual(self.router.db_for_read(Session), 'default')
+            with replicas.en_primaria():
+                self.assertEqual(_lee_de(), 'default')
+            self.assertEqual(_lee_de(), 'replica1')
+            # Dentro de una transacción de la primaria se lee lo que ella ve
+            with mock.patch.object(connections['default'], 'in_atomic_block', True):
+                self.assertEqual(_lee_de(), 'default')
+
+    def test_en_primaria_como_decorador_y_en_flujo(self):
+        @replicas.en_primaria()
+        def para_la_cache():
+            return _lee_de()
+
+        with replicas.en_replica('replica1'):
+            self.assertEqual(para_la_cache(), 'default')
+            cuerpo = replicas.en_flujo(_lee_de() for _ in range(2))
+        # El cuerpo se consume ya fuera del contexto de la petición
+        self.assertEqual(_lee_de(), 'default')
+        self.assertEqual(list(cuerpo), ['replica1', 'replica1'])
+
+    def _pedir(self, metodo, vista, sesion=None):
+        """Pasa `vista` por ReplicasMiddleware; devuelve (base de lectura, sesión)."""
+        leido = []
+
+        def registrar(request):
+            leido.append(_lee_de())
+            return HttpResponse()
+        # Con la marca de @solo_primaria o @lectura_en_replica de `vista`
+        registrar.__dict__.update(vista.__dict__)
+
+        def get_response(request):
+            middleware.process_view(request, registrar, (), {})
+            return registrar(request)
+
+        middleware = ReplicasMiddleware(get_response)
+        request = getattr(RequestFactory(), metodo)('/prueba/')
+        request.session = SesionFirmada()
+        request.session.update(sesion or {'_auth_user_id': '1'})
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = 'x'
+        middleware(request)
+        self.assertEqual(_lee_de(), 'default')
+        return leido[0], request.session
+
+    def test_middleware(self):
+        # Una vista nueva en cada caso: los decoradores marcan la función
+        def vista():
+            return lambda request: None
+
+        self.assertEqual(self._pedir('get', vista())[0], 'replica1')
+        self.assertEqual(self._pedir('get', replicas.solo_primaria(vista()))[0], 'default')
+
+        # Quien escribe queda fijado a la primaria unos segundos
+        leido, sesion = self._pedir('post', vista())
+        self.assertEqual(leido, 'default')
+        self.assertGreater(sesion[replicas.SESION_FIJADA], time.time())
+        fijada = dict(sesion)
+        self.assertEqual(self._pedir('get', vista(), fijada)[0], 'default')
+        self.assertEqual(self._pedir('get', replicas.lectura_en_replica(vista()), fijada)[0], 'replica1')
+
+
+# ────────────────────────────────
+# PAGINACIÓN POR CURSOR
+# ────────────────────────────────
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class PaginacionKeysetTests(TestCase):
+    """PaginadorKeyset y el cursor de la API recorren todo sin repetir ni saltar filas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sembrar(_institucion_pequena())
+        # Apellidos repetidos: el desempate por pk tiene que ser estable
+        Estudiante.objects.filter(pk__in=Estudiante.objects.order_by('pk').values('pk')[:4]).update(
+            primer_apellido='Igual',
+        )
+
+    def _recorrer(self, paginador):
+        paginas = [paginador.pagina()]
+        while paginas[-1].tiene_siguiente:
+            paginas.append(paginador.pagina(paginas[-1].cursor_siguiente))
+        return paginas
+
+    def test_hacia_adelante_y_hacia_atras(self):
+        for orden in ('pk', 'primer_apellido', '-primer_apellido'):
+            with self.subTest(orden=orden):
+                esperados = list(Estudiante.objects.order_by(orden, 'pk' if orden != '-primer_apellido' else '-pk')
+                                 .values_list('pk', flat=True))
+                paginador = PaginadorKeyset(Estudiante.objects.all(), orden, tamano=3)
+                paginas = self._recorrer(paginador)
+                self.assertEqual([e.pk for pagina in paginas for e in pagina], esperados)
+                self.assertFalse(paginas[0].tiene_anterior)
+
+                # De vuelta desde la última página: las mismas páginas, en orden
+                atras = [paginas[-1]]
+                while atras[-1].tiene_anterior:
+                    atras.append(paginador.pagina(atras[-1].cursor_anterior))
+                self.assertEqual(
+                    [[e.pk for e in pagina] for pagina in reversed(atras)],
+                    [[e.pk for e in pagina] for pagina in paginas],
+                )
+
+    def test_una_insercion_anterior_no_desplaza_la_pagina_siguiente(self):
+        paginador = PaginadorKeyset(Estudiante.objects.all(), 'primer_apellido', tamano=3)
+        primera = paginador.pagina()
+        siguiente = [e.pk for e in paginador.pagina(primera.cursor_siguiente)]
+        nuevo = Estudiante.objects.order_by('pk').first()
+        nuevo.pk, nuevo.usuario, nuevo.numero_documento, nuevo.primer_apellido = None, None, 'nuevo-1', 'Aaa'
+        nuevo.save()
+        self.assertEqual([e.pk for e in paginador.pagina(primera.cursor_siguiente)], siguiente)
+
+    def test_cursor_invalido_vuelve_al_inicio(self):
+        paginador = PaginadorKeyset(Estudiante.objects.all(), 'primer_apellido', tamano=3)
+        inicio = [e.pk for e in paginador.pagina()]
+        for cursor in ('basura', codificar_cursor('pk', None, 1, 'sig'),
+                       codificar_cursor('primer_apellido', 'Igual', 'x', 'sig'),
+                       codificar_cursor('primer_apellido', ['Igual'], 1, 'sig'),
+                       codificar_cursor('primer_apellido', 'Igual', 1, 'otra')):
+            with self.subTest(cursor=cursor):
+                self.assertEqual([e.pk for e in paginador.pagina(cursor)], inicio)
+
+    def test_solo_ordena_por_campos_propios(self):
+        with self.assertRaises(ValueError):
+            PaginadorKeyset(Estudiante.objects.all(), 'grupo__nombre')
+        with self.assertRaises(ValueError):
+            ListaCoordinador(Tema, 'x.html', 'temas', ['nombre'], ordenes={'asignatura': 'asignatura__nombre'})
+        # Un orden que la lista no ofrece cae en el de por defecto
+        respuesta = _clientes()['coordinador'].get(reverse('lista_asignaturas'), {'orden': 'grado'})
+        self.assertEqual(
+            [a.pk for a in respuesta.context['asignaturas']()],
+            list(Asignatura.objects.order_by('nombre', 'pk').values_list('pk', flat=True)[:TAMANO_PAGINA]),
+        )
+
+    def _api(self, parametros):
+        recurso = RECURSOS['estudiantes']
+        return json.loads(''.join(recurso.json(*recurso.consulta(parametros))))
+
+    def test_api_recorre_todo_con_el_cursor(self):
+        vistos = []
+        parametros = {'tamano': '3', 'campos': 'numero_documento'}
+        while True:
+            respuesta = self._api(parametros)
+            vistos += [fila['id'] for fila in respuesta['resultados']]
+            if respuesta['siguiente'] is None:
+                break
+            parametros = {**parametros, 'cursor': respuesta['siguiente']}
+        self.assertEqual(vistos, list(Estudiante.objects.order_by('pk').values_list('pk', flat=True)))
+
+    def test_api_rechaza_cursores_alterados(self):
+        for cursor in ('basura', codificar_cursor('api:docentes', None, 1, 'sig'),
+                       codificar_cursor('api:estudiantes', None, 'x', 'sig'),
+                       codificar_cursor('api:estudiantes', None, [1], 'sig'),
+                       codificar_cursor('api:estudiantes', None, True, 'sig')):
+            with self.subTest(cursor=cursor), self.assertRaisesMessage(ValueError, "Cursor inválido"):
+                RECURSOS['estudiantes'].consulta({'cursor': cursor})
+
+    def test_api_responde_400_con_un_cursor_alterado(self):
+        cliente = _clientes()['coordinador']
+        respuesta = cliente.get(reverse('api_recurso', args=['estudiantes']), {
+            'cursor': codificar_cursor('api:estudiantes', None, 'x', 'sig'),
+        })
+        self.assertEqual(respuesta.status_code, 400)
+
+
+# ────────────────────────────────
+# ESTADO DEL POOL DE CONEXIONES
+# ────────────────────────────────
+
+class PoolFalso:
+    def __init__(self, datos):
+        self.datos = datos
+
+    def get_stats(self):
+        return dict(self.datos)
+
+
+class EstadisticasPoolTests(TestCase):
+    """estadisticas_pool() traduce get_stats() de psycopg_pool."""
+
+    DATOS = {
+        'pool_min': 2, 'pool_max': 10, 'pool_size': 6, 'pool_available': 2, 'requests_waiting': 1,
+        'requests_num': 50, 'requests_queued': 4, 'requests_wait_ms': 30, 'requests_errors': 0,
+        'connections_num': 7, 'connections_lost': 1,
+    }
+
+    def test_sin_pool(self):
+        self.assertIsNone(estadisticas_pool('default'))
+        self.assertEqual(estadisticas_pools()['bases_de_datos'], {alias: None for alias in connections})
+
+    def test_con_pool(self):
+        with mock.patch.object(connections['default'], 'pool', PoolFalso(self.DATOS), create=True):
+            datos = estadisticas_pool('default')
+        self.assertEqual(datos, {
+            'minimo': 2, 'maximo': 10, 'abiertas': 6, 'libres': 2, 'en_uso': 4, 'esperando': 1,
+            'peticiones': 50, 'encoladas': 4, 'espera_media_ms': 7.5, 'errores': 0,
+            'conexiones_creadas': 7, 'conexiones_perdidas': 1,
+        })
+
+    def test_pool_recien_abierto(self):
+        # Las versiones de psycopg_pool omiten los contadores que siguen en cero
+        with mock.patch.object(connections['default'], 'pool', PoolFalso({'pool_min': 1, 'pool_max': 4}), create=True):
+            datos = estadisticas_pool('default')
+        self.assertEqual((datos['en_uso'], datos['encoladas'], datos['espera_media_ms']), (0, 0, 0.0))
+
+    @override_settings(CACHES=CACHE_PRUEBAS)
+    def test_vista(self):
+        sembrar(_institucion_pequena())
+        with mock.patch.object(connections['default'], 'pool', PoolFalso(self.DATOS), create=True):
+            respuesta = _clientes()['coordinador'].get(reverse('estado_conexiones'))
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()
+        self.assertEqual(datos['pid'], os.getpid())
+        self.assertEqual(datos['bases_de_datos']['default']['en_uso'], 4)
@@ -0,0 +1,161 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BooleanField, F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Logro, Tema
+
+# ────────────────────────────────
+# BÚSQUEDA DE TEXTO COMPLETO EN LOGROS Y TEMAS
+# ────────────────────────────────
+#
+# El documento de búsqueda de cada fila vive en la base de datos y se
+# mantiene solo, sin código en las vistas ni señales:
+#
+# - PostgreSQL: una columna tsvector generada (GENERATED ALWAYS ... STORED)
+#   con to_tsvector('spanish', ...), que aplica la raíz de las palabras en
+#   español, y un índice GIN sobre ella. Se ordena por ts_rank.
+# - SQLite (desarrollo local): una tabla virtual FTS5 de contenido externo
+#   sincronizada con triggers. FTS5 no trae raíces en español: se ignoran
+#   tildes y cada palabra se busca como prefijo. Se ordena por bm25.
+#
+# Las columnas, índices y triggers no son campos de los modelos: los crea
+# preparar_indices() tras cada migrate (señal post_migrate, ver core/apps.py).
+# Los filtros por asignatura y grado van en la misma consulta que la búsqueda.
+# La sintaxis se elige según el motor de la base de datos donde corre cada
+# consulta (la réplica, si el router la manda allí), no la conexión por
+# defecto.
+
+CONFIGURACION = 'spanish'
+LIMITE = 50
+
+# Modelo -> (columna indexada, tipo que se muestra en los resultados)
+FUENTES = {
+    Logro: ('descripcion', 'logro'),
+    Tema: ('nombre', 'tema'),
+}
+TIPOS = [tipo for _, tipo in FUENTES.values()]
+
+
+def _nombres(modelo, columna, qn):
+    tabla = modelo._meta.db_table
+    return qn(tabla), qn(f'{tabla}_fts'), qn(modelo._meta.get_field(columna).column)
+
+
+def _preparar_postgresql(cursor, modelo, columna, qn):
+    tabla, _, campo = _nombres(modelo, columna, qn)
+    cursor.execute(
+        f"ALTER TABLE {tabla} ADD COLUMN IF NOT EXISTS documento tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{CONFIGURACION}', coalesce({campo}, ''))) STORED"
+    )
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS {qn(modelo._meta.db_table + '_documento_gin')} ON {tabla} USING gin (documento)"
+    )
+
+
+def _preparar_sqlite(cursor, modelo, columna, qn):
+    tabla, fts, campo = _nombres(modelo, columna, qn)
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = %s", [f'{modelo._meta.db_table}_fts'])
+    existe = cursor.fetchone() is not None
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({campo}, content={tabla}, content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    )
+    prefijo = modelo._meta.db_table
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {qn(prefijo + '_fts_ai')} AFTER INSERT ON {tabla} BEGIN "
+        f"INSERT INTO {fts}(rowid, {campo}) VALUES (new.id, new.{campo}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {qn(prefijo + '_fts_ad')} AFTER DELETE ON {tabla} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {campo}) VALUES ('delete', old.id, old.{campo}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {qn(prefijo + '_fts_au')} AFTER UPDATE ON {tabla} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {campo}) VALUES ('delete', old.id, old.{campo}); "
+        f"INSERT INTO {fts}(rowid, {campo}) VALUES (new.id, new.{campo}); END"
+    )
+    if not existe:
+        # Filas que ya estaban antes de crear la tabla virtual
+        cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def preparar_indices(using=DEFAULT_DB_ALIAS):
+    """Crea (si faltan) las columnas, índices y triggers de búsqueda. Se puede repetir."""
+    conexion = connections[using]
+    preparar = {'postgresql': _preparar_postgresql, 'sqlite': _preparar_sqlite}.get(conexion.vendor)
+    if preparar is None:
+        return
+    with conexion.cursor() as cursor:
+        for modelo, (columna, _) in FUENTES.items():
+            preparar(cursor, modelo, columna, conexion.ops.quote_name)
+
+
+def preparar_texto_completo(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Receptor de post_migrate."""
+    preparar_indices(using)
+
+
+def _consulta_fts(texto):
+    # Cada palabra entre comillas (sin sintaxis FTS5 del usuario) y como prefijo
+    return ' '.join(f'"{palabra}"*' for palabra in re.findall(r'\w+', texto))
+
+
+def _coincidencia(conexion, modelo, columna, texto):
+    """(condición, rango) de la búsqueda de `texto` sobre `modelo`, según el motor de `conexion`."""
+    tabla, fts, _ = _nombres(modelo, columna, conexion.ops.quote_name)
+    if conexion.vendor == 'postgresql':
+        consulta = f"websearch_to_tsquery('{CONFIGURACION}', %s)"
+        return (
+            RawSQL(f"{tabla}.documento @@ {consulta}", [texto], output_field=BooleanField()),
+            RawSQL(f"ts_rank({tabla}.documento, {consulta})", [texto], output_field=FloatField()),
+        )
+    if conexion.vendor == 'sqlite':
+        consulta = _consulta_fts(texto)
+        return (
+            RawSQL(f"{tabla}.id IN (SELECT rowid FROM {fts} WHERE {fts} MATCH %s)", [consulta],
+                   output_field=BooleanField()),
+            # bm25 es menor cuanto más relevante
+            RawSQL(f"(SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND rowid = {tabla}.id)", [consulta],
+                   output_field=FloatField()),
+        )
+    # Otros motores: sin índice de texto, cada palabra con icontains
+    condicion = Q()
+    for palabra in texto.split():
+        condicion &= Q(**{f'{columna}__icontains': palabra})
+    return condicion, Value(0.0, output_field=FloatField())
+
+
+def buscar_logros_y_temas(texto, asignatura=None, grado=None, tipos=None, limite=LIMITE):
+    """
+    Logros y temas que coinciden con `texto`, del más al menos relevante,
+    en una sola consulta (UNION ALL). Cada resultado es un dict con tipo,
+    pk, texto, asignatura, grado y rango.
+    """
+    texto = (texto or '').strip()
+    if not re.search(r'\w', texto):
+        return Logro.objects.none()
+    consultas = []
+    for modelo, (columna, tipo) in FUENTES.items():
+        if tipos and tipo not in tipos:
+            continue
+        queryset = modelo.objects.all()
+        condicion, rango = _coincidencia(connections[queryset.db], modelo, columna, texto)
+        queryset = queryset.filter(condicion)
+        if asignatura:
+            queryset = queryset.filter(asignatura_id=asignatura)
+        if grado:
+            queryset = queryset.filter(asignatura__grado_id=grado)
+        consultas.append(
+            queryset.annotate(
+                tipo=Value(tipo), texto=F(columna), rango=rango,
+                asignatura_nombre=F('asignatura__nombre'), grado_nombre=F('asignatura__grado__nombre'),
+            ).values('pk', 'tipo', 'texto', 'asignatura_nombre', 'grado_nombre', 'rango')
+        )
+    if not consultas:
+        return Logro.objects.none()
+    primera, *resto = consultas
+    if resto:
+        primera = primera.union(*resto, all=True)
+    return primera.order_by('-rango', 'texto')[:limite]
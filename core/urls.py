@@ -54,4 +54,36 @@ urlpatterns = [
     path('coordinador/logros/nuevo/', views.crear_logro, name='crear_logro'),
     path('coordinador/logros/editar/<int:pk>/', views.editar_logro, name='editar_logro'),
     path('coordinador/logros/eliminar/<int:pk>/', views.eliminar_logro, name='eliminar_logro'),
+    path('coordinador/eliminaciones/<int:pk>/', views.estado_eliminacion, name='estado_eliminacion'),
+    path('coordinador/tareas/', views.lista_tareas, name='lista_tareas'),
+    path('coordinador/tareas/<int:pk>/', views.estado_tarea, name='estado_tarea'),
+    path('coordinador/tareas/<int:pk>/descargar/', views.descargar_tarea, name='descargar_tarea'),
+    path('coordinador/tareas/programar/<slug:tipo>/', views.programar_tarea, name='programar_tarea'),
+
+    # Estado del pool de conexiones (Coordinador)
+    path('coordinador/sistema/conexiones/', views.estado_conexiones, name='estado_conexiones'),
+
+    # Calificaciones (Docente)
+    path('docente/actividades/<int:pk>/calificaciones/', views.calificar_actividad, name='calificar_actividad'),
+    path('docente/asignaciones/<int:pk>/planilla/', views.planilla_docente, name='planilla_docente'),
+    path('docente/asignaciones/<int:pk>/planilla/cambios/', views.guardar_planilla, name='guardar_planilla'),
+
+    # Boletines (Coordinador)
+    path('coordinador/grupos/<int:pk>/boletines/', views.descargar_boletines, name='descargar_boletines'),
+
+    # Exportaciones (Coordinador)
+    path('coordinador/exportar/<slug:nombre>/', views.exportar, name='exportar'),
+    path('api/<slug:recurso>/', views.api_recurso, name='api_recurso'),
+
+    # Importación masiva (Coordinador)
+    path('coordinador/importar/', views.importar_personas_csv, name='importar_personas'),
+
+    # Búsqueda de personas (Coordinador)
+    path('coordinador/personas/buscar/', views.buscar_personas, name='buscar_personas'),
+
+    # Árbol de la estructura académica en JSON (Coordinador y Docente)
+    path('academico/arbol/', views.arbol_academico, name='arbol_academico'),
+
+    # Búsqueda de texto completo en logros y temas (Coordinador)
+    path('coordinador/buscar/', views.buscar_textos, name='buscar_textos'),
 ]
@@ -0,0 +1,96 @@
+import hashlib
+import math
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .models import Area, Asignatura, Grado, Logro, NivelEducativo, Tema
+
+# ────────────────────────────────
+# VERSIÓN DE LAS TABLAS DEL CATÁLOGO ACADÉMICO
+# ────────────────────────────────
+#
+# Cada tabla del catálogo tiene un número de versión en la caché: el
+# momento (time_ns) de su último cambio. Las señales de core/signals.py lo
+# cambian al confirmar cada guardado o borrado; las cargas y borrados
+# masivos (institución sintética, eliminación por lotes) llaman a
+# incrementar() directamente. Las listas del coordinador (core/listas.py) y
+# el árbol académico (core/arbol.py) arman con las versiones de lo que
+# muestran el ETag de la respuesta (para responder 304) y la clave de lo
+# que guardan en la caché.
+#
+# Si la caché pierde una versión se crea otra con la hora actual: las
+# páginas guardadas con la anterior simplemente dejan de usarse.
+
+CACHE_PREFIJO = 'version'
+
+MODELOS = [NivelEducativo, Grado, Area, Asignatura, Tema, Logro]
+
+
+def _clave(modelo):
+    return f"{CACHE_PREFIJO}:{modelo._meta.label_lower}"
+
+
+def _completar(modelos, guardadas):
+    faltantes = [modelo for modelo in modelos if _clave(modelo) not in guardadas]
+    if faltantes:
+        ahora = time.time_ns()
+        for modelo in faltantes:
+            cache.add(_clave(modelo), ahora, None)
+        guardadas.update(cache.get_many([_clave(modelo) for modelo in faltantes]))
+    return {modelo: guardadas[_clave(modelo)] for modelo in modelos}
+
+
+def versiones(modelos):
+    """{modelo: versión} de `modelos`, en un solo get_many."""
+    return _completar(modelos, cache.get_many([_clave(modelo) for modelo in modelos]))
+
+
+async def aversiones(modelos):
+    guardadas = await cache.aget_many([_clave(modelo) for modelo in modelos])
+    if len(guardadas) < len(modelos):
+        return await sync_to_async(_completar)(modelos, guardadas)
+    return {modelo: guardadas[_clave(modelo)] for modelo in modelos}
+
+
+def incrementar(*modelos):
+    ahora = time.time_ns()
+    cache.set_many({_clave(modelo): ahora for modelo in modelos}, None)
+
+
+def incrementar_al_confirmar(*modelos):
+    """incrementar() cuando la transacción en curso se confirme (o ya, si no hay ninguna)."""
+    transaction.on_commit(lambda: incrementar(*modelos))
+
+
+# ────────────────────────────────
+# PETICIONES CONDICIONALES
+# ────────────────────────────────
+
+def huella(versiones_, *partes):
+    """
+    (versión, último cambio) de una respuesta armada con los datos de
+    `versiones_` ({modelo: versión}) y `partes` (plantilla, parámetros...).
+    La versión sirve de ETag y de clave de caché; el último cambio, en
+    segundos, de Last-Modified.
+    """
+    datos = '|'.join([*partes, *(str(valor) for valor in versiones_.values())])
+    return hashlib.sha1(datos.encode()).hexdigest(), math.ceil(max(versiones_.values()) / 1e9)
+
+
+def marcar(response, version, ultima):
+    response['ETag'] = quote_etag(version)
+    response['Last-Modified'] = http_date(ultima)
+    # Es del usuario que la pidió, y se revalida en cada visita
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def no_modificada(request, version, ultima):
+    """La respuesta 304 (ya marcada) si el cliente tiene esta versión; si no, None."""
+    response = get_conditional_response(request, etag=quote_etag(version), last_modified=ultima)
+    return marcar(response, version, ultima) if response is not None else None
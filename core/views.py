@@ -1,15 +1,39 @@
-from django.shortcuts import render, redirect
+import json
+import os
+import re
+import uuid
+
+from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.contrib import messages
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_POST
 from django.contrib.auth import login
-from .forms import LoginForm, RegistroUsuarioForm, NivelEducativoForm, GradoForm, AreaForm, AsignaturaForm, TemaForm, LogroForm
-from .models import Usuario, NivelEducativo, Grado, Area, Asignatura, Tema, Logro
-from django.contrib.auth.decorators import login_required, user_passes_test
-
-# Función de acceso para Coordinador
-def es_coordinador(user):
-    return user.rol.nombre == 'Coordinador Académico'
+from .forms import LoginForm, RegistroUsuarioForm, NivelEducativoForm, GradoForm, AreaForm, AsignaturaForm, TemaForm, LogroForm, ImportarPersonasForm, ProgramarBoletinesForm
+from .models import Usuario, NivelEducativo, Grado, Area, Asignatura, Tema, Logro, Actividad, AsignacionDocente, Grupo, Estudiante, Acudiente, Eliminacion, Tarea
+from .boletines import generar_zip
+from .exportacion import EXPORTACIONES, filas_csv
+from .calificaciones import guardar_calificaciones
+from .planillas import acargar_planilla, aplicar_cambios
+from .analitica import aestadisticas_grupo
+from .tablero import aestudiantes_de_acudiente, atablero, atableros
+from .busqueda import MODELOS as MODELOS_PERSONA, buscar
+from .texto_completo import TIPOS as TIPOS_TEXTO, buscar_logros_y_temas
+from .eliminacion import EliminacionProtegida, PlanEliminacion, programar
+from .listas import Filtro, LISTA_NIVELES, LISTA_GRADOS, LISTA_AREAS, LISTA_ASIGNATURAS, LISTA_TEMAS, LISTA_LOGROS, LISTA_TAREAS
+from .tareas import encolar, ruta_archivo
+from .opciones import aopciones
+from .replicas import en_flujo, lectura_en_replica, solo_primaria
+from .conexiones import estadisticas_pools
+from .arbol import RAICES as RAICES_ARBOL, aarbol_serializado
+from .api import RECURSOS as RECURSOS_API
+from . import versiones
+from .autenticacion import (
+    coordinador_requerido, docente_requerido, estudiante_requerido, acudiente_requerido, recordar_rol, rol_requerido,
+    ROL_COORDINADOR, ROL_DOCENTE, ROL_ESTUDIANTE, ROL_ACUDIENTE, ROL_ACUDIENTE_ALTERNO,
+)
 
 # Página de inicio
 def inicio(request):
@@ -38,20 +62,21 @@ def login_usuario(request):
             correo = form.cleaned_data['correo']
             password = form.cleaned_data['password']
             try:
-                usuario = Usuario.objects.get(correo=correo)
+                # Usuario y Rol en una sola consulta
+                usuario = Usuario.objects.select_related('rol').get(correo=correo)
                 if usuario.check_password(password):
                     login(request, usuario)
 
                     # Diccionario de redirección por rol
                     redirecciones = {
-                        'Coordinador Académico': 'panel_coordinador',
-                        'Docente': 'panel_docente',
-                        'Estudiante': 'panel_estudiante',
-                        'Acudiente': 'panel_acudiente',
-                        'Padre de Familia o Acudiente': 'panel_acudiente',
+                        ROL_COORDINADOR: 'panel_coordinador',
+                        ROL_DOCENTE: 'panel_docente',
+                        ROL_ESTUDIANTE: 'panel_estudiante',
+                        ROL_ACUDIENTE: 'panel_acudiente',
+                        ROL_ACUDIENTE_ALTERNO: 'panel_acudiente',
                     }
 
-                    rol_usuario = usuario.rol.nombre
+                    rol_usuario = recordar_rol(request, usuario)
                     destino = redirecciones.get(rol_usuario)
 
                     if destino:
@@ -68,33 +93,96 @@ def login_usuario(request):
 
     return render(request, 'login.html', {'form': form, 'error': error})
 
-# Paneles de usuario
-def panel_docente(request):
-    return HttpResponse("Panel del Docente")
-
-def panel_estudiante(request):
-    return HttpResponse("Panel del Estudiante")
+# Paneles de usuario (async: solo leen, y así no ocupan un hilo bajo ASGI)
+@docente_requerido
+async def panel_docente(request):
+    asignaciones = [
+        asignacion async for asignacion in AsignacionDocente.objects
+        .filter(docente__usuario=request.user)
+        .select_related('grupo__grado', 'asignatura')
+        .only('grupo__nombre', 'grupo__grado__nombre', 'asignatura__nombre')
+        .order_by('grupo__grado__nombre', 'grupo__nombre', 'asignatura__nombre')
+    ]
+    return render(request, 'panel_docente/panel_docente.html', {'asignaciones': asignaciones})
+
+# El estudiante o acudiente del usuario se recuerda en la sesión: con los
+# tableros en caché, los paneles no hacen más consultas que la sesión y el usuario
+async def _perfil_de(request, modelo):
+    clave = f'_{modelo._meta.model_name}'
+    guardado = await request.session.aget(clave)
+    if guardado and guardado['usuario'] == request.user.pk:
+        return guardado['pk']
+    pk = await modelo.objects.filter(usuario=request.user).values_list('pk', flat=True).afirst()
+    if pk is not None:
+        await request.session.aset(clave, {'usuario': request.user.pk, 'pk': pk})
+    return pk
+
+@estudiante_requerido
+async def panel_estudiante(request):
+    estudiante_id = await _perfil_de(request, Estudiante)
+    datos = await atablero(estudiante_id) if estudiante_id is not None else None
+    return render(request, 'panel_estudiante/panel_estudiante.html', {'tablero': datos})
 
 # Panel del Coordinador Académico
-@login_required
-@user_passes_test(es_coordinador)
-def panel_coordinador(request):
-    return render(request, 'panel_coordinador/panel_coordinador.html')
-
-
-
-def panel_acudiente(request):
-    return HttpResponse("Panel del Acudiente")
+@coordinador_requerido
+async def panel_coordinador(request):
+    # Los <select> de grados y grupos se pintan desde la caché: se llenan antes sin bloquear
+    await aopciones(Grado)
+    grupos = await aopciones(Grupo)
+    contexto = {'form_boletines': ProgramarBoletinesForm(), 'grupos': grupos}
+    try:
+        grupo_id = int(request.GET.get('grupo', ''))
+    except ValueError:
+        grupo_id = None
+    if grupo_id is not None and any(pk == grupo_id for pk, _ in grupos):
+        contexto['grupo_id'] = grupo_id
+        contexto['estadisticas'] = await aestadisticas_grupo(grupo_id)
+    return render(request, 'panel_coordinador/panel_coordinador.html', contexto)
+
+
+
+@acudiente_requerido
+async def panel_acudiente(request):
+    acudiente_id = await _perfil_de(request, Acudiente)
+    tableros = []
+    if acudiente_id is not None:
+        estudiantes = await aestudiantes_de_acudiente(acudiente_id)
+        por_estudiante = await atableros(estudiantes)
+        tableros = [por_estudiante[pk] for pk in estudiantes if pk in por_estudiante]
+    return render(request, 'panel_acudiente/panel_acudiente.html', {
+        'vinculado': acudiente_id is not None, 'tableros': tableros,
+    })
+
+# Borrado en cascada de la estructura académica: GET muestra el impacto
+# (solo conteos) y POST programa el borrado por lotes en segundo plano
+def _eliminar_en_cascada(request, modelo, pk, lista):
+    objeto = get_object_or_404(modelo, pk=pk)
+    if request.method == 'POST':
+        try:
+            eliminacion = programar(objeto, request.user)
+        except EliminacionProtegida as exc:
+            messages.error(request, f"No se puede eliminar: hay registros que dependen de él ({exc}).")
+            return redirect(lista)
+        return redirect('estado_eliminacion', pk=eliminacion.pk)
+    return render(request, 'panel_coordinador/eliminar_confirmar.html', {
+        'objeto': objeto,
+        'tipo': modelo._meta.verbose_name,
+        'impacto': PlanEliminacion(objeto).impacto(),
+        'lista': lista,
+    })
+
+@solo_primaria
+@coordinador_requerido
+def estado_eliminacion(request, pk):
+    eliminacion = get_object_or_404(Eliminacion, pk=pk)
+    return render(request, 'panel_coordinador/eliminacion_estado.html', {'eliminacion': eliminacion})
 
 # CRUD de Niveles
-@login_required
-@user_passes_test(es_coordinador)
-def lista_niveles(request):
-    niveles = NivelEducativo.objects.all()
-    return render(request, 'panel_coordinador/nivel_list.html', {'niveles': niveles})
-
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
+async def lista_niveles(request):
+    return await LISTA_NIVELES.arespuesta(request)
+
+@coordinador_requerido
 def crear_nivel(request):
     if request.method == 'POST':
         form = NivelEducativoForm(request.POST)
@@ -108,8 +196,7 @@ def crear_nivel(request):
         form = NivelEducativoForm()
     return render(request, 'panel_coordinador/nivel_form.html', {'form': form})
 
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def editar_nivel(request, pk):
     nivel = NivelEducativo.objects.get(pk=pk)
     if request.method == 'POST':
@@ -124,23 +211,16 @@ def editar_nivel(request, pk):
         form = NivelEducativoForm(instance=nivel)
     return render(request, 'panel_coordinador/nivel_form.html', {'form': form})
 
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def eliminar_nivel(request, pk):
-    nivel = NivelEducativo.objects.get(pk=pk)
-    nivel.delete()
-    messages.success(request, "Nivel Educativo eliminado correctamente.")
-    return redirect('lista_niveles')
+    return _eliminar_en_cascada(request, NivelEducativo, pk, 'lista_niveles')
 
 # CRUD de Grados
-@login_required
-@user_passes_test(es_coordinador)
-def lista_grados(request):
-    grados = Grado.objects.all()
-    return render(request, 'panel_coordinador/grado_list.html', {'grados': grados})
-
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
+async def lista_grados(request):
+    return await LISTA_GRADOS.arespuesta(request)
+
+@coordinador_requerido
 def crear_grado(request):
     if request.method == 'POST':
         form = GradoForm(request.POST)
@@ -154,8 +234,7 @@ def crear_grado(request):
         form = GradoForm()
     return render(request, 'panel_coordinador/grado_form.html', {'form': form})
 
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def editar_grado(request, pk):
     grado = Grado.objects.get(pk=pk)
     if request.method == 'POST':
@@ -170,23 +249,16 @@ def editar_grado(request, pk):
         form = GradoForm(instance=grado)
     return render(request, 'panel_coordinador/grado_form.html', {'form': form})
 
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def eliminar_grado(request, pk):
-    grado = Grado.objects.get(pk=pk)
-    grado.delete()
-    messages.success(request, "Grado eliminado correctamente.")
-    return redirect('lista_grados')
+    return _eliminar_en_cascada(request, Grado, pk, 'lista_grados')
 
 # CRUD de Áreas
-@login_required
-@user_passes_test(es_coordinador)
-def lista_areas(request):
-    areas = Area.objects.all()
-    return render(request, 'panel_coordinador/area_list.html', {'areas': areas})
-
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
+async def lista_areas(request):
+    return await LISTA_AREAS.arespuesta(request)
+
+@coordinador_requerido
 def crear_area(request):
     if request.method == 'POST':
         form = AreaForm(request.POST)
@@ -200,8 +272,7 @@ def crear_area(request):
         form = AreaForm()
     return render(request, 'panel_coordinador/area_form.html', {'form': form})
 
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def editar_area(request, pk):
     area = Area.objects.get(pk=pk)
     if request.method == 'POST':
@@ -216,23 +287,16 @@ def editar_area(request, pk):
         form = AreaForm(instance=area)
     return render(request, 'panel_coordinador/area_form.html', {'form': form})
 
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def eliminar_area(request, pk):
-    area = Area.objects.get(pk=pk)
-    area.delete()
-    messages.success(request, "Área eliminada correctamente.")
-    return redirect('lista_areas')
+    return _eliminar_en_cascada(request, Area, pk, 'lista_areas')
 
 # CRUD de Asignaturas
-@login_required
-@user_passes_test(es_coordinador)
-def lista_asignaturas(request):
-    asignaturas = Asignatura.objects.all()
-    return render(request, 'panel_coordinador/asignatura_list.html', {'asignaturas': asignaturas})
-
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
+async def lista_asignaturas(request):
+    return await LISTA_ASIGNATURAS.arespuesta(request)
+
+@coordinador_requerido
 def crear_asignatura(request):
     if request.method == 'POST':
         form = AsignaturaForm(request.POST)
@@ -246,8 +310,7 @@ def crear_asignatura(request):
         form = AsignaturaForm()
     return render(request, 'panel_coordinador/asignatura_form.html', {'form': form})
 
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def editar_asignatura(request, pk):
     asignatura = Asignatura.objects.get(pk=pk)
     if request.method == 'POST':
@@ -262,24 +325,17 @@ def editar_asignatura(request, pk):
         form = AsignaturaForm(instance=asignatura)
     return render(request, 'panel_coordinador/asignatura_form.html', {'form': form})
 
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def eliminar_asignatura(request, pk):
-    asignatura = Asignatura.objects.get(pk=pk)
-    asignatura.delete()
-    messages.success(request, "Asignatura eliminada correctamente.")
-    return redirect('lista_asignaturas')
+    return _eliminar_en_cascada(request, Asignatura, pk, 'lista_asignaturas')
 
 # Vista para listar los temas
-@login_required
-@user_passes_test(es_coordinador)
-def lista_temas(request):
-    temas = Tema.objects.all()  # Obtiene todos los temas
-    return render(request, 'panel_coordinador/tema_list.html', {'temas': temas})
+@coordinador_requerido
+async def lista_temas(request):
+    return await LISTA_TEMAS.arespuesta(request)  # Temas con su asignatura en una sola consulta
 
 # Vista para crear un nuevo tema
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def crear_tema(request):
     if request.method == 'POST':
         form = TemaForm(request.POST)  # Crea el formulario con los datos POST
@@ -295,8 +351,7 @@ def crear_tema(request):
     return render(request, 'panel_coordinador/tema_form.html', {'form': form})
 
 # Vista para editar un tema
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def editar_tema(request, pk):
     tema = Tema.objects.get(pk=pk)  # Obtiene el tema a editar
     if request.method == 'POST':
@@ -313,8 +368,7 @@ def editar_tema(request, pk):
     return render(request, 'panel_coordinador/tema_form.html', {'form': form})
 
 # Vista para eliminar un tema
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def eliminar_tema(request, pk):
     tema = Tema.objects.get(pk=pk)  # Obtiene el tema a eliminar
     tema.delete()  # Elimina el tema de la base de datos
@@ -322,15 +376,12 @@ def eliminar_tema(request, pk):
     return redirect('lista_temas')  # Redirige a la lista de temas
 
 # Vista para listar los logros
-@login_required
-@user_passes_test(es_coordinador)
-def lista_logros(request):
-    logros = Logro.objects.all()  # Obtiene todos los logros de la base de datos
-    return render(request, 'panel_coordinador/logro_list.html', {'logros': logros})
+@coordinador_requerido
+async def lista_logros(request):
+    return await LISTA_LOGROS.arespuesta(request)  # Logros con su asignatura en una sola consulta
 
 # Vista para crear un nuevo logro
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def crear_logro(request):
     if request.method == 'POST':
         form = LogroForm(request.POST)  # Crea el formulario con los datos POST
@@ -346,8 +397,7 @@ def crear_logro(request):
     return render(request, 'panel_coordinador/logro_form.html', {'form': form})
 
 # Vista para editar un logro
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def editar_logro(request, pk):
     logro = Logro.objects.get(pk=pk)  # Obtiene el logro a editar
     if request.method == 'POST':
@@ -364,10 +414,246 @@ def editar_logro(request, pk):
     return render(request, 'panel_coordinador/logro_form.html', {'form': form})
 
 # Vista para eliminar un logro
-@login_required
-@user_passes_test(es_coordinador)
+@coordinador_requerido
 def eliminar_logro(request, pk):
     logro = Logro.objects.get(pk=pk)  # Obtiene el logro a eliminar
     logro.delete()  # Elimina el logro de la base de datos
     messages.success(request, "Logro eliminado correctamente.")
     return redirect('lista_logros')  # Redirige a la lista de logros
+
+# Registro masivo de calificaciones de una actividad (JSON)
+@docente_requerido
+@require_POST
+def calificar_actividad(request, pk):
+    # Solo el docente de la asignación puede calificar la actividad
+    actividad = get_object_or_404(
+        Actividad.objects.select_related('asignacion'),
+        pk=pk, asignacion__docente__usuario=request.user,
+    )
+    try:
+        datos = json.loads(request.body)
+        filas = datos['calificaciones']
+        if not isinstance(filas, list):
+            raise TypeError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': "Se esperaba un JSON con la lista 'calificaciones'."}, status=400)
+
+    resultado = guardar_calificaciones(actividad, filas)
+    return JsonResponse(resultado.como_dict(), status=200 if resultado.ok else 400)
+
+# Planilla de notas de una asignación (solo su docente)
+def _asignaciones_del_docente(request):
+    return AsignacionDocente.objects.filter(docente__usuario=request.user).select_related('grupo', 'asignatura')
+
+@docente_requerido
+async def planilla_docente(request, pk):
+    asignacion = await _asignaciones_del_docente(request).filter(pk=pk).afirst()
+    if asignacion is None:
+        raise Http404("Asignación no encontrada.")
+    planilla = await acargar_planilla(asignacion)
+    return render(request, 'panel_docente/planilla.html', {'asignacion': asignacion, 'planilla': planilla})
+
+@docente_requerido
+@require_POST
+def guardar_planilla(request, pk):
+    asignacion = get_object_or_404(_asignaciones_del_docente(request), pk=pk)
+    try:
+        cambios = json.loads(request.body)['cambios']
+        if not isinstance(cambios, list):
+            raise TypeError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': "Se esperaba un JSON con la lista 'cambios'."}, status=400)
+
+    resultado = aplicar_cambios(asignacion, cambios)
+    if resultado.conflictos:
+        estado = 409
+    else:
+        estado = 200 if resultado.ok else 400
+    return JsonResponse(resultado.como_dict(), status=estado)
+
+# Boletines de un grupo en un ZIP que se envía mientras se genera
+@coordinador_requerido
+def descargar_boletines(request, pk):
+    grupo = get_object_or_404(Grupo, pk=pk)
+    respuesta = StreamingHttpResponse(en_flujo(generar_zip([grupo.pk])), content_type='application/zip')
+    respuesta['Content-Disposition'] = f'attachment; filename="boletines_grupo_{grupo.pk}.zip"'
+    return respuesta
+
+# Exportación en flujo: /coordinador/exportar/<nombre>/?formato=csv|excel&grupo=..&desde=..
+@coordinador_requerido
+def exportar(request, nombre):
+    exportacion = EXPORTACIONES.get(nombre)
+    if exportacion is None:
+        raise Http404("Exportación no encontrada")
+    try:
+        queryset = exportacion.consulta(request.GET)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    # El formato Excel sigue siendo CSV (con BOM y ';'): el tipo y la
+    # extensión .csv lo dicen, y Excel lo abre igual
+    excel = request.GET.get('formato') == 'excel'
+    respuesta = StreamingHttpResponse(
+        en_flujo(filas_csv(exportacion, queryset, excel=excel)), content_type='text/csv; charset=utf-8',
+    )
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre}.csv"'
+    return respuesta
+
+# API JSON de lectura: /api/<recurso>/?campos=..&tamano=..&cursor=..&<filtro>=..
+@lectura_en_replica
+@coordinador_requerido
+def api_recurso(request, recurso):
+    api = RECURSOS_API.get(recurso)
+    if api is None:
+        raise Http404("Recurso no encontrado")
+    try:
+        nombres, queryset, tamano = api.consulta(request.GET)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return StreamingHttpResponse(api.json(nombres, queryset, tamano), content_type='application/json')
+
+# Importación masiva de personas desde CSV
+@coordinador_requerido
+def importar_personas_csv(request):
+    # El archivo se guarda y lo procesa el trabajador de tareas
+    if request.method == 'POST':
+        form = ImportarPersonasForm(request.POST, request.FILES)
+        if form.is_valid():
+            nombre = os.path.join('subidas', f'{uuid.uuid4().hex}.csv')
+            ruta = os.path.join(settings.TAREAS_DIR, nombre)
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            with open(ruta, 'wb') as destino:
+                for parte in form.cleaned_data['archivo'].chunks():
+                    destino.write(parte)
+            tipo = form.cleaned_data['tipo']
+            tarea = encolar(
+                'importar_personas', f"Importar {tipo} ({form.cleaned_data['archivo'].name})",
+                {'tipo': tipo, 'archivo': nombre}, prioridad=1, usuario=request.user,
+            )
+            return redirect('estado_tarea', pk=tarea.pk)
+        messages.error(request, "Verifica el formulario de importación.")
+    else:
+        form = ImportarPersonasForm()
+    return render(request, 'panel_coordinador/importar_personas.html', {'form': form})
+
+# Búsqueda de personas de todos los tipos (JSON), sobre el índice unificado
+@lectura_en_replica
+@coordinador_requerido
+async def buscar_personas(request):
+    tipos = [tipo for tipo in request.GET.getlist('tipo') if tipo in MODELOS_PERSONA]
+    resultados = [
+        {'tipo': tipo, 'id': objeto_id, 'nombre': nombre, 'numero_documento': documento}
+        async for tipo, objeto_id, nombre, documento in buscar(request.GET.get('q'), tipos)
+        .values_list('tipo', 'objeto_id', 'nombre', 'numero_documento')
+    ]
+    return JsonResponse({'resultados': resultados})
+
+# Árbol académico (JSON): completo, ?nivel=<id> o ?grado=<id>. Comprimido
+# con gzip si el cliente lo acepta, y 304 si ya tiene la versión actual
+ACEPTA_GZIP = re.compile(r'\bgzip\b')
+
+@rol_requerido(ROL_COORDINADOR, ROL_DOCENTE)
+async def arbol_academico(request):
+    raiz = {}
+    for parametro in RAICES_ARBOL:
+        valor = request.GET.get(parametro, '')
+        if valor:
+            if not valor.isdigit():
+                return HttpResponseBadRequest(f"'{parametro}' debe ser un número.")
+            raiz[parametro] = int(valor)
+    if len(raiz) > 1:
+        return HttpResponseBadRequest("Indica solo el nivel o solo el grado.")
+
+    comprimir = bool(ACEPTA_GZIP.search(request.headers.get('Accept-Encoding', '')))
+    version, ultima = versiones.huella(
+        await versiones.aversiones(versiones.MODELOS), 'arbol', *(f'{k}={v}' for k, v in raiz.items()),
+    )
+    # Cada codificación es una representación distinta: su propio ETag
+    etag = f'{version}-gzip' if comprimir else version
+    response = versiones.no_modificada(request, etag, ultima)
+    if response is None:
+        serializado = await aarbol_serializado(version, **raiz)
+        if serializado is None:
+            raise Http404("No existe ese nivel o grado.")
+        crudo, comprimido = serializado
+        response = versiones.marcar(
+            HttpResponse(comprimido if comprimir else crudo, content_type='application/json'), etag, ultima,
+        )
+        if comprimir:
+            response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+# Búsqueda de texto completo en logros y temas, filtrada por asignatura y grado
+FILTROS_TEXTO = [
+    Filtro('asignatura', 'Asignatura', 'asignatura_id', Asignatura),
+    Filtro('grado', 'Grado', 'asignatura__grado_id', Grado),
+]
+
+@lectura_en_replica
+@coordinador_requerido
+async def buscar_textos(request):
+    valores = {}
+    filtros = []
+    for filtro in FILTROS_TEXTO:
+        valor = request.GET.get(filtro.parametro, '')
+        valor = valor if valor.isdigit() else ''
+        valores[filtro.parametro] = valor
+        filtros.append(filtro.contexto(valor, await filtro.aopciones()))
+    tipos = [tipo for tipo in request.GET.getlist('tipo') if tipo in TIPOS_TEXTO]
+    texto = request.GET.get('q', '')
+    resultados = [
+        fila async for fila in buscar_logros_y_temas(
+            texto, asignatura=valores['asignatura'] or None, grado=valores['grado'] or None, tipos=tipos,
+        )
+    ]
+    return render(request, 'panel_coordinador/busqueda_textos.html', {
+        'q': texto, 'tipos': tipos, 'filtros': filtros, 'resultados': resultados,
+    })
+
+# Tareas en segundo plano
+@solo_primaria
+@coordinador_requerido
+async def lista_tareas(request):
+    return await LISTA_TAREAS.arespuesta(request)
+
+@solo_primaria
+@coordinador_requerido
+def estado_tarea(request, pk):
+    tarea = get_object_or_404(Tarea, pk=pk)
+    return render(request, 'panel_coordinador/tarea_estado.html', {'tarea': tarea})
+
+@coordinador_requerido
+def descargar_tarea(request, pk):
+    tarea = get_object_or_404(Tarea, pk=pk, estado=Tarea.TERMINADA)
+    ruta = ruta_archivo(tarea)
+    if not ruta or not os.path.exists(ruta):
+        raise Http404("La tarea no produjo un archivo.")
+    return FileResponse(open(ruta, 'rb'), as_attachment=True, filename=os.path.basename(ruta))
+
+@coordinador_requerido
+@require_POST
+def programar_tarea(request, tipo):
+    if tipo == 'generar_boletines':
+        form = ProgramarBoletinesForm(request.POST)
+        if not form.is_valid():
+            messages.error(request, "Verifica el grado y las fechas de los boletines.")
+            return redirect('panel_coordinador')
+        datos = form.cleaned_data
+        tarea = encolar('generar_boletines', f"Boletines de {datos['grado']}", {
+            'grados': [datos['grado'].pk],
+            'desde': datos['desde'].isoformat() if datos['desde'] else None,
+            'hasta': datos['hasta'].isoformat() if datos['hasta'] else None,
+        }, usuario=request.user)
+    elif tipo == 'reconstruir_resumenes':
+        tarea = encolar('reconstruir_resumenes', "Reconstruir resúmenes de calificaciones", prioridad=-1, usuario=request.user)
+    elif tipo == 'precalcular_tableros':
+        tarea = encolar('precalcular_tableros', "Precalcular tableros de estudiantes", prioridad=-1, usuario=request.user)
+    else:
+        raise Http404("Tarea desconocida.")
+    return redirect('estado_tarea', pk=tarea.pk)
+
+# Estado del pool de conexiones del proceso que responde (JSON)
+@coordinador_requerido
+def estado_conexiones(request):
+    return JsonResponse(estadisticas_pools())